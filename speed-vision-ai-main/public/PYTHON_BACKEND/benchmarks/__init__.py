@@ -0,0 +1 @@
+# SpeedWatch Pro - Benchmarks
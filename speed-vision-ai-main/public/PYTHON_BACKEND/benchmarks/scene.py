@@ -0,0 +1,179 @@
+"""
+SpeedWatch Pro - Synthetic Traffic Scenes
+=========================================
+Generates detections for a scene of vehicles driving along parallel
+lanes, with ground truth for every detection, so the tracker and the
+speed calculator can be measured without video or a model.
+
+The scene holds a constant number of vehicles: a vehicle that drives
+off the end of its lane is replaced by a new one (new ground-truth id)
+entering at the start. Detections can be degraded with occlusions
+(missed detections for a few frames), centroid noise and false
+positives.
+"""
+
+import math
+import numpy as np
+from dataclasses import dataclass
+from typing import Tuple
+
+import sys
+sys.path.append('.')
+from config.settings import PIXELS_PER_METER, FPS, VEHICLE_CLASSES
+from src.detections import DetectionBatch
+
+
+@dataclass
+class SceneConfig:
+    """
+    Parameters of a synthetic scene.
+    
+    Attributes:
+        vehicles: Vehicles in the scene at any time
+        lanes: Number of lanes (0 picks about sqrt(vehicles))
+        speed_range: Lane speeds are drawn from this range (km/h);
+            vehicles in a lane share its speed, so they never overtake
+            through each other
+        lane_spacing: Distance between lane centres (pixels)
+        vehicle_spacing: Distance between vehicles in a lane (pixels).
+            The default is more than a 120 km/h vehicle covers in
+            MAX_DISAPPEARED frames, so the track of a vehicle that left
+            is deleted before the next one reaches the exit.
+        box_size: Mean (width, height) of a vehicle box (pixels)
+        occlusion_rate: Chance per frame that a vehicle becomes occluded
+        max_occlusion: Longest occlusion (frames)
+        noise: Std of the detected box position (pixels)
+        false_positives: Mean false detections per frame
+        pixels_per_meter: Calibration used to turn speeds into pixels
+        fps: Frame rate of the scene
+        seed: Random seed (scenes with the same config are identical)
+    """
+    vehicles: int = 20
+    lanes: int = 0
+    speed_range: Tuple[float, float] = (30.0, 120.0)
+    lane_spacing: int = 80
+    vehicle_spacing: int = 320
+    box_size: Tuple[int, int] = (60, 40)
+    occlusion_rate: float = 0.01
+    max_occlusion: int = 10
+    noise: float = 1.0
+    false_positives: float = 0.5
+    pixels_per_meter: float = PIXELS_PER_METER
+    fps: float = FPS
+    seed: int = 0
+
+
+@dataclass
+class SceneFrame:
+    """
+    Detections of one frame with their ground truth.
+    
+    Attributes:
+        detections: All detections of the frame (both confidence tiers)
+        vehicle_ids: Ground-truth vehicle per detection (-1 for false
+            positives)
+        speeds: True speed per detection in km/h (nan for false positives)
+        timestamp: Frame time in seconds
+    """
+    detections: DetectionBatch
+    vehicle_ids: np.ndarray
+    speeds: np.ndarray
+    timestamp: float
+
+
+class SyntheticScene:
+    """
+    Endless stream of SceneFrames for a SceneConfig.
+    
+    Vehicles drive left to right; lane i is centred at
+    (i + 1) * lane_spacing. Positions and speeds are kept as floats and
+    only the detections are rounded, like a real detector's boxes.
+    """
+    
+    def __init__(self, config: SceneConfig = SceneConfig()):
+        """
+        Initialize the scene.
+        
+        Args:
+            config: Scene parameters
+        """
+        self.config = config
+        self.rng = np.random.default_rng(config.seed)
+        
+        n = config.vehicles
+        lanes = config.lanes or max(1, round(math.sqrt(n)))
+        per_lane = math.ceil(n / lanes)
+        self.lanes = lanes
+        self.width = per_lane * config.vehicle_spacing
+        self.height = (lanes + 1) * config.lane_spacing
+        
+        # Vehicles fill the lanes evenly spaced, each lane at its own speed
+        lane = np.arange(n) % lanes
+        slot = np.arange(n) // lanes
+        lane_kmh = self.rng.uniform(*config.speed_range, size=lanes)
+        
+        self.x = slot * float(config.vehicle_spacing) + self.rng.uniform(0, config.vehicle_spacing / 2, size=lanes)[lane]
+        self.y = (lane + 1.0) * config.lane_spacing
+        self.speed_kmh = lane_kmh[lane]
+        self.step = self.speed_kmh / 3.6 * config.pixels_per_meter / config.fps
+        
+        self.size = config.box_size * self.rng.uniform(0.8, 1.2, size=(n, 1))
+        self.class_ids = self.rng.choice(VEHICLE_CLASSES, size=n)
+        self.vehicle_ids = np.arange(n)
+        self.occluded = np.zeros(n, dtype=np.int64)
+        
+        self.next_vehicle_id = n
+        self.frame = 0
+    
+    @property
+    def total_vehicles(self) -> int:
+        """Vehicles that have entered the scene so far."""
+        return self.next_vehicle_id
+    
+    def next(self) -> SceneFrame:
+        """Advance one frame and return its detections."""
+        config = self.config
+        rng = self.rng
+        
+        if self.frame > 0:
+            self.x += self.step
+        
+        # Vehicles past the end are replaced by new ones at the start
+        left = np.flatnonzero(self.x >= self.width)
+        if len(left):
+            self.x[left] -= self.width
+            self.vehicle_ids[left] = np.arange(self.next_vehicle_id, self.next_vehicle_id + len(left))
+            self.next_vehicle_id += len(left)
+            self.occluded[left] = 0
+        
+        # Occlusions: hidden vehicles produce no detection
+        self.occluded = np.maximum(self.occluded - 1, 0)
+        starts = rng.random(len(self.x)) < config.occlusion_rate
+        self.occluded[starts] = rng.integers(1, config.max_occlusion + 1, size=int(starts.sum()))
+        visible = np.flatnonzero(self.occluded == 0)
+        
+        centers = np.stack([self.x[visible], self.y[visible]], axis=1)
+        centers += rng.normal(0.0, config.noise, size=centers.shape)
+        half = self.size[visible] / 2
+        boxes = np.concatenate([centers - half, centers + half], axis=1)
+        confidences = rng.uniform(0.6, 0.95, size=len(visible))
+        class_ids = self.class_ids[visible]
+        
+        # False positives: random boxes anywhere in the scene
+        fp = rng.poisson(config.false_positives)
+        if fp:
+            fp_centers = rng.uniform((0, 0), (self.width, self.height), size=(fp, 2))
+            fp_half = np.asarray(config.box_size) / 2
+            boxes = np.concatenate([boxes, np.concatenate([fp_centers - fp_half, fp_centers + fp_half], axis=1)])
+            confidences = np.concatenate([confidences, rng.uniform(0.2, 0.7, size=fp)])
+            class_ids = np.concatenate([class_ids, rng.choice(VEHICLE_CLASSES, size=fp)])
+        
+        timestamp = self.frame / config.fps
+        self.frame += 1
+        
+        return SceneFrame(
+            detections=DetectionBatch.from_raw(np.rint(boxes), confidences, class_ids),
+            vehicle_ids=np.concatenate([self.vehicle_ids[visible], np.full(fp, -1)]),
+            speeds=np.concatenate([self.speed_kmh[visible], np.full(fp, np.nan)]),
+            timestamp=timestamp
+        )
@@ -0,0 +1,170 @@
+"""
+SpeedWatch Pro - Memory Soak Benchmark
+======================================
+Feeds a long synthetic stream of vehicles through VideoProcessor's
+per-frame path (tracking, speed, logging, vehicle records) and checks
+that memory stays flat once the scene has warmed up.
+
+Usage:
+    python -m benchmarks.soak_memory [--vehicles N] [--tolerance KB]
+
+Exits with status 1 if traced memory grows by more than the tolerance.
+Memory per vehicle is what matters, so a run of a few thousand
+vehicles stands in for a month of traffic (raise --vehicles for a
+longer soak). tests/test_soak_memory.py runs a short soak in the test
+suite.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.append('.')
+import src.video_processor as video_processor
+from src.detections import DetectionBatch
+
+# Allowed growth of traced memory after the first sample (KB)
+TOLERANCE_KB = 64
+
+
+class LaneStream:
+    """
+    Endless stream of vehicles crossing the frame in parallel lanes.
+    
+    A vehicle enters every spawn_every frames, cycling through the
+    lanes, and leaves the frame after width / step frames. Vehicles in
+    one lane are lanes * spawn_every frames apart, more than
+    MAX_DISAPPEARED, so a track that left is never revived by the next
+    vehicle passing its last position.
+    """
+    
+    def __init__(
+        self,
+        width: int = 1280,
+        lanes: int = 8,
+        spawn_every: int = 5,
+        step: int = 20
+    ):
+        self.width = width
+        self.lanes = lanes
+        self.spawn_every = spawn_every
+        self.step = step
+        self.frame = 0
+        self.spawned = 0
+        self._entered = np.empty(0, dtype=np.int64)
+        self._lane = np.empty(0, dtype=np.int64)
+    
+    def next(self) -> DetectionBatch:
+        """Detections of the next frame."""
+        if self.frame % self.spawn_every == 0:
+            self._entered = np.append(self._entered, self.frame)
+            self._lane = np.append(self._lane, self.spawned % self.lanes)
+            self.spawned += 1
+        
+        x = 40 + (self.frame - self._entered) * self.step
+        inside = x < self.width - 40
+        self._entered, self._lane, x = self._entered[inside], self._lane[inside], x[inside]
+        self.frame += 1
+        
+        y = 60 + self._lane * 80
+        boxes = np.stack([x - 30, y - 20, x + 30, y + 20], axis=1)
+        return DetectionBatch.from_raw(boxes, np.full(len(x), 0.9), np.full(len(x), 2))
+
+
+def make_processor(workdir: Path) -> video_processor.VideoProcessor:
+    """A VideoProcessor on a one-image source, logging into workdir."""
+    cv2.imwrite(str(workdir / "frame_0.png"), np.zeros((720, 1280, 3), dtype=np.uint8))
+    
+    return video_processor.VideoProcessor(
+        source=str(workdir / "frame_%d.png"),
+        speed_limit=1000,  # no overspeed snapshots
+        show_preview=False,
+        threaded_capture=False,
+        detector=type("NoDetector", (), {"zone": None})(),
+        checkpoint_dir=None,
+        log_dir=str(workdir / "logs")  # keep the soak's CSV rows out of the real logs
+    )
+
+
+def soak(vehicles: int, samples: int = 10) -> list:
+    """
+    Run vehicles through the processor and sample traced memory.
+    
+    Args:
+        vehicles: Vehicles to simulate after warm-up
+        samples: Memory samples to take
+    
+    Returns:
+        List of (vehicles_so_far, traced_bytes, live_tracks, logged_ids)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        processor = make_processor(Path(tmp))
+        stream = LaneStream()
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        
+        def run_until(count: int):
+            while stream.spawned < count:
+                processor._complete_frame(frame, stream.next(), stream.frame / processor.fps, draw=False)
+        
+        # Warm up: fill the scene and let allocator pools settle
+        warmup = 500
+        run_until(warmup)
+        
+        tracemalloc.start()
+        results = []
+        try:
+            for i in range(1, samples + 1):
+                run_until(warmup + vehicles * i // samples)
+                results.append((
+                    stream.spawned - warmup,
+                    tracemalloc.get_traced_memory()[0],
+                    len(processor.tracker.tracks),
+                    len(processor._logged_tracks)
+                ))
+        finally:
+            tracemalloc.stop()
+        
+        processor.stop()
+    
+    return results
+
+
+def memory_growth(results: list) -> float:
+    """Traced memory growth (KB) from the first to the last soak sample."""
+    return (results[-1][1] - results[0][1]) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SpeedWatch Pro - memory soak benchmark")
+    parser.add_argument("--vehicles", type=int, default=2000, help="Vehicles to simulate")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE_KB, help="Allowed growth in KB")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    results = soak(args.vehicles)
+    elapsed = time.perf_counter() - start
+    
+    print("\n" + "=" * 50)
+    print("SpeedWatch Pro - Memory Soak")
+    print("=" * 50)
+    print(f"{'vehicles':>10} {'traced KB':>10} {'tracks':>8} {'logged':>8}")
+    for count, traced, tracks, logged in results:
+        print(f"{count:>10} {traced / 1024:>10.1f} {tracks:>8} {logged:>8}")
+    
+    growth = memory_growth(results)
+    print(f"\nGrowth after first sample: {growth:.1f} KB ({elapsed:.0f}s)")
+    
+    if growth > args.tolerance:
+        print(f"⚠️ Memory grew by more than {args.tolerance:.0f} KB")
+        sys.exit(1)
+    print("✓ Memory flat")
+
+
+if __name__ == "__main__":
+    main()
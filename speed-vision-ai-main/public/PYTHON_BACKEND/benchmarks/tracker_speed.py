@@ -0,0 +1,224 @@
+"""
+SpeedWatch Pro - Tracker and Speed Benchmark
+============================================
+Runs CentroidTracker.update and SpeedCalculator.calculate_speeds on
+synthetic scenes (see scene.py) of increasing size and reports, per
+scene size:
+
+- frames/sec of the tracker, of the speed calculator, and of both
+- ID switches: times a ground-truth vehicle was matched to a track
+  other than the one it was matched to before
+- speed RMSE (km/h) of the measured speeds against the true speeds
+- peak memory traced while running the scene
+
+Usage:
+    python -m benchmarks.tracker_speed [--sizes 5,20,100,500,1000]
+        [--frames N] [--association greedy|hungarian] [--kalman]
+        [--noise PX] [--occlusion RATE] [--false-positives N]
+"""
+
+import argparse
+import math
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, replace
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.append('.')
+from config.settings import CONFIDENCE_THRESHOLD, LOW_CONFIDENCE_THRESHOLD
+from src.speed_calculator import SpeedCalculator
+from src.tracker import CentroidTracker, TRACK_CREATED, TRACK_UPDATED
+
+from .scene import SceneConfig, SyntheticScene
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one scene size."""
+    vehicles: int
+    frames: int
+    tracker_fps: float
+    speed_fps: float
+    total_fps: float
+    id_switches: int
+    speed_rmse: float
+    speed_samples: int
+    peak_memory_kb: float
+
+
+def run_scene(
+    config: SceneConfig,
+    frames: int,
+    association: str = "greedy",
+    kalman: bool = False,
+    trace_memory: bool = False
+) -> BenchmarkResult:
+    """
+    Track one synthetic scene and measure the tracker and speeds.
+    
+    Args:
+        config: Scene to generate
+        frames: Frames to run
+        association: Tracker assignment method
+        kalman: Track with the Kalman filter (speeds then come from the
+            filtered velocity, as in VideoProcessor)
+        trace_memory: Trace allocations to report peak memory (slows
+            every allocation down, so frame rates are not meaningful)
+    
+    Returns:
+        BenchmarkResult for the scene (peak_memory_kb is nan unless
+        trace_memory is set)
+    """
+    if trace_memory:
+        tracemalloc.start()
+    
+    scene = SyntheticScene(config)
+    tracker = CentroidTracker(association=association, kalman=kalman)
+    calculator = SpeedCalculator(pixels_per_meter=config.pixels_per_meter, fps=config.fps)
+    
+    # Ground-truth vehicle of every detection centre in the current
+    # frame; tracks take their matched detection's centre, so the
+    # lifecycle callbacks can tell which vehicle each track followed
+    truth: Dict[tuple, int] = {}
+    matched: List = []
+    
+    def on_track(track):
+        vehicle = truth.get(track.centroid, -1)
+        if vehicle >= 0:
+            matched.append((track, vehicle))
+    
+    tracker.subscribe(TRACK_CREATED, on_track)
+    tracker.subscribe(TRACK_UPDATED, on_track)
+    
+    last_track: Dict[int, int] = {}
+    true_speed: Dict[int, float] = {}
+    id_switches = 0
+    squared_error = 0.0
+    speed_samples = 0
+    tracker_time = 0.0
+    speed_time = 0.0
+    
+    for _ in range(frames):
+        frame = scene.next()
+        detections = frame.detections
+        
+        truth.clear()
+        duplicates = set()
+        for center, vehicle, speed in zip(map(tuple, detections.centers.tolist()), frame.vehicle_ids.tolist(), frame.speeds.tolist()):
+            if center in truth:
+                duplicates.add(center)
+            truth[center] = vehicle
+            if vehicle >= 0:
+                true_speed[vehicle] = speed
+        for center in duplicates:
+            truth[center] = -1
+        
+        # Split confidence tiers as the detector does
+        if LOW_CONFIDENCE_THRESHOLD is not None:
+            detections = detections.split_tiers(CONFIDENCE_THRESHOLD)
+        else:
+            detections = detections.select(detections.confidences >= CONFIDENCE_THRESHOLD)
+        
+        matched.clear()
+        start = time.perf_counter()
+        tracker.update(detections, timestamp=frame.timestamp)
+        tracker_time += time.perf_counter() - start
+        
+        for track, vehicle in matched:
+            if vehicle in last_track and last_track[vehicle] != track.id:
+                id_switches += 1
+            last_track[vehicle] = track.id
+        
+        # Speeds of the confirmed tracks that were matched this frame
+        valid = [(track.slot, vehicle) for track, vehicle in matched if track.is_valid]
+        slots = np.array([slot for slot, _ in valid], dtype=np.intp)
+        start = time.perf_counter()
+        speeds = calculator.calculate_speeds(tracker.store, slots, from_velocity=kalman)
+        speed_time += time.perf_counter() - start
+        
+        truth_kmh = np.array([true_speed[vehicle] for _, vehicle in valid])
+        errors = (speeds.speed_kmh - truth_kmh)[speeds.valid]
+        squared_error += float((errors * errors).sum())
+        speed_samples += len(errors)
+    
+    peak_memory_kb = math.nan
+    if trace_memory:
+        peak_memory_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    
+    return BenchmarkResult(
+        vehicles=config.vehicles,
+        frames=frames,
+        tracker_fps=frames / tracker_time if tracker_time else math.inf,
+        speed_fps=frames / speed_time if speed_time else math.inf,
+        total_fps=frames / (tracker_time + speed_time),
+        id_switches=id_switches,
+        speed_rmse=math.sqrt(squared_error / speed_samples) if speed_samples else math.nan,
+        speed_samples=speed_samples,
+        peak_memory_kb=peak_memory_kb
+    )
+
+
+def benchmark(
+    config: SceneConfig,
+    frames: int,
+    association: str = "greedy",
+    kalman: bool = False
+) -> BenchmarkResult:
+    """
+    Measure a scene: a timed pass, then a traced pass for memory.
+    
+    Args:
+        config: Scene to generate
+        frames: Frames to run
+        association: Tracker assignment method
+        kalman: Track with the Kalman filter
+    
+    Returns:
+        BenchmarkResult of the timed pass with the traced peak memory
+    """
+    result = run_scene(config, frames, association, kalman)
+    traced = run_scene(config, min(frames, 100), association, kalman, trace_memory=True)
+    return replace(result, peak_memory_kb=traced.peak_memory_kb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SpeedWatch Pro - tracker and speed benchmark")
+    parser.add_argument("--sizes", default="5,20,100,500,1000", help="Comma-separated vehicle counts")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per scene")
+    parser.add_argument("--association", default="greedy", choices=["greedy", "hungarian"])
+    parser.add_argument("--kalman", action="store_true", help="Track with the Kalman filter")
+    parser.add_argument("--noise", type=float, default=SceneConfig.noise, help="Detection noise (pixels)")
+    parser.add_argument("--occlusion", type=float, default=SceneConfig.occlusion_rate, help="Occlusion rate per vehicle and frame")
+    parser.add_argument("--false-positives", type=float, default=SceneConfig.false_positives, help="False detections per frame")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    base = SceneConfig(
+        noise=args.noise,
+        occlusion_rate=args.occlusion,
+        false_positives=args.false_positives,
+        seed=args.seed
+    )
+    
+    print("\n" + "=" * 78)
+    print("SpeedWatch Pro - Tracker and Speed Benchmark")
+    print("=" * 78)
+    print(f"{args.frames} frames per scene, {args.association} association"
+          f"{', Kalman filter' if args.kalman else ''}, noise {args.noise} px, "
+          f"occlusion {args.occlusion}, {args.false_positives} false positives/frame")
+    print(f"\n{'vehicles':>8} {'tracker fps':>12} {'speed fps':>10} {'total fps':>10} "
+          f"{'id switches':>12} {'rmse km/h':>10} {'peak KB':>10}")
+    
+    for size in (int(s) for s in args.sizes.split(",")):
+        result = benchmark(replace(base, vehicles=size), args.frames, args.association, args.kalman)
+        print(f"{result.vehicles:>8} {result.tracker_fps:>12.1f} {result.speed_fps:>10.1f} "
+              f"{result.total_fps:>10.1f} {result.id_switches:>12} {result.speed_rmse:>10.2f} "
+              f"{result.peak_memory_kb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,11 @@ PIXELS_PER_METER = 8.8
 # Helps reduce noise from minor position fluctuations
 MIN_DISTANCE_THRESHOLD = 20
 
+# Measured positions per speed estimate (sliding window). Path lengths
+# over the window are kept per track (re-summed from stored steps on
+# each sample), so it must stay below TRACK_HISTORY.
+SPEED_WINDOW = 10
+
 # ======================
 # VIDEO SETTINGS
 # ======================
@@ -29,11 +34,49 @@ MIN_DISTANCE_THRESHOLD = 20
 # Expected frame rate of the video/camera
 FPS = 30
 
+# Decode frames in a background thread, ahead of processing
+THREADED_CAPTURE = True
+
+# Max decoded frames buffered ahead of processing
+CAPTURE_QUEUE_SIZE = 8
+
+# What to do when the buffer is full: "block" (never lose a frame),
+# "drop_oldest" (bounded latency) or "auto" (block for files,
+# drop_oldest for live cameras and streams)
+CAPTURE_POLICY = "auto"
+
+# Run detect, track/speed, render and logging as concurrent pipeline
+# stages connected by bounded queues (frame order is preserved)
+PIPELINED = False
+
+# Capacity of each queue between pipeline stages
+PIPELINE_QUEUE_SIZE = 4
+
+# Detector worker threads. Values above 1 need a thread-safe backend
+# ("onnx"); other backends run a single worker. Adaptive stride and the
+# motion gate are turned off in pipelined mode, because detection runs
+# ahead of tracking and their decisions depend on the current tracks.
+PIPELINE_DETECT_WORKERS = 1
+
+# Worker threads drawing overlays
+PIPELINE_RENDER_WORKERS = 1
+
 # Detection zone (percentage of frame height)
 # Vehicles are only tracked within this zone
 DETECTION_ZONE_START = 0.2  # 20% from top
 DETECTION_ZONE_END = 0.8    # 80% from top
 
+# Optional polygon zone as (x, y) fractions of frame size, e.g.
+# [(0.1, 0.3), (0.9, 0.3), (1.0, 0.9), (0.0, 0.9)]. Overrides the band.
+DETECTION_ZONE_POLYGON = None
+
+# Crop frames to the detection zone before running inference
+CROP_TO_ZONE = True
+
+# Model input size for zone crops (smaller than INPUT_SIZE since the
+# crop has fewer pixels than the full frame)
+ZONE_INPUT_SIZE = 480
+
 # ======================
 # YOLO DETECTION
 # ======================
@@ -41,12 +84,78 @@ DETECTION_ZONE_END = 0.8    # 80% from top
 # Path to YOLO model weights
 MODEL_PATH = "models/yolov8n.pt"
 
+# Inference backend: "ultralytics" (torch) or "onnx" (ONNX Runtime, CPU)
+DETECTOR_BACKEND = "ultralytics"
+
+# Path to exported ONNX model (see models/download_models.py --onnx)
+ONNX_MODEL_PATH = "models/yolov8n.onnx"
+
+# Model input size in pixels (square, used by the ONNX backend)
+INPUT_SIZE = 640
+
+# ONNX Runtime intra-op threads (0 = let ONNX Runtime decide)
+ONNX_NUM_THREADS = 0
+
 # Confidence threshold for detections
 CONFIDENCE_THRESHOLD = 0.5
 
+# Detections between this and CONFIDENCE_THRESHOLD form a low tier that
+# only extends existing tracks (e.g. partly occluded vehicles) and never
+# starts new ones (None disables the low tier; e.g. 0.1 enables it)
+LOW_CONFIDENCE_THRESHOLD = None
+
 # IOU threshold for NMS
 IOU_THRESHOLD = 0.45
 
+# Dummy inference passes per input size when the detector is created,
+# so the first real frames are not slowed by lazy initialization
+WARMUP_RUNS = 2
+
+# Frame size (height, width) the warm-up uses when the camera's own is
+# not known yet. Dummy frames go through the same zone crop and tiles
+# as real ones, so the model is warmed at the shapes it will really see
+WARMUP_FRAME_SHAPE = (1080, 1920)
+
+# Directory for exported/optimized model artifacts, keyed by model
+# hash, backend and input size (None disables the cache)
+MODEL_CACHE_DIR = "models/cache"
+
+# Ahead-of-time format for the ultralytics backend: None (run the .pt
+# directly) or "torchscript" (exported once and cached)
+ULTRALYTICS_EXPORT_FORMAT = None
+
+# Batched inference: maximum frames per forward pass (1 = no batching)
+BATCH_SIZE = 1
+
+# Maximum time (seconds) to wait for a micro-batch to fill before
+# running inference on whatever has been collected
+BATCH_MAX_WAIT = 0.05
+
+# Tiled inference for high-resolution (e.g. 4K) cameras: the zone of
+# interest is cut into overlapping tiles that run as batches and whose
+# boxes are merged across tile seams
+TILED_INFERENCE = False
+
+# Overlap between neighbouring tiles (fraction of tile size)
+TILE_OVERLAP = 0.2
+
+# Tile tiers from far field (top) to near field (bottom):
+# (zone height fraction where the tier ends, tile size in source pixels,
+#  model input size). Far-field tiles are small and run at a lower input
+# size but close to native resolution; near-field tiles cover more of
+# the frame and are downscaled, since near vehicles are large.
+TILE_TIERS = [
+    (0.35, 480, 480),
+    (1.0, 1280, 640),
+]
+
+# How boxes from overlapping tiles are merged: "nms" or "wbf"
+# (weighted box fusion)
+TILE_MERGE = "nms"
+
+# IoU above which boxes from different tiles are the same vehicle
+TILE_MERGE_IOU = 0.5
+
 # COCO classes for vehicles:
 # 2: car, 3: motorcycle, 5: bus, 7: truck
 VEHICLE_CLASSES = [2, 3, 5, 7]
@@ -59,10 +168,44 @@ CLASS_NAMES = {
     7: "truck"
 }
 
+# ======================
+# MOTION GATE
+# ======================
+
+# Skip inference when nothing moves and no vehicles are being tracked
+MOTION_GATE = False
+
+# Gate method: "diff" (frame differencing) or "mog2" (background model)
+MOTION_GATE_METHOD = "diff"
+
+# Width (pixels) of the downscaled frame the gate looks at
+MOTION_GATE_WIDTH = 160
+
+# Gray-level change that counts as a moving pixel ("diff" method)
+MOTION_PIXEL_THRESHOLD = 25
+
+# Fraction of moving pixels needed to call it motion
+MOTION_MIN_AREA = 0.002
+
 # ======================
 # TRACKING SETTINGS
 # ======================
 
+# Adaptive detection stride: run the detector every k frames and
+# predict track positions in between. k adapts to track count, track
+# speed and detector latency. Not used with PIPELINED.
+ADAPTIVE_STRIDE = False
+
+# Upper bound for the detection stride k
+MAX_DETECTION_STRIDE = 5
+
+# Max predicted displacement between keyframes, as a fraction of
+# MAX_DISTANCE; faster vehicles force a smaller stride
+STRIDE_MAX_SHIFT = 0.5
+
+# Each this many live tracks lowers the stride by one
+STRIDE_TRACKS_PER_STEP = 10
+
 # Maximum frames to keep a track alive without detection
 MAX_DISAPPEARED = 30
 
@@ -72,6 +215,52 @@ MAX_DISTANCE = 100
 # Minimum detections before considering a track valid
 MIN_HITS = 3
 
+# Measured positions kept per track (ring buffer length)
+TRACK_HISTORY = 30
+
+# Track slots preallocated by the tracker (grows if exceeded)
+TRACK_CAPACITY = 256
+
+# Track-to-detection assignment: "greedy" (nearest first) or
+# "hungarian" (optimal over the gated cost matrix; needs scipy)
+ASSOCIATION_METHOD = "greedy"
+
+# Association cost: "centroid" (pixel distance, gated by MAX_DISTANCE)
+# or a box-aware cost whose gate scales with vehicle size: "iou"
+# (1 - IoU), "giou" (1 - generalized IoU) or "normalized" (centre
+# distance in multiples of the track's box size)
+ASSOCIATION_COST = "centroid"
+
+# Gate of each box-aware cost, in that cost's units
+ASSOCIATION_COST_GATES = {"iou": 0.9, "giou": 1.0, "normalized": 1.0}
+
+# Pairs a box-aware cost rejects (e.g. boxes that stopped overlapping
+# after a detection stride) may still match by centroid distance within
+# this many track box diagonals, capped at MAX_DISTANCE
+ASSOCIATION_FALLBACK_DIAGONALS = 1.5
+
+# Constant-velocity Kalman filter per track: association uses the
+# predicted position and speed is read from the filtered velocity
+KALMAN_FILTER = False
+
+# Std of unmodelled acceleration (pixels / s^2)
+KALMAN_ACCEL_NOISE = 100.0
+
+# Std of a detected centroid (pixels)
+KALMAN_MEASUREMENT_NOISE = 4.0
+
+# Std of a new track's unknown velocity (pixels / s)
+KALMAN_INITIAL_VELOCITY_STD = 1000.0
+
+# Association gate in standard deviations of the predicted position;
+# uncertain (new or long-unseen) tracks may match beyond MAX_DISTANCE
+KALMAN_GATE_SIGMAS = 3.0
+
+# Tracks from which association switches to a spatial grid: only
+# track/detection pairs in neighbouring cells are compared instead of
+# building the full distance matrix (smaller scenes stay dense)
+GRID_GATING_MIN_TRACKS = 64
+
 # ======================
 # VISUALIZATION
 # ======================
@@ -111,6 +300,46 @@ LOG_COLUMNS = [
     "confidence"
 ]
 
+# Tracker checkpoints: tracks, logged vehicles and counters are saved
+# every CHECKPOINT_INTERVAL seconds and restored on startup, so a
+# restarted camera keeps its vehicle ids. A checkpoint is only restored
+# for the source it was saved from. (None disables checkpoints; e.g.
+# "logs/checkpoints" enables them, as does --checkpoint-dir)
+CHECKPOINT_DIR = None
+CHECKPOINT_INTERVAL = 5.0
+
+# ======================
+# STARTUP
+# ======================
+
+# Target time (seconds) from launch until the system is ready to serve
+# (API) or process frames (standalone); exceeding it prints a warning
+STARTUP_BUDGET = 2.0
+
+# ======================
+# SUPERVISOR (MULTI-PROCESS)
+# ======================
+
+# Detector processes shared by all camera worker processes
+DETECTOR_PROCESSES = 2
+
+# Frames per camera shared-memory ring (max frames in flight per camera)
+FRAME_RING_SLOTS = 4
+
+# Seconds a camera waits for detections before predicting instead
+DETECTION_TIMEOUT = 5.0
+
+# Seconds between worker health checks
+SUPERVISOR_POLL_INTERVAL = 1.0
+
+# Seconds before a crashed worker is restarted (doubles per crash,
+# reset after the worker stays up for a minute)
+RESTART_BACKOFF = 1.0
+
+# Seconds between re-assigning camera workers to CPU cores by load
+# (Linux only; 0 disables)
+REBALANCE_INTERVAL = 30.0
+
 # ======================
 # API SERVER
 # ======================
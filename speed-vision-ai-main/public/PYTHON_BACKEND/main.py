@@ -6,11 +6,14 @@ Vehicle Speed Detection System using Computer Vision
 
 Usage:
     python main.py --source VIDEO_PATH [--api] [--limit SPEED_LIMIT]
+    python main.py --source CAM1 CAM2 ... | --cameras CAMERAS_FILE
+    python main.py --cameras CAMERAS_FILE --supervise [--detector-procs N]
 
 Examples:
     python main.py --source test_video.mp4
     python main.py --source 0  # Webcam
     python main.py --source test_video.mp4 --api --limit 60
+    python main.py --source rtsp://cam1/stream rtsp://cam2/stream
 """
 
 import argparse
@@ -21,6 +24,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Start the startup clock before anything heavy is imported. Heavy
+# modules (cv2, torch/ultralytics, ...) are only imported once the
+# selected mode needs them.
+from src.startup import profile
+
 
 def main():
     """Main entry point."""
@@ -40,14 +48,31 @@ Examples:
 
   Custom speed limit:
     python main.py --source video.mp4 --limit 60
+
+  Several cameras sharing one detector:
+    python main.py --source north.mp4 south.mp4
+    python main.py --cameras cameras.txt
+
+  Many cameras, one process per camera plus a detector pool:
+    python main.py --cameras cameras.txt --supervise --detector-procs 4
         """
     )
     
     parser.add_argument(
         "--source", "-s",
         type=str,
-        default="0",
-        help="Video source: file path or camera index (default: 0 for webcam)"
+        nargs="+",
+        default=None,
+        help="Video source(s): file path or camera index (default: 0 for webcam; "
+             "with --api, omit to run the demo simulation). Several sources "
+             "are processed together with one shared detector."
+    )
+    
+    parser.add_argument(
+        "--cameras",
+        type=str,
+        default=None,
+        help="Cameras file: one source (or name=source) per line"
     )
     
     parser.add_argument(
@@ -69,6 +94,69 @@ Examples:
         help="Disable preview window"
     )
     
+    parser.add_argument(
+        "--supervise",
+        action="store_true",
+        help="Run each camera in its own process with a shared pool of "
+             "detector processes (restarts crashed workers)"
+    )
+    
+    parser.add_argument(
+        "--detector-procs",
+        type=int,
+        default=None,
+        help="Detector processes for --supervise (default: from settings)"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Frames per detector call for batched inference (default: from settings)"
+    )
+    
+    parser.add_argument(
+        "--backend",
+        choices=["ultralytics", "onnx"],
+        default=None,
+        help="Detector inference backend (default: from settings)"
+    )
+    
+    parser.add_argument(
+        "--low-confidence",
+        type=float,
+        default=None,
+        help="Extend existing tracks with detections down to this confidence "
+             "(default: from settings, where it is off)"
+    )
+    
+    parser.add_argument(
+        "--adaptive-stride",
+        action="store_true",
+        help="Run the detector every k frames and predict tracks in between"
+    )
+    
+    parser.add_argument(
+        "--motion-gate",
+        action="store_true",
+        help="Skip inference on static frames when no vehicles are tracked"
+    )
+    
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Run detect, track, render and logging as concurrent stages "
+             "(turns off adaptive stride and motion gate)"
+    )
+    
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default=None,
+        help="Save tracker checkpoints here and resume from them on restart "
+             "(default: from settings, where it is off)"
+    )
+    
     parser.add_argument(
         "--calibrate",
         type=float,
@@ -76,8 +164,30 @@ Examples:
         help="Pixels per meter calibration value"
     )
     
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report per-module import times and startup phases"
+    )
+    
     args = parser.parse_args()
     
+    # Camera name -> source
+    if args.cameras:
+        from src.multi_camera import load_camera_sources
+        sources = load_camera_sources(args.cameras)
+    else:
+        sources = {f"cam{i}": source for i, source in enumerate(args.source or [])}
+    if args.api and len(sources) > 1:
+        parser.error("--api supports a single --source")
+    if args.api and args.supervise:
+        parser.error("--api cannot be combined with --supervise")
+    if args.pipelined and (args.supervise or len(sources) > 1):
+        parser.error("--pipelined supports a single --source without --supervise")
+    if args.batch_size and len(sources) > 1 and not args.supervise:
+        parser.error("--batch-size applies to a single --source or --supervise; "
+                     "several cameras are batched together automatically")
+    
     print("""
 ╔═══════════════════════════════════════════════════════════╗
 ║                                                           ║
@@ -100,33 +210,96 @@ Examples:
 ╚═══════════════════════════════════════════════════════════╝
     """)
     
+    processor_kwargs = {}
+    if args.batch_size:
+        processor_kwargs["batch_size"] = args.batch_size
+    if args.backend:
+        processor_kwargs["backend"] = args.backend
+    if args.low_confidence is not None:
+        processor_kwargs["low_confidence"] = args.low_confidence
+    if args.adaptive_stride:
+        processor_kwargs["adaptive_stride"] = True
+    if args.motion_gate:
+        processor_kwargs["motion_gate"] = True
+    if args.pipelined:
+        processor_kwargs["pipelined"] = True
+    if args.checkpoint_dir:
+        processor_kwargs["checkpoint_dir"] = args.checkpoint_dir
+    
     if args.api:
         # Run API server mode
         print("Starting in API Server mode...")
         print("Web dashboard can connect to this server.\n")
         
-        from src.api_server import run_server
-        run_server()
+        # The server starts serving before the model is loaded; with a
+        # source, model load and warm-up run in a background thread
+        run_server = profile.timed_import("src.api_server").run_server
+        processor_kwargs["speed_limit"] = args.limit
+        if args.profile_startup:
+            print("\n".join(profile.report()))
+        run_server(source=next(iter(sources.values()), None), processor_kwargs=processor_kwargs)
+    
+    elif args.supervise:
+        # Run multi-process mode
+        print("Starting in Supervisor mode...\n")
+        
+        Supervisor = profile.timed_import("src.supervisor").Supervisor
+        supervisor_kwargs = {}
+        if args.detector_procs:
+            supervisor_kwargs["detector_processes"] = args.detector_procs
+        if "backend" in processor_kwargs:
+            supervisor_kwargs["backend"] = processor_kwargs.pop("backend")
+        if "low_confidence" in processor_kwargs:
+            supervisor_kwargs["low_confidence"] = processor_kwargs.pop("low_confidence")
+        supervisor_kwargs["batch_size"] = processor_kwargs.pop("batch_size", None)
+        processor_kwargs["speed_limit"] = args.limit
+        
+        supervisor = Supervisor(
+            sources or {"cam0": "0"},
+            processor_kwargs=processor_kwargs,
+            **supervisor_kwargs
+        )
+        supervisor.run()
     
     else:
         # Run standalone mode
         print("Starting in Standalone mode...\n")
         
         try:
-            from src.video_processor import VideoProcessor
+            for name in ("numpy", "cv2"):
+                profile.timed_import(name)
             
-            processor = VideoProcessor(
-                source=args.source,
-                speed_limit=args.limit,
-                show_preview=not args.no_preview
-            )
+            if len(sources) > 1:
+                # One process, one model, many cameras
+                MultiCameraProcessor = profile.timed_import("src.multi_camera").MultiCameraProcessor
+                processor = MultiCameraProcessor(
+                    sources,
+                    speed_limit=args.limit,
+                    show_preview=not args.no_preview,
+                    **processor_kwargs
+                )
+                speed_calcs = [camera.speed_calc for camera in processor.cameras.values()]
+            else:
+                VideoProcessor = profile.timed_import("src.video_processor").VideoProcessor
+                processor = VideoProcessor(
+                    source=next(iter(sources.values()), "0"),
+                    speed_limit=args.limit,
+                    show_preview=not args.no_preview,
+                    **processor_kwargs
+                )
+                speed_calcs = [processor.speed_calc]
             
             if args.calibrate:
-                processor.speed_calc.update_calibration(args.calibrate)
+                for speed_calc in speed_calcs:
+                    speed_calc.update_calibration(args.calibrate)
                 print(f"Calibration set to: {args.calibrate} pixels/meter")
             
+            profile.mark("processor_ready")
+            if args.profile_startup or not profile.within_budget("processor_ready"):
+                print("\n".join(profile.report()))
+            
             # Run processing loop
-            for frame, detections in processor.run():
+            for _ in processor.run():
                 pass  # Frame display is handled internally
         
         except KeyboardInterrupt:
@@ -60,5 +60,44 @@ def download_yolo_model():
     return True
 
 
+def export_onnx_model(imgsz: int = 640):
+    """Export YOLOv8n to ONNX for the torch-free ONNX Runtime backend."""
+    try:
+        from ultralytics import YOLO
+        
+        models_dir = Path(__file__).parent
+        onnx_path = models_dir / "yolov8n.onnx"
+        
+        if onnx_path.exists():
+            print(f"✓ ONNX model already exists at: {onnx_path}")
+            return True
+        
+        print("Exporting YOLOv8n to ONNX...")
+        model = YOLO("yolov8n.pt")
+        
+        # Dynamic axes allow batched inference with any batch size
+        exported = model.export(format="onnx", imgsz=imgsz, dynamic=True)
+        Path(exported).replace(onnx_path)
+        
+        print(f"✓ ONNX model exported to: {onnx_path}")
+        print("  Set DETECTOR_BACKEND = \"onnx\" in config/settings.py to use it.")
+        print("  Runtime only needs: pip install onnxruntime")
+    
+    except ImportError:
+        print("ERROR: ultralytics package not installed!")
+        print("Run: pip install ultralytics")
+        return False
+    
+    except Exception as e:
+        print(f"ERROR exporting model: {e}")
+        return False
+    
+    return True
+
+
 if __name__ == "__main__":
+    import sys
+    
     download_yolo_model()
+    if "--onnx" in sys.argv:
+        export_onnx_model()
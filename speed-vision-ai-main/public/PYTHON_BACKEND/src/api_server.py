@@ -7,6 +7,7 @@ Includes auto-location feature using FREE IP geolocation.
 
 import asyncio
 import json
+import threading
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pathlib import Path
@@ -23,6 +24,7 @@ from config.settings import API_HOST, API_PORT, CORS_ORIGINS, SPEED_LIMIT
 
 # Import geolocation module
 from src.geolocation import get_location, LocationData
+from src.startup import profile
 
 
 # Create FastAPI app
@@ -65,7 +67,11 @@ state = {
         "resolution": "1920x1080",
         "fps": 30
     },
-    "location_data": None  # Will be populated on startup
+    "location_data": None,  # Will be populated on startup
+    "model_status": "not_loaded",  # not_loaded, loading, ready, error
+    "model_error": None,
+    "source": None,  # Live video source; None runs the demo simulation
+    "processor_kwargs": {}
 }
 
 
@@ -97,6 +103,9 @@ async def get_status():
     """Get system status."""
     return {
         "is_running": state["is_running"],
+        "model_status": state["model_status"],
+        "model_error": state["model_error"],
+        "startup": profile.to_dict(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -299,14 +308,61 @@ async def simulate_detections():
         await asyncio.sleep(random.uniform(1.0, 3.0))
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Start background tasks on server startup."""
+def add_vehicle_record(record: Dict[str, Any]):
+    """Add a finalized vehicle record to the recent logs and speed stats."""
+    stats = state["stats"]
+    finalized = stats.get("finalized_vehicles", 0) + 1
+    stats["finalized_vehicles"] = finalized
+    stats["average_speed"] = round(
+        (stats["average_speed"] * (finalized - 1) + record["speed"]) / finalized, 1
+    )
+    stats["max_speed_today"] = max(stats["max_speed_today"], record["speed"])
+    
+    state["recent_logs"].insert(0, record)
+    state["recent_logs"] = state["recent_logs"][:100]
+
+
+def run_processor(source: str, processor_kwargs: Dict[str, Any]):
+    """
+    Load the model and process a live source (runs in a background thread).
+    
+    The server is already answering requests while this runs; /status
+    reports model_status as "loading" until the detector is loaded and
+    warmed up.
+    """
+    state["model_status"] = "loading"
+    
+    try:
+        VideoProcessor = profile.timed_import("src.video_processor").VideoProcessor
+        processor = VideoProcessor(source=source, show_preview=False, **processor_kwargs)
+    except Exception as e:
+        state["model_status"] = "error"
+        state["model_error"] = str(e)
+        print(f"⚠️ Failed to start video processor: {e}")
+        return
+    
+    state["processor"] = processor
+    state["model_status"] = "ready"
+    profile.mark("model_ready")
+    
+    # Finalized vehicles feed the logs and running stats incrementally
+    processor.subscribe_records(add_vehicle_record)
+    
+    for _, detections in processor.run():
+        stats = processor.get_stats()
+        state["stats"]["total_vehicles"] = stats["total_vehicles"]
+        state["stats"]["overspeed_count"] = stats["overspeed_count"]
+        state["active_detections"] = detections
+        if not state["is_running"]:
+            processor.is_running = False
+
+
+async def detect_location():
+    """Auto-detect location without blocking server startup."""
     global auto_location
     
-    # Auto-detect location on startup
     print("🌍 Auto-detecting location...")
-    auto_location = get_location()
+    auto_location = await asyncio.to_thread(get_location)
     state["location_data"] = auto_location.to_dict()
     
     if auto_location.is_auto_detected:
@@ -314,13 +370,56 @@ async def startup_event():
         state["config"]["location"] = auto_location.formatted
     else:
         print("⚠️ Location not detected - using fallback")
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Start background tasks on server startup."""
+    # Network lookups and model loading run in the background so
+    # /status is served immediately
+    asyncio.create_task(detect_location())
     
     state["is_running"] = True
-    asyncio.create_task(simulate_detections())
+    
+    if state["source"] is not None:
+        threading.Thread(
+            target=run_processor,
+            args=(state["source"], state["processor_kwargs"]),
+            daemon=True
+        ).start()
+    else:
+        asyncio.create_task(simulate_detections())
+    
+    profile.mark("server_ready")
+    if not profile.within_budget("server_ready"):
+        print("\n".join(profile.report()))
+
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the live processor, if any."""
+    state["is_running"] = False
 
-def run_server(host: str = API_HOST, port: int = API_PORT):
-    """Run the API server."""
+
+def run_server(
+    host: str = API_HOST,
+    port: int = API_PORT,
+    source: Optional[str] = None,
+    processor_kwargs: Optional[Dict[str, Any]] = None
+):
+    """
+    Run the API server.
+    
+    Args:
+        host: Interface to bind
+        port: Port to listen on
+        source: Live video source; without one the server runs the
+            demo simulation
+        processor_kwargs: Extra VideoProcessor arguments
+    """
+    state["source"] = source
+    state["processor_kwargs"] = processor_kwargs or {}
+    
     print(f"\n🚀 Starting SpeedWatch Pro API Server")
     print(f"   URL: http://{host}:{port}")
     print(f"   Docs: http://{host}:{port}/docs")
@@ -0,0 +1,299 @@
+"""
+SpeedWatch Pro - Track Association
+==================================
+Assignment of detections to tracks given a cost matrix (rows are
+tracks, columns are detections). Pairs whose cost exceeds the gate are
+never matched. Costs may be dense matrices or a SparseCost listing
+only the candidate pairs inside the gate.
+
+Box-aware cost functions (IoU, GIoU, size-normalized distance) build
+the whole tracks x detections matrix in one broadcast; their pairwise
+forms score only a list of candidate pairs.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple, Union
+
+from src.detections import box_iou, box_giou, box_iou_pairs, box_giou_pairs
+
+Assignment = Tuple[np.ndarray, np.ndarray]
+
+
+@dataclass
+class SparseCost:
+    """
+    Costs of candidate (track, detection) pairs; every other pair is
+    treated as outside the gate.
+    """
+    rows: np.ndarray
+    cols: np.ndarray
+    costs: np.ndarray
+    shape: Tuple[int, int]
+    
+    @classmethod
+    def from_dense(cls, cost: np.ndarray, max_cost: float) -> "SparseCost":
+        """Keep the pairs of a dense cost matrix that pass the gate."""
+        rows, cols = np.nonzero(cost <= max_cost)
+        return cls(rows, cols, cost[rows, cols], cost.shape)
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+Cost = Union[np.ndarray, SparseCost]
+
+
+def _empty() -> Assignment:
+    return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+
+def greedy_assignment(cost: Cost, max_cost: float) -> Assignment:
+    """
+    Nearest-first assignment.
+    
+    Tracks are visited by their lowest cost; each takes its cheapest
+    detection unless another track already took it. Fast, but can
+    leave a track unmatched when its best detection is claimed first.
+    
+    Args:
+        cost: Cost matrix of shape (tracks, detections), or SparseCost
+        max_cost: Gate; costlier pairs are never matched
+    
+    Returns:
+        Tuple of (rows, cols) of matched pairs
+    """
+    if isinstance(cost, SparseCost):
+        return _greedy_sparse(cost, max_cost)
+    
+    if cost.size == 0:
+        return _empty()
+    
+    rows = cost.min(axis=1).argsort(kind="stable")
+    cols = cost.argmin(axis=1)[rows]
+    
+    used_rows = np.zeros(cost.shape[0], dtype=bool)
+    used_cols = np.zeros(cost.shape[1], dtype=bool)
+    matched_rows, matched_cols = [], []
+    
+    for row, col in zip(rows, cols):
+        if used_rows[row] or used_cols[col] or cost[row, col] > max_cost:
+            continue
+        
+        used_rows[row] = True
+        used_cols[col] = True
+        matched_rows.append(row)
+        matched_cols.append(col)
+    
+    return np.array(matched_rows, dtype=np.intp), np.array(matched_cols, dtype=np.intp)
+
+
+def _greedy_sparse(cost: SparseCost, max_cost: float) -> Assignment:
+    """greedy_assignment over candidate pairs only."""
+    keep = cost.costs <= max_cost
+    pair_rows, pair_cols, pair_costs = cost.rows[keep], cost.cols[keep], cost.costs[keep]
+    if len(pair_rows) == 0:
+        return _empty()
+    
+    # Each track's cheapest pair, tracks ordered by that cost
+    order = np.lexsort((pair_cols, pair_costs, pair_rows))
+    first = np.r_[True, pair_rows[order][1:] != pair_rows[order][:-1]]
+    best = order[first]
+    best = best[np.argsort(pair_costs[best], kind="stable")]
+    
+    used_cols = np.zeros(cost.shape[1], dtype=bool)
+    matched_rows, matched_cols = [], []
+    
+    for row, col in zip(pair_rows[best], pair_cols[best]):
+        if used_cols[col]:
+            continue
+        
+        used_cols[col] = True
+        matched_rows.append(row)
+        matched_cols.append(col)
+    
+    return np.array(matched_rows, dtype=np.intp), np.array(matched_cols, dtype=np.intp)
+
+
+def gated_components(rows: np.ndarray, cols: np.ndarray, shape: Tuple[int, int]):
+    """
+    Split gated track/detection pairs into independent sub-problems.
+    
+    Tracks and detections are nodes of a bipartite graph with an edge
+    for every pair inside the gate; each connected component can be
+    assigned on its own.
+    
+    Args:
+        rows: Track index of each gated pair
+        cols: Detection index of each gated pair
+        shape: (tracks, detections)
+    
+    Yields:
+        Tuples of (rows, cols, pairs) index arrays, one per component:
+        its tracks, its detections and the positions of its gated pairs
+        in the input arrays
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    
+    n_rows, n_cols = shape
+    
+    # Detections are nodes n_rows..n_rows + n_cols - 1
+    graph = coo_matrix(
+        (np.ones(len(rows), dtype=np.int8), (rows, cols + n_rows)),
+        shape=(n_rows + n_cols, n_rows + n_cols)
+    )
+    _, labels = connected_components(graph, directed=False)
+    
+    # Only nodes with at least one edge take part
+    edge_rows = np.unique(rows)
+    edge_cols = np.unique(cols)
+    row_groups = _group_by_label(labels[edge_rows])
+    col_groups = _group_by_label(labels[edge_cols + n_rows])
+    pair_groups = _group_by_label(labels[rows])
+    
+    for label, members in row_groups.items():
+        yield edge_rows[members], edge_cols[col_groups[label]], pair_groups[label]
+
+
+def _group_by_label(labels: np.ndarray) -> Dict[int, np.ndarray]:
+    """Map each label to the positions carrying it (one sort, no scans)."""
+    order = np.argsort(labels, kind="stable")
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    starts = labels[order][np.r_[0, bounds]] if len(order) else []
+    return dict(zip(starts, np.split(order, bounds)))
+
+
+def optimal_assignment(cost: Cost, max_cost: float) -> Assignment:
+    """
+    Minimum total cost assignment (Hungarian algorithm) within the gate.
+    
+    Among assignments with the most matched pairs, picks the one with
+    the lowest total cost. The gated pairs are split into connected
+    components first, so sparse scenes with many tracks solve many
+    small problems instead of one large one; isolated pairs skip the
+    solver entirely.
+    
+    Args:
+        cost: Cost matrix of shape (tracks, detections), or SparseCost
+        max_cost: Gate; costlier pairs are never matched
+    
+    Returns:
+        Tuple of (rows, cols) of matched pairs
+    """
+    from scipy.optimize import linear_sum_assignment
+    
+    if not isinstance(cost, SparseCost):
+        cost = SparseCost.from_dense(cost, max_cost)
+    
+    keep = cost.costs <= max_cost
+    rows, cols, values = cost.rows[keep], cost.cols[keep], cost.costs[keep]
+    if len(rows) == 0:
+        return _empty()
+    
+    # Pairs that only see each other need no solver
+    row_degree = np.bincount(rows, minlength=cost.shape[0])
+    col_degree = np.bincount(cols, minlength=cost.shape[1])
+    isolated = (row_degree[rows] == 1) & (col_degree[cols] == 1)
+    matched_rows, matched_cols = [rows[isolated]], [cols[isolated]]
+    rows, cols, values = rows[~isolated], cols[~isolated], values[~isolated]
+    
+    # Gated-out pairs cost more than any set of gated pairs, so the
+    # solver never trades a match for a lower total
+    forbidden = max_cost * (1 + min(cost.shape)) + 1.0
+    
+    if len(rows):
+        # Pair costs scattered into a lookup so each component's block
+        # can be filled without a dense tracks x detections matrix
+        row_pos = np.empty(cost.shape[0], dtype=np.intp)
+        col_pos = np.empty(cost.shape[1], dtype=np.intp)
+        
+        for comp_rows, comp_cols, pairs in gated_components(rows, cols, cost.shape):
+            row_pos[comp_rows] = np.arange(len(comp_rows))
+            col_pos[comp_cols] = np.arange(len(comp_cols))
+            
+            sub = np.full((len(comp_rows), len(comp_cols)), forbidden)
+            sub[row_pos[rows[pairs]], col_pos[cols[pairs]]] = values[pairs]
+            
+            sub_rows, sub_cols = linear_sum_assignment(sub)
+            keep = sub[sub_rows, sub_cols] <= max_cost
+            matched_rows.append(comp_rows[sub_rows[keep]])
+            matched_cols.append(comp_cols[sub_cols[keep]])
+    
+    return np.concatenate(matched_rows), np.concatenate(matched_cols)
+
+
+ASSIGNMENT_METHODS: Dict[str, Callable[[np.ndarray, float], Assignment]] = {
+    "greedy": greedy_assignment,
+    "hungarian": optimal_assignment,
+}
+
+
+# ======================
+# Box-aware costs
+# ======================
+# Each takes track boxes (T, 4) and detection boxes (N, 4) as
+# x1, y1, x2, y2 and returns a (T, N) cost matrix; lower is better.
+# The pairwise forms take row-aligned boxes (P, 4) and (P, 4) and
+# return the P costs of track_boxes[i] against boxes[i].
+
+def iou_cost(track_boxes: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """1 - IoU (0 for identical boxes, 1 for disjoint ones)."""
+    return 1.0 - box_iou(track_boxes, boxes)
+
+
+def iou_pair_cost(track_boxes: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """iou_cost of row-aligned box pairs."""
+    return 1.0 - box_iou_pairs(track_boxes, boxes)
+
+
+def giou_cost(track_boxes: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """1 - generalized IoU (0 to 2; still ranks disjoint boxes)."""
+    return 1.0 - box_giou(track_boxes, boxes)
+
+
+def giou_pair_cost(track_boxes: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """giou_cost of row-aligned box pairs."""
+    return 1.0 - box_giou_pairs(track_boxes, boxes)
+
+
+def normalized_distance_cost(track_boxes: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """
+    Centre distance in multiples of the track's box size.
+    
+    Size is the geometric mean of width and height, so a gate of 1.0
+    allows a truck to move further than a distant car.
+    """
+    return normalized_distance_pair_cost(track_boxes[:, None], boxes[None, :])
+
+
+def normalized_distance_pair_cost(track_boxes: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """normalized_distance_cost of row-aligned (or broadcast) box pairs."""
+    track_boxes = track_boxes.astype(np.float32)
+    boxes = boxes.astype(np.float32)
+    
+    track_centers = (track_boxes[..., :2] + track_boxes[..., 2:]) / 2
+    centers = (boxes[..., :2] + boxes[..., 2:]) / 2
+    delta = track_centers - centers
+    
+    wh = track_boxes[..., 2:] - track_boxes[..., :2]
+    size = np.sqrt(np.maximum(wh[..., 0] * wh[..., 1], 1.0))
+    return np.sqrt((delta ** 2).sum(axis=-1)) / size
+
+
+CostFunction = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+# Box-aware association costs by name ("centroid" is the tracker's
+# built-in pixel distance)
+COST_FUNCTIONS: Dict[str, CostFunction] = {
+    "iou": iou_cost,
+    "giou": giou_cost,
+    "normalized": normalized_distance_cost,
+}
+
+# Pairwise forms of COST_FUNCTIONS, for costs of candidate pairs only
+PAIR_COST_FUNCTIONS: Dict[str, CostFunction] = {
+    "iou": iou_pair_cost,
+    "giou": giou_pair_cost,
+    "normalized": normalized_distance_pair_cost,
+}
@@ -0,0 +1,176 @@
+"""
+SpeedWatch Pro - Threaded Frame Capture
+=======================================
+Decodes frames ahead of processing in a background thread, so decode
+time overlaps with inference instead of adding to it.
+"""
+
+import queue
+import threading
+import time
+from typing import Optional, Tuple, Dict, Any
+
+import cv2
+import numpy as np
+
+# Import settings
+import sys
+sys.path.append('..')
+from config.settings import CAPTURE_QUEUE_SIZE
+
+
+def is_live_source(source: str) -> bool:
+    """Check whether a source is a live camera/stream rather than a file."""
+    return source.isdigit() or source.lower().startswith(("rtsp://", "rtmp://", "http://", "https://"))
+
+
+class FrameReader:
+    """
+    Reads frames from a cv2.VideoCapture in its own thread.
+    
+    Decoded frames go into a bounded queue. When the queue is full the
+    policy decides what happens: "block" makes the decoder wait (no
+    frame is ever lost; right for files), "drop_oldest" discards the
+    oldest queued frame (latency stays bounded; right for live cameras).
+    
+    Every frame carries its sequence number in the source, counting
+    dropped frames too, so timestamps stay correct when frames are lost.
+    
+    Attributes:
+        policy: "block" or "drop_oldest"
+        frames_decoded: Frames read from the source
+        frames_dropped: Frames discarded by the drop_oldest policy
+    """
+    
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        policy: str = "block",
+        queue_size: int = CAPTURE_QUEUE_SIZE,
+        loop: bool = True
+    ):
+        """
+        Initialize the reader.
+        
+        Args:
+            cap: Opened video capture
+            policy: "block" or "drop_oldest"
+            queue_size: Max decoded frames held ahead of the consumer
+            loop: Rewind to the start at end of file instead of stopping
+        """
+        if policy not in ("block", "drop_oldest"):
+            raise ValueError(f"Unknown capture policy '{policy}'. Choose from: block, drop_oldest")
+        
+        self.cap = cap
+        self.policy = policy
+        self.loop = loop
+        self.queue: "queue.Queue[Optional[Tuple[int, np.ndarray]]]" = queue.Queue(maxsize=queue_size)
+        
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._sequence = 0
+        
+        # Stats
+        self.frames_decoded = 0
+        self.frames_dropped = 0
+        self.decode_time = 0.0
+        self.max_depth = 0
+    
+    def start(self) -> "FrameReader":
+        """Start the decode thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="frame-reader", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop the decode thread and wait for it to exit."""
+        self._stop.set()
+        
+        # Unblock a decoder waiting on a full queue
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+    
+    def _put(self, item: Optional[Tuple[int, np.ndarray]]):
+        """Queue an item according to the policy."""
+        if self.policy == "drop_oldest":
+            while True:
+                try:
+                    self.queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.frames_dropped += 1
+                    except queue.Empty:
+                        pass
+        else:
+            while not self._stop.is_set():
+                try:
+                    self.queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+        
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+    
+    def _run(self):
+        """Decode loop."""
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            ret, frame = self.cap.read()
+            
+            if not ret:
+                if self.loop:
+                    # Loop video for demo
+                    if not self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+                        time.sleep(0.01)
+                    continue
+                self._put(None)
+                return
+            
+            self.decode_time += time.perf_counter() - start
+            self.frames_decoded += 1
+            self._put((self._sequence, frame))
+            self._sequence += 1
+    
+    def read(self, timeout: Optional[float] = None) -> Tuple[bool, Optional[np.ndarray], int]:
+        """
+        Get the next decoded frame.
+        
+        Args:
+            timeout: Seconds to wait (None waits until a frame arrives)
+            
+        Returns:
+            Tuple of (ok, frame, sequence number)
+        """
+        try:
+            item = self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return False, None, -1
+        
+        if item is None:
+            return False, None, -1
+        
+        sequence, frame = item
+        return True, frame, sequence
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get capture statistics."""
+        return {
+            "policy": self.policy,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "frames_decoded": self.frames_decoded,
+            "frames_dropped": self.frames_dropped,
+            "decode_ms_per_frame": round(
+                self.decode_time / self.frames_decoded * 1000, 2
+            ) if self.frames_decoded else 0.0
+        }
@@ -0,0 +1,261 @@
+"""
+SpeedWatch Pro - Detection Containers
+=====================================
+Columnar (struct-of-arrays) detection results shared by the detector
+and the tracker.
+"""
+
+import numpy as np
+from typing import List, Tuple, Optional, Iterator
+from dataclasses import dataclass
+
+# Import settings
+import sys
+sys.path.append('..')
+from config.settings import CLASS_NAMES
+
+
+# Reverse lookup used when callers pass class names instead of ids
+CLASS_IDS = {name: class_id for class_id, name in CLASS_NAMES.items()}
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise IoU between two sets of boxes in one broadcast.
+    
+    Args:
+        a: Array of shape (N, 4) as x1, y1, x2, y2
+        b: Array of shape (M, 4) as x1, y1, x2, y2
+    
+    Returns:
+        Array of shape (N, M)
+    """
+    return box_iou_pairs(a[:, None], b[None, :])
+
+
+def box_iou_pairs(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    IoU of boxes taken pair by pair (a[i] with b[i]).
+    
+    Args:
+        a: Array of shape (..., 4) as x1, y1, x2, y2
+        b: Array broadcastable with a
+    
+    Returns:
+        Array of the broadcast shape without the last axis
+    """
+    inter, union, _ = _box_overlap(a, b)
+    return inter / union
+
+
+def box_giou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise generalized IoU between two sets of boxes.
+    
+    GIoU subtracts the share of the smallest enclosing box not covered
+    by the union, so it keeps ranking pairs that do not overlap
+    (range -1 to 1).
+    
+    Args:
+        a: Array of shape (N, 4) as x1, y1, x2, y2
+        b: Array of shape (M, 4) as x1, y1, x2, y2
+    
+    Returns:
+        Array of shape (N, M)
+    """
+    return box_giou_pairs(a[:, None], b[None, :])
+
+
+def box_giou_pairs(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Generalized IoU of boxes taken pair by pair (a[i] with b[i]).
+    
+    Args:
+        a: Array of shape (..., 4) as x1, y1, x2, y2
+        b: Array broadcastable with a
+    
+    Returns:
+        Array of the broadcast shape without the last axis
+    """
+    inter, union, enclose = _box_overlap(a, b)
+    return inter / union - (enclose - union) / enclose
+
+
+def _box_overlap(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Intersection, union and enclosing-box areas of broadcast boxes."""
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    
+    w = (np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0])).clip(0)
+    h = (np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1])).clip(0)
+    inter = w * h
+    
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter + 1e-9
+    
+    enclose_w = np.maximum(a[..., 2], b[..., 2]) - np.minimum(a[..., 0], b[..., 0])
+    enclose_h = np.maximum(a[..., 3], b[..., 3]) - np.minimum(a[..., 1], b[..., 1])
+    enclose = enclose_w * enclose_h + 1e-9
+    
+    return inter, union, enclose
+
+
+@dataclass
+class Detection:
+    """Represents a single vehicle detection."""
+    bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2
+    confidence: float
+    class_id: int
+    class_name: str
+    center: Tuple[int, int]
+
+
+@dataclass
+class DetectionBatch:
+    """
+    All detections of one frame as parallel NumPy arrays.
+    
+    Row i of every array describes detection i. Keeping detections in
+    columns lets the detector, tracker and speed calculator work on
+    whole arrays instead of creating a Python object per vehicle.
+    
+    Attributes:
+        boxes: Integer array of shape (N, 4) as x1, y1, x2, y2, or None
+            when only centroids are known
+        centers: Integer array of shape (N, 2) as x, y
+        confidences: Float array of shape (N,)
+        class_ids: Integer array of shape (N,); -1 for unknown class
+        low: Low-confidence detections of the same frame, or None.
+            They are not part of this batch (len() and the arrays
+            above exclude them); the tracker only uses them to extend
+            tracks that no regular detection matched.
+    """
+    boxes: Optional[np.ndarray]
+    centers: np.ndarray
+    confidences: np.ndarray
+    class_ids: np.ndarray
+    low: Optional["DetectionBatch"] = None
+    
+    @classmethod
+    def empty(cls) -> "DetectionBatch":
+        """Create a batch with no detections."""
+        return cls(
+            boxes=np.empty((0, 4), dtype=np.int32),
+            centers=np.empty((0, 2), dtype=np.int32),
+            confidences=np.empty(0, dtype=np.float32),
+            class_ids=np.empty(0, dtype=np.int32)
+        )
+    
+    @classmethod
+    def from_raw(
+        cls,
+        boxes: np.ndarray,
+        confidences: np.ndarray,
+        class_ids: np.ndarray
+    ) -> "DetectionBatch":
+        """
+        Build a batch from raw float boxes in frame coordinates.
+        
+        Args:
+            boxes: Array of shape (N, 4) as x1, y1, x2, y2
+            confidences: Array of shape (N,)
+            class_ids: Array of shape (N,)
+        """
+        boxes = np.asarray(boxes).reshape(-1, 4).astype(np.int32)
+        centers = (boxes[:, :2] + boxes[:, 2:]) // 2
+        
+        return cls(
+            boxes=boxes,
+            centers=centers,
+            confidences=np.asarray(confidences, dtype=np.float32),
+            class_ids=np.asarray(class_ids, dtype=np.int32)
+        )
+    
+    @classmethod
+    def from_lists(
+        cls,
+        centroids: np.ndarray,
+        bboxes: Optional[List[Tuple[int, int, int, int]]] = None,
+        class_names: Optional[List[str]] = None,
+        confidences: Optional[List[float]] = None
+    ) -> "DetectionBatch":
+        """
+        Build a batch from the per-detection lists used by older callers.
+        
+        Args:
+            centroids: Array of shape (N, 2)
+            bboxes: Optional list of bounding boxes
+            class_names: Optional list of class names
+            confidences: Optional list of confidences
+        """
+        centers = np.asarray(centroids).reshape(-1, 2)
+        n = len(centers)
+        
+        boxes = None
+        if bboxes is not None and n and all(b is not None for b in bboxes):
+            boxes = np.asarray(bboxes, dtype=np.int32).reshape(-1, 4)
+        
+        if class_names is None:
+            class_ids = np.full(n, -1, dtype=np.int32)
+        else:
+            class_ids = np.array([CLASS_IDS.get(name, -1) for name in class_names], dtype=np.int32)
+        
+        if confidences is None:
+            confidences = np.zeros(n, dtype=np.float32)
+        
+        return cls(
+            boxes=boxes,
+            centers=centers,
+            confidences=np.asarray(confidences, dtype=np.float32),
+            class_ids=class_ids
+        )
+    
+    def __len__(self) -> int:
+        return len(self.centers)
+    
+    def select(self, index) -> "DetectionBatch":
+        """Get a sub-batch from a boolean mask or an index array."""
+        return DetectionBatch(
+            boxes=None if self.boxes is None else self.boxes[index],
+            centers=self.centers[index],
+            confidences=self.confidences[index],
+            class_ids=self.class_ids[index]
+        )
+    
+    def split_tiers(self, threshold: float) -> "DetectionBatch":
+        """
+        Move detections below a confidence threshold into the low tier.
+        
+        Args:
+            threshold: Minimum confidence of regular detections
+        
+        Returns:
+            Batch of the detections at or above threshold, with the
+            others as its low tier
+        """
+        high = self.confidences >= threshold
+        batch = self.select(high)
+        batch.low = self.select(~high)
+        return batch
+    
+    def class_name(self, i: int) -> str:
+        """Get the display name of detection i's class."""
+        return CLASS_NAMES.get(int(self.class_ids[i]), "vehicle")
+    
+    def to_list(self) -> List[Detection]:
+        """Expand into Detection objects (for display and debugging)."""
+        detections = []
+        for i in range(len(self)):
+            bbox = tuple(self.boxes[i].tolist()) if self.boxes is not None else None
+            detections.append(Detection(
+                bbox=bbox,
+                confidence=float(self.confidences[i]),
+                class_id=int(self.class_ids[i]),
+                class_name=self.class_name(i),
+                center=tuple(self.centers[i].tolist())
+            ))
+        return detections
+    
+    def __iter__(self) -> Iterator[Detection]:
+        return iter(self.to_list())
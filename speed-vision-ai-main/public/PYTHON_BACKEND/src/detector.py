@@ -1,30 +1,814 @@
 """
 SpeedWatch Pro - Vehicle Detector
 =================================
-YOLOv8-based vehicle detection module.
+YOLOv8-based vehicle detection module with pluggable inference backends.
 """
 
+import os
+import time
 import numpy as np
-from typing import List, Tuple, Optional
-from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from typing import List, Tuple, Optional, Dict, Type, Union
 
 # Import settings
 import sys
 sys.path.append('..')
 from config.settings import (
-    MODEL_PATH, CONFIDENCE_THRESHOLD, IOU_THRESHOLD,
-    VEHICLE_CLASSES, CLASS_NAMES
+    MODEL_PATH, CONFIDENCE_THRESHOLD, LOW_CONFIDENCE_THRESHOLD, IOU_THRESHOLD,
+    VEHICLE_CLASSES,
+    DETECTOR_BACKEND, ONNX_MODEL_PATH, INPUT_SIZE, ONNX_NUM_THREADS,
+    DETECTION_ZONE_START, DETECTION_ZONE_END, DETECTION_ZONE_POLYGON,
+    CROP_TO_ZONE, ZONE_INPUT_SIZE,
+    TILED_INFERENCE, TILE_OVERLAP, TILE_TIERS, TILE_MERGE, TILE_MERGE_IOU,
+    WARMUP_RUNS, WARMUP_FRAME_SHAPE, MODEL_CACHE_DIR, ULTRALYTICS_EXPORT_FORMAT
 )
 
+from src.detections import Detection, DetectionBatch, box_iou, box_iou_pairs
+from src.startup import profile
+from src.model_cache import ModelArtifactCache, export_with_ultralytics
 
-@dataclass
-class Detection:
-    """Represents a single vehicle detection."""
-    bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2
-    confidence: float
-    class_id: int
-    class_name: str
-    center: Tuple[int, int]
+
+# Raw per-frame backend output: boxes (N, 4) as x1, y1, x2, y2 in frame
+# pixels, confidences (N,) and class ids (N,)
+RawDetections = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def non_max_suppression(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float,
+    class_ids: Optional[np.ndarray] = None,
+    max_detections: int = 300
+) -> np.ndarray:
+    """
+    Greedy non-maximum suppression in NumPy.
+    
+    Args:
+        boxes: Array of shape (N, 4) as x1, y1, x2, y2
+        scores: Array of shape (N,) with box scores
+        iou_threshold: Boxes overlapping a kept box above this are dropped
+        class_ids: Optional class ids; suppression is then per class
+        max_detections: Maximum number of boxes to keep
+        
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=int)
+    
+    boxes = boxes.astype(np.float32)
+    if class_ids is not None:
+        # Shift each class into its own coordinate range so boxes of
+        # different classes can never overlap
+        offset = class_ids.astype(np.float32)[:, None] * (boxes.max() + 1)
+        boxes = boxes + offset
+    
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    order = scores.argsort()[::-1]
+    
+    keep = []
+    while order.size > 0 and len(keep) < max_detections:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        
+        w = (np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest])).clip(0)
+        h = (np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest])).clip(0)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        
+        order = rest[iou <= iou_threshold]
+    
+    return np.array(keep, dtype=int)
+
+
+def merge_boxes(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    class_ids: np.ndarray,
+    iou_threshold: float,
+    method: str = "nms"
+) -> RawDetections:
+    """
+    Merge duplicate boxes, e.g. the same vehicle seen by two tiles.
+    
+    Args:
+        boxes: Array of shape (N, 4) as x1, y1, x2, y2
+        scores: Array of shape (N,)
+        class_ids: Array of shape (N,)
+        iou_threshold: Same-class boxes above this IoU are duplicates
+        method: "nms" keeps the best box of each cluster; "wbf" replaces
+            it with the score-weighted average of the cluster's boxes
+        
+    Returns:
+        Tuple of (boxes, scores, class_ids) after merging
+    """
+    keep = non_max_suppression(boxes, scores, iou_threshold, class_ids)
+    if method != "wbf" or len(keep) == 0:
+        return boxes[keep], scores[keep], class_ids[keep]
+    
+    # Assign every box to the kept box it overlaps most (same class only)
+    iou = box_iou(boxes, boxes[keep])
+    iou[class_ids[:, None] != class_ids[keep][None, :]] = 0.0
+    cluster = iou.argmax(axis=1)
+    member = iou[np.arange(len(boxes)), cluster] > iou_threshold
+    member[keep] = True
+    cluster[keep] = np.arange(len(keep))
+    
+    # Score-weighted box average per cluster
+    weights = scores[member].astype(np.float64)
+    fused = np.zeros((len(keep), 4), dtype=np.float64)
+    total = np.zeros(len(keep), dtype=np.float64)
+    np.add.at(fused, cluster[member], boxes[member] * weights[:, None])
+    np.add.at(total, cluster[member], weights)
+    fused /= total[:, None]
+    
+    return fused.astype(boxes.dtype), scores[keep], class_ids[keep]
+
+
+def letterbox(
+    frame: np.ndarray,
+    size: int,
+    stride: int = 0
+) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+    """
+    Resize a frame to a model input, preserving aspect ratio.
+    
+    Args:
+        frame: BGR image as numpy array
+        size: Longest side of the model input
+        stride: If set, pad only up to a multiple of stride (rectangular
+            input) instead of to a full size x size square
+        
+    Returns:
+        Tuple of (padded BGR image, scale, (pad_x, pad_y))
+    """
+    import cv2
+    
+    h, w = frame.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    
+    resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    
+    if stride:
+        out_w = int(np.ceil(new_w / stride) * stride)
+        out_h = int(np.ceil(new_h / stride) * stride)
+    else:
+        out_w = out_h = size
+    
+    pad_x = (out_w - new_w) / 2
+    pad_y = (out_h - new_h) / 2
+    top, left = int(round(pad_y - 0.1)), int(round(pad_x - 0.1))
+    
+    padded = np.full((out_h, out_w, 3), 114, dtype=np.uint8)
+    padded[top:top + new_h, left:left + new_w] = resized
+    
+    return padded, scale, (left, top)
+
+
+class DetectorBackend(ABC):
+    """
+    Base class for inference backends.
+    
+    A backend takes BGR frames and returns raw detections in frame
+    coordinates. VehicleDetector turns these into DetectionBatch objects,
+    so every backend produces identical output types.
+    
+    Attributes:
+        thread_safe: Whether infer() may run on several threads at once
+    """
+    
+    name = "base"
+    thread_safe = False
+    
+    @abstractmethod
+    def infer(
+        self,
+        frames: List[np.ndarray],
+        conf: float,
+        iou: float,
+        classes: List[int],
+        imgsz: Optional[int] = None
+    ) -> List[RawDetections]:
+        """
+        Run inference on a batch of frames.
+        
+        Args:
+            frames: List of BGR images
+            conf: Minimum confidence threshold
+            iou: IOU threshold for NMS
+            classes: Class IDs to keep
+            imgsz: Model input size override (None = backend default)
+            
+        Returns:
+            List of (boxes, confidences, class_ids), one per frame
+        """
+
+
+class UltralyticsBackend(DetectorBackend):
+    """Runs a YOLOv8 model through the ultralytics package (torch)."""
+    
+    name = "ultralytics"
+    
+    def __init__(
+        self,
+        model_path: str = MODEL_PATH,
+        input_size: int = INPUT_SIZE,
+        export_format: Optional[str] = ULTRALYTICS_EXPORT_FORMAT,
+        cache: Optional[ModelArtifactCache] = None
+    ):
+        YOLO = profile.timed_import("ultralytics").YOLO
+        
+        if export_format and cache is not None and model_path.endswith(".pt"):
+            # Export once (e.g. to TorchScript); restarts load the cached file
+            model_path = str(cache.get_or_build(
+                model_path, export_format, input_size, f".{export_format}",
+                lambda out: export_with_ultralytics(model_path, export_format, input_size, out)
+            ))
+            self.model = YOLO(model_path, task="detect")
+        else:
+            self.model = YOLO(model_path)
+    
+    def infer(
+        self,
+        frames: List[np.ndarray],
+        conf: float,
+        iou: float,
+        classes: List[int],
+        imgsz: Optional[int] = None
+    ) -> List[RawDetections]:
+        kwargs = {"imgsz": imgsz} if imgsz else {}
+        results = self.model(
+            list(frames),
+            conf=conf,
+            iou=iou,
+            classes=classes,
+            verbose=False,
+            **kwargs
+        )
+        
+        outputs = []
+        for result in results:
+            if result.boxes is None:
+                outputs.append((
+                    np.empty((0, 4), dtype=np.float32),
+                    np.empty(0, dtype=np.float32),
+                    np.empty(0, dtype=int)
+                ))
+                continue
+            outputs.append((
+                result.boxes.xyxy.cpu().numpy(),
+                result.boxes.conf.cpu().numpy(),
+                result.boxes.cls.cpu().numpy().astype(int)
+            ))
+        
+        return outputs
+
+
+class OnnxBackend(DetectorBackend):
+    """
+    Runs an exported YOLOv8 ONNX model with ONNX Runtime on the CPU.
+    
+    Pre-processing (letterbox) and post-processing (confidence filter
+    and NMS) are done with NumPy, so torch is never imported.
+    """
+    
+    name = "onnx"
+    
+    # An ONNX Runtime session may be run from several threads
+    thread_safe = True
+    
+    def __init__(
+        self,
+        model_path: str = ONNX_MODEL_PATH,
+        input_size: int = INPUT_SIZE,
+        num_threads: int = ONNX_NUM_THREADS,
+        cache: Optional[ModelArtifactCache] = None
+    ):
+        ort = profile.timed_import("onnxruntime")
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        
+        optimized = None
+        if cache is not None:
+            if model_path.endswith(".pt"):
+                # Export straight from the weights once, then reuse
+                model_path = str(cache.get_or_build(
+                    model_path, "onnx", input_size, ".onnx",
+                    lambda out: export_with_ultralytics(
+                        model_path, "onnx", input_size, out, dynamic=True
+                    )
+                ))
+            
+            # Graph optimization is redone on every session creation
+            # unless the optimized graph is saved and reloaded as is
+            optimized = cache.path(model_path, f"ort{ort.__version__}", input_size, ".onnx")
+            if optimized.exists():
+                print(f"✓ Using cached model artifact: {optimized}")
+                model_path = str(optimized)
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+                optimized = None
+            else:
+                optimized.parent.mkdir(parents=True, exist_ok=True)
+                options.optimized_model_filepath = str(optimized) + ".tmp"
+        
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        if optimized is not None and os.path.exists(options.optimized_model_filepath):
+            # Rename into place only once fully written
+            os.replace(options.optimized_model_filepath, optimized)
+            print(f"✓ Cached model artifact: {optimized}")
+        
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        
+        # Exported shapes are (batch, 3, H, W); dims are strings when dynamic
+        batch_dim, _, height, _ = model_input.shape
+        self.dynamic_batch = not isinstance(batch_dim, int)
+        self.dynamic_shape = not isinstance(height, int)
+        self.input_size = input_size if self.dynamic_shape else height
+    
+    def _preprocess(
+        self,
+        frame: np.ndarray,
+        size: int,
+        stride: int = 0
+    ) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+        """Letterbox a frame into a normalized CHW RGB float tensor."""
+        padded, scale, pad = letterbox(frame, size, stride)
+        tensor = padded[:, :, ::-1].transpose(2, 0, 1)
+        tensor = np.ascontiguousarray(tensor, dtype=np.float32) / 255.0
+        return tensor, scale, pad
+    
+    def _postprocess(
+        self,
+        output: np.ndarray,
+        scale: float,
+        pad: Tuple[float, float],
+        frame_shape: Tuple[int, ...],
+        conf: float,
+        iou: float,
+        classes: List[int]
+    ) -> RawDetections:
+        """Decode one (4 + num_classes, anchors) output into detections."""
+        predictions = output.T
+        class_scores = predictions[:, 4:]
+        
+        # Restrict to the requested classes before picking the best one
+        class_ids_all = np.asarray(classes, dtype=int)
+        class_scores = class_scores[:, class_ids_all]
+        best = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(best)), best]
+        
+        mask = scores >= conf
+        if not mask.any():
+            return (
+                np.empty((0, 4), dtype=np.float32),
+                np.empty(0, dtype=np.float32),
+                np.empty(0, dtype=int)
+            )
+        
+        cxcywh = predictions[mask, :4]
+        scores = scores[mask]
+        class_ids = class_ids_all[best[mask]]
+        
+        # Convert from letterboxed cx, cy, w, h to frame x1, y1, x2, y2
+        boxes = np.empty_like(cxcywh)
+        boxes[:, 0] = cxcywh[:, 0] - cxcywh[:, 2] / 2
+        boxes[:, 1] = cxcywh[:, 1] - cxcywh[:, 3] / 2
+        boxes[:, 2] = cxcywh[:, 0] + cxcywh[:, 2] / 2
+        boxes[:, 3] = cxcywh[:, 1] + cxcywh[:, 3] / 2
+        boxes[:, [0, 2]] -= pad[0]
+        boxes[:, [1, 3]] -= pad[1]
+        boxes /= scale
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, frame_shape[1])
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, frame_shape[0])
+        
+        keep = non_max_suppression(boxes, scores, iou, class_ids)
+        return boxes[keep], scores[keep], class_ids[keep]
+    
+    def infer(
+        self,
+        frames: List[np.ndarray],
+        conf: float,
+        iou: float,
+        classes: List[int],
+        imgsz: Optional[int] = None
+    ) -> List[RawDetections]:
+        if self.dynamic_shape:
+            # Rectangular inputs skip inference on letterbox padding
+            size = imgsz or self.input_size
+            prepared = [self._preprocess(frame, size, stride=32) for frame in frames]
+            if len({tensor.shape for tensor, _, _ in prepared}) > 1:
+                # Mixed aspect ratios cannot be stacked; fall back to squares
+                prepared = [self._preprocess(frame, size) for frame in frames]
+        else:
+            prepared = [self._preprocess(frame, self.input_size) for frame in frames]
+        
+        tensors = np.stack([tensor for tensor, _, _ in prepared])
+        
+        if self.dynamic_batch:
+            outputs = self.session.run(None, {self.input_name: tensors})[0]
+        else:
+            # Fixed batch-1 export: run the frames one at a time
+            outputs = np.concatenate([
+                self.session.run(None, {self.input_name: tensor[None]})[0]
+                for tensor in tensors
+            ])
+        
+        return [
+            self._postprocess(output, scale, pad, frame.shape, conf, iou, classes)
+            for output, (_, scale, pad), frame in zip(outputs, prepared, frames)
+        ]
+
+
+def points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """
+    Vectorized even-odd point-in-polygon test.
+    
+    Args:
+        points: Array of shape (N, 2) with x, y coordinates
+        polygon: Array of shape (M, 2) with polygon vertices
+        
+    Returns:
+        Boolean array of shape (N,)
+    """
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    
+    straddles = (y1 > y) != (y2 > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = (x2 - x1) * (y - y1) / (y2 - y1) + x1
+    crosses = straddles & (x < x_cross)
+    
+    return crosses.sum(axis=1) % 2 == 1
+
+
+class DetectionZone:
+    """
+    Region of the frame that inference is restricted to.
+    
+    The zone is either a horizontal band (fractions of frame height)
+    or an arbitrary polygon (list of (x, y) fractions of frame size).
+    Frames are cropped to the zone's bounding rectangle before
+    inference, and detections are mapped back to frame coordinates.
+    """
+    
+    def __init__(
+        self,
+        start: float = DETECTION_ZONE_START,
+        end: float = DETECTION_ZONE_END,
+        polygon: Optional[List[Tuple[float, float]]] = DETECTION_ZONE_POLYGON
+    ):
+        """
+        Initialize the detection zone.
+        
+        Args:
+            start: Top of the band as a fraction of frame height
+            end: Bottom of the band as a fraction of frame height
+            polygon: Optional polygon vertices as fractions of frame size;
+                overrides the band when given
+        """
+        self.start = start
+        self.end = end
+        self.polygon = None if polygon is None else np.asarray(polygon, dtype=np.float32)
+        
+        # Pixel geometry per frame size, computed once
+        self._geometry: Dict[Tuple[int, int], Tuple[Tuple[int, int, int, int], Optional[np.ndarray]]] = {}
+    
+    def _resolve(
+        self,
+        frame_shape: Tuple[int, ...]
+    ) -> Tuple[Tuple[int, int, int, int], Optional[np.ndarray]]:
+        """Get the (bounds, polygon points) in pixels for a frame size."""
+        h, w = frame_shape[:2]
+        geometry = self._geometry.get((h, w))
+        
+        if geometry is None:
+            if self.polygon is None:
+                bounds = (0, int(h * self.start), w, int(h * self.end))
+                points = None
+            else:
+                points = (self.polygon * np.array([w, h], dtype=np.float32)).astype(np.int32)
+                x1, y1 = points.min(axis=0).clip(0)
+                x2, y2 = points.max(axis=0) + 1
+                bounds = (int(x1), int(y1), int(min(x2, w)), int(min(y2, h)))
+            geometry = (bounds, points)
+            self._geometry[(h, w)] = geometry
+        
+        return geometry
+    
+    def bounds(self, frame_shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+        """Get the zone's bounding rectangle (x1, y1, x2, y2) in pixels."""
+        return self._resolve(frame_shape)[0]
+    
+    def points(self, frame_shape: Tuple[int, ...]) -> Optional[np.ndarray]:
+        """Get the polygon vertices in pixels, or None for a band zone."""
+        return self._resolve(frame_shape)[1]
+    
+    def crop(self, frame: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Crop a frame to the zone's bounding rectangle.
+        
+        Returns:
+            Tuple of (cropped view, (offset_x, offset_y))
+        """
+        x1, y1, x2, y2 = self.bounds(frame.shape)
+        return frame[y1:y2, x1:x2], (x1, y1)
+    
+    def to_frame(
+        self,
+        raw: RawDetections,
+        offset: Tuple[int, int],
+        frame_shape: Tuple[int, ...]
+    ) -> RawDetections:
+        """
+        Map crop-space detections back into full-frame coordinates.
+        
+        For polygon zones, detections whose center lies outside the
+        polygon are dropped.
+        """
+        boxes, confidences, class_ids = raw
+        if len(boxes) == 0:
+            return raw
+        
+        boxes = boxes + np.array([offset[0], offset[1], offset[0], offset[1]], dtype=boxes.dtype)
+        
+        points = self.points(frame_shape)
+        if points is not None:
+            centers = np.column_stack((
+                (boxes[:, 0] + boxes[:, 2]) / 2,
+                (boxes[:, 1] + boxes[:, 3]) / 2
+            ))
+            inside = points_in_polygon(centers, points)
+            return boxes[inside], confidences[inside], class_ids[inside]
+        
+        return boxes, confidences, class_ids
+
+
+class TileGrid:
+    """
+    Overlapping tiles covering the zone of interest.
+    
+    The zone is split vertically into tiers (far field at the top,
+    near field at the bottom); each tier is covered by square tiles of
+    its own size that overlap by a fixed fraction. Every tile carries
+    the model input size it should run at.
+    """
+    
+    def __init__(
+        self,
+        tiers: List[Tuple[float, int, int]] = TILE_TIERS,
+        overlap: float = TILE_OVERLAP,
+        zone: Optional[DetectionZone] = None
+    ):
+        """
+        Initialize the tile grid.
+        
+        Args:
+            tiers: (zone height fraction, tile size, input size) per tier,
+                far field first
+            overlap: Overlap between neighbouring tiles (fraction)
+            zone: Zone to cover (the whole frame if None)
+        """
+        self.tiers = tiers
+        self.overlap = overlap
+        self.zone = zone
+        
+        # Tile layout per frame size, computed once
+        self._layouts: Dict[Tuple[int, int], np.ndarray] = {}
+    
+    def _region(self, frame_shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+        """Get the (x1, y1, x2, y2) region the tiles must cover."""
+        if self.zone is not None:
+            return self.zone.bounds(frame_shape)
+        return (0, 0, frame_shape[1], frame_shape[0])
+    
+    @staticmethod
+    def _starts(lo: int, hi: int, size: int, step: int) -> List[int]:
+        """Tile start offsets covering [lo, hi) with tiles of a given size."""
+        if hi - lo <= size:
+            return [lo]
+        return list(range(lo, hi - size, step)) + [hi - size]
+    
+    def tiles(self, frame_shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Get the tile layout for a frame size.
+        
+        Returns:
+            Integer array of shape (T, 5) as x1, y1, x2, y2, input_size
+        """
+        h, w = frame_shape[:2]
+        layout = self._layouts.get((h, w))
+        if layout is not None:
+            return layout
+        
+        rx1, ry1, rx2, ry2 = self._region(frame_shape)
+        region_h = ry2 - ry1
+        
+        tiles = []
+        band_top = ry1
+        for fraction, size, input_size in self.tiers:
+            band_bottom = ry2 if fraction >= 1.0 else ry1 + int(region_h * fraction)
+            if band_bottom <= band_top:
+                continue
+            
+            step = max(1, int(size * (1 - self.overlap)))
+            tile_w = min(size, rx2 - rx1)
+            tile_h = min(size, band_bottom - band_top)
+            
+            for y in self._starts(band_top, band_bottom, tile_h, step):
+                for x in self._starts(rx1, rx2, tile_w, step):
+                    tiles.append((x, y, x + tile_w, y + tile_h, input_size))
+            
+            # Let the next tier overlap this one so seams are covered twice
+            band_top = max(ry1, band_bottom - int(size * self.overlap))
+        
+        layout = np.array(tiles, dtype=np.int32).reshape(-1, 5)
+        self._layouts[(h, w)] = layout
+        return layout
+    
+    def cut_mask(
+        self,
+        boxes: np.ndarray,
+        tile: np.ndarray,
+        frame_shape: Tuple[int, ...],
+        margin: int = 2
+    ) -> np.ndarray:
+        """
+        Find the sides of each box cut off by an interior tile edge.
+        
+        Args:
+            boxes: Tile-local boxes of shape (N, 4)
+            tile: Tile row (x1, y1, x2, y2, input_size)
+            frame_shape: Shape of the full frame
+            margin: Pixels from an edge that count as touching it
+            
+        Returns:
+            Boolean array of shape (N, 4) as left, top, right, bottom
+        """
+        rx1, ry1, rx2, ry2 = self._region(frame_shape)
+        tx1, ty1, tx2, ty2 = tile[:4]
+        tw, th = tx2 - tx1, ty2 - ty1
+        
+        cut = np.zeros((len(boxes), 4), dtype=bool)
+        if tx1 > rx1:
+            cut[:, 0] = boxes[:, 0] <= margin
+        if ty1 > ry1:
+            cut[:, 1] = boxes[:, 1] <= margin
+        if tx2 < rx2:
+            cut[:, 2] = boxes[:, 2] >= tw - margin
+        if ty2 < ry2:
+            cut[:, 3] = boxes[:, 3] >= th - margin
+        
+        return cut
+    
+    def keep_mask(
+        self,
+        boxes: np.ndarray,
+        tile: np.ndarray,
+        frame_shape: Tuple[int, ...],
+        margin: int = 2
+    ) -> np.ndarray:
+        """
+        Drop boxes cut off by a tile seam that another tile sees better.
+        
+        A clipped box is only discarded when some other tile contains
+        all of it and reaches past every edge that cut it, i.e. that
+        tile sees strictly more of the same vehicle. Vehicles larger
+        than the overlap have no such tile; their fragments are kept
+        and joined by stitch().
+        
+        Args:
+            boxes: Tile-local boxes of shape (N, 4)
+            tile: Tile row (x1, y1, x2, y2, input_size)
+            frame_shape: Shape of the full frame
+            margin: Pixels from an edge that count as touching it
+            
+        Returns:
+            Boolean array of shape (N,)
+        """
+        cut = self.cut_mask(boxes, tile, frame_shape, margin)
+        keep = ~cut.any(axis=1)
+        if keep.all():
+            return keep
+        
+        layout = self.tiles(frame_shape)
+        others = layout[(layout[:, :4] != tile[:4]).any(axis=1), :4][None, :, :]
+        
+        # Frame-space boxes against every other tile: (clipped, tiles)
+        clipped = np.flatnonzero(~keep)
+        frame_boxes = boxes[clipped, None, :] + tile[None, None, [0, 1, 0, 1]]
+        sides = cut[clipped, None, :]
+        
+        # Contain the box, with room to spare on each cut side
+        pad = np.where(sides, margin, 0)
+        contains = (
+            (others[..., :2] + pad[..., :2] <= frame_boxes[..., :2]).all(axis=-1)
+            & (others[..., 2:] - pad[..., 2:] >= frame_boxes[..., 2:]).all(axis=-1)
+        )
+        keep[clipped] = ~contains.any(axis=1)
+        
+        return keep
+    
+    @staticmethod
+    def stitch(
+        boxes: np.ndarray,
+        scores: np.ndarray,
+        class_ids: np.ndarray,
+        cut: np.ndarray,
+        tiles: np.ndarray,
+        iou_threshold: float
+    ) -> RawDetections:
+        """
+        Join fragments of vehicles cut by tile seams into whole boxes.
+        
+        Two fragments from different tiles belong to the same vehicle
+        when they agree inside the area both tiles see; their union is
+        then the vehicle's box. Boxes that were not cut pass through.
+        
+        Args:
+            boxes: Frame-space boxes of shape (N, 4)
+            scores: Array of shape (N,)
+            class_ids: Array of shape (N,)
+            cut: Whether each box was cut by a seam, shape (N,)
+            tiles: Tile (x1, y1, x2, y2) each box came from, shape (N, 4)
+            iou_threshold: Shared-area IoU above which fragments match
+            
+        Returns:
+            Tuple of (boxes, scores, class_ids) with fragments joined
+        """
+        fragments = np.flatnonzero(cut)
+        if len(fragments) < 2:
+            return boxes, scores, class_ids
+        
+        frag_boxes = boxes[fragments].astype(np.float32)
+        frag_tiles = tiles[fragments].astype(np.float32)
+        
+        # Area seen by both tiles of each fragment pair
+        shared = np.concatenate([
+            np.maximum(frag_tiles[:, None, :2], frag_tiles[None, :, :2]),
+            np.minimum(frag_tiles[:, None, 2:], frag_tiles[None, :, 2:])
+        ], axis=-1)
+        a = np.concatenate([
+            np.maximum(frag_boxes[:, None, :2], shared[..., :2]),
+            np.minimum(frag_boxes[:, None, 2:], shared[..., 2:])
+        ], axis=-1)
+        b = np.concatenate([
+            np.maximum(frag_boxes[None, :, :2], shared[..., :2]),
+            np.minimum(frag_boxes[None, :, 2:], shared[..., 2:])
+        ], axis=-1)
+        valid = ((a[..., 2:] > a[..., :2]) & (b[..., 2:] > b[..., :2])).all(axis=-1)
+        
+        same = (
+            valid
+            & (box_iou_pairs(a, b) > iou_threshold)
+            & (class_ids[fragments][:, None] == class_ids[fragments][None, :])
+            & (frag_tiles[:, None] != frag_tiles[None, :]).any(axis=-1)
+        )
+        
+        # Connected components of matching fragments (label propagation)
+        labels = np.arange(len(fragments))
+        while True:
+            joined = np.where(same, labels[None, :], labels[:, None]).min(axis=1)
+            if (joined == labels).all():
+                break
+            labels = joined
+        
+        groups = np.unique(labels)
+        out_boxes = np.empty((len(groups), 4), dtype=boxes.dtype)
+        out_scores = np.empty(len(groups), dtype=scores.dtype)
+        out_classes = np.empty(len(groups), dtype=class_ids.dtype)
+        for n, label in enumerate(groups):
+            members = fragments[labels == label]
+            out_boxes[n, :2] = boxes[members, :2].min(axis=0)
+            out_boxes[n, 2:] = boxes[members, 2:].max(axis=0)
+            out_scores[n] = scores[members].max()
+            out_classes[n] = class_ids[members[0]]
+        
+        whole = ~cut
+        return (
+            np.concatenate([boxes[whole], out_boxes]),
+            np.concatenate([scores[whole], out_scores]),
+            np.concatenate([class_ids[whole], out_classes])
+        )
+
+
+# Registry of available inference backends
+BACKENDS: Dict[str, Type[DetectorBackend]] = {
+    UltralyticsBackend.name: UltralyticsBackend,
+    OnnxBackend.name: OnnxBackend,
+}
 
 
 class VehicleDetector:
@@ -32,39 +816,119 @@ class VehicleDetector:
     Detects vehicles in video frames using YOLOv8.
     
     Attributes:
-        model: YOLOv8 model instance
+        backend: Inference backend instance
         confidence: Detection confidence threshold
+        low_confidence: Threshold of the low-confidence tier (or None)
         classes: List of vehicle class IDs to detect
     """
     
     def __init__(
         self,
-        model_path: str = MODEL_PATH,
+        model_path: Optional[str] = None,
         confidence: float = CONFIDENCE_THRESHOLD,
+        low_confidence: Optional[float] = LOW_CONFIDENCE_THRESHOLD,
         iou: float = IOU_THRESHOLD,
-        classes: List[int] = VEHICLE_CLASSES
+        classes: List[int] = VEHICLE_CLASSES,
+        backend: str = DETECTOR_BACKEND,
+        zone: Optional[DetectionZone] = None,
+        zone_input_size: int = ZONE_INPUT_SIZE,
+        tiled: bool = TILED_INFERENCE,
+        warmup_runs: int = WARMUP_RUNS,
+        warmup_shape: Optional[Tuple[int, int]] = None,
+        cache_dir: Optional[str] = MODEL_CACHE_DIR
     ):
         """
         Initialize the vehicle detector.
         
         Args:
-            model_path: Path to YOLO weights file
+            model_path: Path to model weights (defaults per backend)
             confidence: Minimum confidence threshold
+            low_confidence: Detections from this threshold up to
+                confidence are returned as each batch's low tier
+                (None disables the tier)
             iou: IOU threshold for NMS
             classes: List of class IDs to detect
+            backend: Inference backend name ("ultralytics" or "onnx")
+            zone: Region to restrict inference to (defaults to the
+                configured detection zone when CROP_TO_ZONE is set)
+            zone_input_size: Model input size used for zone crops
+            tiled: Cut the zone into overlapping tiles (for 4K cameras)
+            warmup_runs: Dummy inference passes per input size at startup
+            warmup_shape: Camera frame size (height, width) to warm up
+                at (defaults to WARMUP_FRAME_SHAPE)
+            cache_dir: Directory for cached model artifacts (None disables)
         """
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown detector backend '{backend}'. "
+                f"Choose from: {', '.join(BACKENDS)}"
+            )
+        
+        if model_path is None:
+            model_path = ONNX_MODEL_PATH if backend == "onnx" else MODEL_PATH
+        
+        self.cache = ModelArtifactCache(cache_dir) if cache_dir else None
+        
         try:
-            from ultralytics import YOLO
-            self.model = YOLO(model_path)
-            print(f"✓ Loaded YOLO model: {model_path}")
+            self.backend = BACKENDS[backend](model_path, cache=self.cache)
+            print(f"✓ Loaded YOLO model: {model_path} ({backend})")
         except Exception as e:
             raise RuntimeError(f"Failed to load YOLO model: {e}")
         
+        self.model_path = model_path
         self.confidence = confidence
+        self.low_confidence = low_confidence
         self.iou = iou
         self.classes = classes
+        
+        if zone is None and CROP_TO_ZONE:
+            zone = DetectionZone()
+        self.zone = zone
+        self.zone_input_size = zone_input_size
+        self.tiles = TileGrid(zone=zone) if tiled else None
+        
+        if warmup_runs > 0:
+            self.warmup(warmup_runs, warmup_shape or WARMUP_FRAME_SHAPE)
     
-    def detect(self, frame: np.ndarray) -> List[Detection]:
+    def input_sizes(self) -> List[int]:
+        """Get the model input sizes this detector runs at."""
+        if self.tiles is not None:
+            return sorted({int(size) for _, _, size in self.tiles.tiers})
+        if self.zone is not None:
+            return [self.zone_input_size]
+        return [getattr(self.backend, "input_size", INPUT_SIZE)]
+    
+    def warmup(
+        self,
+        runs: int = WARMUP_RUNS,
+        frame_shape: Tuple[int, int] = WARMUP_FRAME_SHAPE
+    ):
+        """
+        Run dummy frames through the detector at every input size.
+        
+        The first passes through a model pay for lazy initialization
+        (memory arenas, kernel selection, graph compilation); doing
+        them here keeps that cost out of the first real frames. The
+        dummy is a whole camera frame, cropped and tiled like a real
+        one, because backends with dynamic shapes initialize per input
+        shape and zone crops letterbox to rectangles, not squares.
+        
+        Args:
+            runs: Passes per input size
+            frame_shape: Camera frame size (height, width)
+        """
+        start = time.perf_counter()
+        
+        dummy = np.full((frame_shape[0], frame_shape[1], 3), 114, dtype=np.uint8)
+        for _ in range(runs):
+            self.detect_batch([dummy])
+        
+        elapsed = time.perf_counter() - start
+        profile.mark("detector_warm")
+        print(f"✓ Warm-up: {runs} pass(es) on {frame_shape[1]}x{frame_shape[0]} frames "
+              f"at {self.input_sizes()} in {elapsed * 1000:.0f} ms")
+    
+    def detect(self, frame: np.ndarray) -> DetectionBatch:
         """
         Detect vehicles in a frame.
         
@@ -72,50 +936,130 @@ class VehicleDetector:
             frame: BGR image as numpy array
             
         Returns:
-            List of Detection objects
+            DetectionBatch with all detections in the frame
+        """
+        return self.detect_batch([frame])[0]
+    
+    def detect_batch(self, frames: List[np.ndarray]) -> List[DetectionBatch]:
         """
-        detections = []
+        Detect vehicles in several frames with a single forward pass.
         
-        # Run inference
-        results = self.model(
-            frame,
-            conf=self.confidence,
-            iou=self.iou,
-            classes=self.classes,
-            verbose=False
-        )[0]
-        
-        # Process results
-        if results.boxes is not None:
-            boxes = results.boxes.xyxy.cpu().numpy()
-            confidences = results.boxes.conf.cpu().numpy()
-            class_ids = results.boxes.cls.cpu().numpy().astype(int)
+        Frames may come from one camera or from many; they only need
+        to be BGR images. Batching amortizes the per-call overhead of
+        the model across all frames in the batch.
+        
+        Args:
+            frames: List of BGR images as numpy arrays
+            
+        Returns:
+            List of DetectionBatch objects, one per input frame, in order
+        """
+        if not frames:
+            return []
+        
+        if self.tiles is not None:
+            return self._detect_tiled(frames)
+        
+        if self.zone is None:
+            # Run inference on the whole batch
+            outputs = self.backend.infer(
+                list(frames), self._infer_confidence, self.iou, self.classes
+            )
+        else:
+            # Only the zone is worth inferring on; crop, then map back
+            crops, offsets = zip(*(self.zone.crop(frame) for frame in frames))
+            outputs = self.backend.infer(
+                list(crops), self._infer_confidence, self.iou, self.classes,
+                imgsz=self.zone_input_size
+            )
+            outputs = [
+                self.zone.to_frame(output, offset, frame.shape)
+                for output, offset, frame in zip(outputs, offsets, frames)
+            ]
+        
+        return [self._split_tiers(DetectionBatch.from_raw(*output)) for output in outputs]
+    
+    @property
+    def _infer_confidence(self) -> float:
+        """Threshold passed to the backend (the lower of both tiers)."""
+        if self.low_confidence is None:
+            return self.confidence
+        return min(self.confidence, self.low_confidence)
+    
+    def _split_tiers(self, batch: DetectionBatch) -> DetectionBatch:
+        """Separate low-confidence detections from the regular ones."""
+        if self.low_confidence is None:
+            return batch
+        return batch.split_tiers(self.confidence)
+    
+    def _detect_tiled(self, frames: List[np.ndarray]) -> List[DetectionBatch]:
+        """
+        Detect vehicles tile by tile and merge boxes across tile seams.
+        
+        Tiles of every frame that share an input size run as one batch.
+        Fragments of vehicles larger than the tile overlap are stitched
+        back together before duplicates are merged.
+        """
+        # Group tiles of all frames by model input size
+        groups: Dict[int, List[Tuple[int, np.ndarray]]] = {}
+        for index, frame in enumerate(frames):
+            for tile in self.tiles.tiles(frame.shape):
+                groups.setdefault(int(tile[4]), []).append((index, tile))
+        
+        # Per frame: (boxes, confidences, class_ids, cut, source tile)
+        parts: List[List[Tuple[np.ndarray, ...]]] = [[] for _ in frames]
+        for input_size, jobs in groups.items():
+            crops = [frames[index][y1:y2, x1:x2] for index, (x1, y1, x2, y2, _) in jobs]
+            outputs = self.backend.infer(
+                crops, self._infer_confidence, self.iou, self.classes, imgsz=input_size
+            )
+            
+            for (index, tile), (boxes, confidences, class_ids) in zip(jobs, outputs):
+                shape = frames[index].shape
+                keep = self.tiles.keep_mask(boxes, tile, shape)
+                cut = self.tiles.cut_mask(boxes[keep], tile, shape).any(axis=1)
+                offset = np.array([tile[0], tile[1], tile[0], tile[1]], dtype=boxes.dtype)
+                parts[index].append((
+                    boxes[keep] + offset, confidences[keep], class_ids[keep],
+                    cut, np.repeat(tile[None, :4], len(cut), axis=0)
+                ))
+        
+        batches = []
+        for frame, frame_parts in zip(frames, parts):
+            boxes = np.concatenate([p[0] for p in frame_parts]).reshape(-1, 4)
+            confidences = np.concatenate([p[1] for p in frame_parts])
+            class_ids = np.concatenate([p[2] for p in frame_parts]).astype(int)
+            cut = np.concatenate([p[3] for p in frame_parts])
+            sources = np.concatenate([p[4] for p in frame_parts]).reshape(-1, 4)
             
-            for box, conf, cls_id in zip(boxes, confidences, class_ids):
-                x1, y1, x2, y2 = map(int, box)
-                center = ((x1 + x2) // 2, (y1 + y2) // 2)
-                
-                detection = Detection(
-                    bbox=(x1, y1, x2, y2),
-                    confidence=float(conf),
-                    class_id=int(cls_id),
-                    class_name=CLASS_NAMES.get(int(cls_id), "vehicle"),
-                    center=center
-                )
-                detections.append(detection)
-        
-        return detections
-    
-    def get_centroids(self, detections: List[Detection]) -> np.ndarray:
+            # Join seam fragments first, then merge duplicates across tiles
+            boxes, confidences, class_ids = self.tiles.stitch(
+                boxes, confidences, class_ids, cut, sources, TILE_MERGE_IOU
+            )
+            merged = merge_boxes(boxes, confidences, class_ids, TILE_MERGE_IOU, TILE_MERGE)
+            if self.zone is not None:
+                # Polygon zones still drop detections outside the polygon
+                merged = self.zone.to_frame(merged, (0, 0), frame.shape)
+            batches.append(self._split_tiers(DetectionBatch.from_raw(*merged)))
+        
+        return batches
+    
+    def get_centroids(
+        self,
+        detections: Union[DetectionBatch, List[Detection]]
+    ) -> np.ndarray:
         """
         Extract centroids from detections for tracking.
         
         Args:
-            detections: List of Detection objects
+            detections: DetectionBatch or list of Detection objects
             
         Returns:
             Numpy array of shape (N, 2) with centroid coordinates
         """
+        if isinstance(detections, DetectionBatch):
+            return detections.centers
+        
         if not detections:
             return np.empty((0, 2))
         
@@ -0,0 +1,120 @@
+"""
+SpeedWatch Pro - Shared-Memory Frame Ring
+=========================================
+Fixed-size ring of video frames in shared memory. A camera process
+decodes straight into a slot; other processes map the same slot as a
+NumPy array, so frames cross process boundaries without being copied
+or pickled. Only (slot, sequence) pairs travel over queues.
+"""
+
+from multiprocessing import shared_memory
+from typing import Tuple
+
+import numpy as np
+
+
+class FrameRing:
+    """
+    Ring of equally-sized uint8 frames in one shared memory block.
+    
+    Layout: an int64 sequence number per slot, followed by the frames.
+    The writer owns the block (create=True) and unlinks it on close;
+    readers attach by name.
+    
+    The ring does no locking: the writer must not reuse a slot until
+    readers are done with it (the camera worker guarantees this by
+    keeping fewer frames in flight than there are slots).
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        shape: Tuple[int, int, int],
+        slots: int,
+        create: bool = False
+    ):
+        """
+        Create or attach to a frame ring.
+        
+        Args:
+            name: Shared memory block name
+            shape: Frame shape (height, width, channels)
+            slots: Number of frames in the ring
+            create: Create the block (writer) instead of attaching
+        """
+        self.name = name
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.owner = create
+        
+        header = slots * 8
+        frame_bytes = int(np.prod(self.shape))
+        
+        if create:
+            self.shm = shared_memory.SharedMemory(
+                name=name, create=True, size=header + slots * frame_bytes
+            )
+        else:
+            self.shm = _attach(name)
+        
+        self.sequences = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.frames = np.ndarray(
+            (slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf, offset=header
+        )
+        
+        if create:
+            self.sequences[:] = -1
+    
+    def slot(self, sequence: int) -> int:
+        """Slot index for a frame sequence number."""
+        return sequence % self.slots
+    
+    def view(self, slot: int) -> np.ndarray:
+        """Zero-copy view of the frame in a slot."""
+        return self.frames[slot]
+    
+    def publish(self, slot: int, sequence: int):
+        """Mark a slot as holding frame `sequence`."""
+        self.sequences[slot] = sequence
+    
+    def holds(self, slot: int, sequence: int) -> bool:
+        """Whether the slot still holds frame `sequence`."""
+        return int(self.sequences[slot]) == sequence
+    
+    def close(self):
+        """Detach from the block; the owner also removes it."""
+        # Views must go before the buffer can be released
+        self.sequences = None
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block.
+    
+    Processes started by the supervisor share its resource tracker, so
+    attaching does not hand ownership to the reader; the tracker only
+    removes blocks that are still left when the supervisor exits.
+    """
+    return shared_memory.SharedMemory(name=name)
+
+
+def unlink(name: str) -> bool:
+    """
+    Remove a shared memory block by name, e.g. one left by a crashed
+    camera worker.
+    
+    Returns:
+        True if a block was removed
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    
+    shm.close()
+    shm.unlink()
+    return True
@@ -5,7 +5,6 @@ Auto-detect location using FREE IP geolocation (ip-api.com).
 Falls back gracefully if internet is unavailable.
 """
 
-import requests
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 
@@ -48,6 +47,9 @@ def fetch_location() -> Optional[LocationData]:
         No API key required!
     """
     try:
+        # Imported here so the API server starts without paying for it
+        import requests
+        
         # ip-api.com - FREE, no API key needed!
         response = requests.get(
             "http://ip-api.com/json/",
@@ -79,11 +81,8 @@ def fetch_location() -> Optional[LocationData]:
             formatted=formatted.strip()
         )
     
-    except requests.exceptions.RequestException:
-        # Network error - return None for fallback
-        return None
     except Exception:
-        # Any other error - return None for fallback
+        # Network or parsing error - return None for fallback
         return None
 
 
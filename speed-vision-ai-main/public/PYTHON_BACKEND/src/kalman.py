@@ -0,0 +1,190 @@
+"""
+SpeedWatch Pro - Kalman Filter
+==============================
+Constant-velocity Kalman filter for all tracks at once. State per
+track is (x, y, vx, vy) in pixels and pixels per second; predict and
+update run as batched NumPy operations over every track involved.
+"""
+
+import numpy as np
+from typing import Tuple
+
+# Import settings
+import sys
+sys.path.append('..')
+from config.settings import (
+    KALMAN_ACCEL_NOISE, KALMAN_MEASUREMENT_NOISE, KALMAN_INITIAL_VELOCITY_STD
+)
+
+
+class ConstantVelocityKalman:
+    """
+    Bank of constant-velocity Kalman filters, one per slot.
+    
+    Slots are handed out by create() and returned by release(); the
+    arrays grow when every slot is taken. Each slot remembers the time
+    of its state, so tracks observed at different times can be
+    predicted to a common timestamp in one call.
+    
+    Attributes:
+        x: State vectors, shape (capacity, 4)
+        P: State covariances, shape (capacity, 4, 4)
+        t: Time of each state in seconds, shape (capacity,)
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 64,
+        accel_noise: float = KALMAN_ACCEL_NOISE,
+        measurement_noise: float = KALMAN_MEASUREMENT_NOISE,
+        initial_velocity_std: float = KALMAN_INITIAL_VELOCITY_STD
+    ):
+        """
+        Initialize the filter bank.
+        
+        Args:
+            capacity: Initial number of slots
+            accel_noise: Std of unmodelled acceleration (px/s^2)
+            measurement_noise: Std of a measured centroid (px)
+            initial_velocity_std: Std of the unknown initial velocity (px/s)
+        """
+        self.accel_var = accel_noise ** 2
+        self.measurement_var = measurement_noise ** 2
+        self.initial_velocity_var = initial_velocity_std ** 2
+        
+        self.x = np.zeros((capacity, 4))
+        self.P = np.zeros((capacity, 4, 4))
+        self.t = np.zeros(capacity)
+        self._free = list(range(capacity - 1, -1, -1))
+    
+    def _grow(self):
+        """Double the number of slots."""
+        capacity = len(self.x)
+        self.x = np.concatenate([self.x, np.zeros_like(self.x)])
+        self.P = np.concatenate([self.P, np.zeros_like(self.P)])
+        self.t = np.concatenate([self.t, np.zeros_like(self.t)])
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+    
+    def create(self, position: Tuple[float, float], timestamp: float) -> int:
+        """
+        Start a filter at a measured position with unknown velocity.
+        
+        Returns:
+            Slot index of the new filter
+        """
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        
+        self.x[slot] = (position[0], position[1], 0.0, 0.0)
+        self.P[slot] = np.diag([
+            self.measurement_var, self.measurement_var,
+            self.initial_velocity_var, self.initial_velocity_var
+        ])
+        self.t[slot] = timestamp
+        return slot
+    
+    def release(self, slot: int):
+        """Return a slot to the free list."""
+        self._free.append(slot)
+    
+    def predict(self, slots: np.ndarray, timestamp: float) -> np.ndarray:
+        """
+        Advance filters to a timestamp.
+        
+        Args:
+            slots: Slot indices, shape (M,)
+            timestamp: Time to predict to; filters already at or past
+                it are left unchanged
+        
+        Returns:
+            Predicted positions, shape (M, 2)
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        dt = np.maximum(timestamp - self.t[slots], 0.0)
+        
+        x = self.x[slots]
+        x[:, :2] += x[:, 2:] * dt[:, None]
+        
+        # P <- F P F^T + Q with F = [[I, dt I], [0, I]], written out per
+        # 2x2 block so no (M, 4, 4) transition stack is built
+        P = self.P[slots]
+        d = dt[:, None, None]
+        pp, pv = P[:, :2, :2], P[:, :2, 2:]
+        vp, vv = P[:, 2:, :2], P[:, 2:, 2:]
+        
+        new_pp = pp + d * (pv + vp) + d * d * vv
+        new_pv = pv + d * vv
+        new_vp = vp + d * vv
+        
+        # White-noise acceleration
+        q = self.accel_var * dt
+        eye = np.eye(2)
+        new_pp = new_pp + (q * dt * dt / 3.0)[:, None, None] * eye
+        new_pv = new_pv + (q * dt / 2.0)[:, None, None] * eye
+        new_vp = new_vp + (q * dt / 2.0)[:, None, None] * eye
+        new_vv = vv + q[:, None, None] * eye
+        
+        P[:, :2, :2], P[:, :2, 2:] = new_pp, new_pv
+        P[:, 2:, :2], P[:, 2:, 2:] = new_vp, new_vv
+        
+        self.x[slots] = x
+        self.P[slots] = P
+        self.t[slots] = np.maximum(self.t[slots], timestamp)
+        
+        return x[:, :2]
+    
+    def update(self, slots: np.ndarray, positions: np.ndarray):
+        """
+        Correct filters with measured positions.
+        
+        Filters should first be predicted to the measurement time.
+        
+        Args:
+            slots: Slot indices, shape (M,)
+            positions: Measured (x, y) positions, shape (M, 2)
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        if len(slots) == 0:
+            return
+        
+        x = self.x[slots]
+        P = self.P[slots]
+        
+        # S = H P H^T + R, K = P H^T S^-1 with H selecting (x, y)
+        S = P[:, :2, :2] + self.measurement_var * np.eye(2)
+        K = P[:, :, :2] @ np.linalg.inv(S)
+        
+        innovation = np.asarray(positions, dtype=np.float64) - x[:, :2]
+        x += (K @ innovation[:, :, None])[:, :, 0]
+        P -= K @ P[:, :2, :]
+        
+        self.x[slots] = x
+        self.P[slots] = P
+    
+    def gate_radius(self, slots: np.ndarray, sigmas: float) -> np.ndarray:
+        """
+        Association radius around each predicted position.
+        
+        Args:
+            slots: Slot indices, shape (M,)
+            sigmas: Radius in standard deviations of the predicted
+                measurement (along its most uncertain axis)
+        
+        Returns:
+            Radii in pixels, shape (M,)
+        """
+        S = self.P[np.asarray(slots, dtype=np.intp), :2, :2]
+        a, d, b = S[:, 0, 0], S[:, 1, 1], S[:, 0, 1]
+        
+        # Largest eigenvalue of the symmetric 2x2 innovation covariance
+        largest = (a + d) / 2 + np.sqrt(((a - d) / 2) ** 2 + b * b) + self.measurement_var
+        return sigmas * np.sqrt(largest)
+    
+    def positions(self, slots: np.ndarray) -> np.ndarray:
+        """Filtered positions, shape (M, 2)."""
+        return self.x[np.asarray(slots, dtype=np.intp), :2]
+    
+    def velocities(self, slots: np.ndarray) -> np.ndarray:
+        """Filtered velocities in pixels per second, shape (M, 2)."""
+        return self.x[np.asarray(slots, dtype=np.intp), 2:]
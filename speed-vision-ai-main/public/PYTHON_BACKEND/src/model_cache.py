@@ -0,0 +1,132 @@
+"""
+SpeedWatch Pro - Model Artifact Cache
+=====================================
+On-disk cache of exported and optimized model artifacts, so restarts
+skip re-exporting and re-optimizing the detector model.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+# Import settings
+import sys
+sys.path.append('..')
+from config.settings import MODEL_CACHE_DIR
+
+
+class ModelArtifactCache:
+    """
+    Stores derived model files keyed by source model hash, backend and
+    input size.
+    
+    Artifacts are built at most once: the first process to need one
+    writes it to a temporary file and atomically renames it into place,
+    so a crash mid-export never leaves a truncated artifact behind.
+    
+    Attributes:
+        cache_dir: Directory holding the artifacts
+    """
+    
+    def __init__(self, cache_dir: str = MODEL_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        
+        # Source hashes per (path, size, mtime) so a file is hashed once
+        self._hashes: Dict[Tuple[str, int, float], str] = {}
+    
+    def file_hash(self, path: str) -> str:
+        """Get a short SHA-256 digest of a model file."""
+        stat = os.stat(path)
+        key = (str(path), stat.st_size, stat.st_mtime)
+        
+        digest = self._hashes.get(key)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()[:16]
+            self._hashes[key] = digest
+        
+        return digest
+    
+    def path(
+        self,
+        model_path: str,
+        backend: str,
+        input_size: int,
+        suffix: str
+    ) -> Path:
+        """
+        Get the cache path of an artifact (whether or not it exists yet).
+        
+        Args:
+            model_path: Source model the artifact is derived from
+            backend: Backend/format tag, e.g. "onnx" or "torchscript"
+            input_size: Model input size the artifact was built for
+            suffix: File suffix including the dot
+        """
+        stem = Path(model_path).stem
+        digest = self.file_hash(model_path)
+        return self.cache_dir / f"{stem}-{digest}-{backend}-{input_size}{suffix}"
+    
+    def get_or_build(
+        self,
+        model_path: str,
+        backend: str,
+        input_size: int,
+        suffix: str,
+        build: Callable[[Path], None]
+    ) -> Path:
+        """
+        Get a cached artifact, building it first if it is missing.
+        
+        Args:
+            model_path: Source model the artifact is derived from
+            backend: Backend/format tag
+            input_size: Model input size
+            suffix: File suffix including the dot
+            build: Called with a temporary path to write the artifact to
+            
+        Returns:
+            Path to the cached artifact
+        """
+        target = self.path(model_path, backend, input_size, suffix)
+        if target.exists():
+            print(f"✓ Using cached model artifact: {target}")
+            return target
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.stem}.{os.getpid()}.tmp{suffix}")
+        try:
+            build(tmp)
+            os.replace(tmp, target)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        
+        print(f"✓ Cached model artifact: {target}")
+        return target
+
+
+def export_with_ultralytics(
+    model_path: str,
+    export_format: str,
+    input_size: int,
+    output: Path,
+    **kwargs
+):
+    """
+    Export a YOLO .pt model with ultralytics and move the result.
+    
+    Args:
+        model_path: Source .pt weights
+        export_format: Ultralytics export format, e.g. "onnx"
+        input_size: Model input size to export for
+        output: Where to place the exported file
+    """
+    from ultralytics import YOLO
+    
+    exported = YOLO(model_path).export(format=export_format, imgsz=input_size, **kwargs)
+    os.replace(exported, output)
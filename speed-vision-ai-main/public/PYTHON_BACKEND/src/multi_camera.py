@@ -0,0 +1,281 @@
+"""
+SpeedWatch Pro - Multi-Camera Processor
+=======================================
+Processes several video sources in one process. A single detector
+(one copy of the model and runtime) serves every camera, with frames
+from all cameras batched into one forward pass; each camera keeps its
+own tracker, speed calculator, log and stats.
+"""
+
+import time
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .detector import VehicleDetector
+from .capture import FrameReader
+from .video_processor import VideoProcessor
+
+# Import settings
+import sys
+sys.path.append('..')
+from config.settings import (
+    SPEED_LIMIT, DETECTOR_BACKEND, LOW_CONFIDENCE_THRESHOLD, ADAPTIVE_STRIDE,
+    MOTION_GATE, THREADED_CAPTURE, CAPTURE_POLICY, BATCH_MAX_WAIT, CHECKPOINT_DIR,
+    LOG_DIR
+)
+
+
+def load_camera_sources(path: str) -> Dict[str, str]:
+    """
+    Read camera sources from a cameras file.
+    
+    One camera per line, either a bare source or "name=source". Blank
+    lines and lines starting with "#" are ignored. Unnamed cameras are
+    called cam0, cam1, ...
+    
+    Args:
+        path: Path to the cameras file
+    
+    Returns:
+        Dict of camera name -> source
+    
+    Raises:
+        ValueError: If a line has an empty name or source, or a camera
+            name is used twice
+    """
+    sources = {}
+    for number, line in enumerate(Path(path).read_text().splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        
+        name, sep, source = line.partition("=")
+        if not sep or "://" in name:
+            name, source = f"cam{len(sources)}", line
+        name, source = name.strip(), source.strip()
+        
+        if not name or not source:
+            raise ValueError(f"{path}:{number}: expected 'source' or 'name=source', got {line!r}")
+        if name in sources:
+            raise ValueError(f"{path}:{number}: camera name {name!r} is used twice")
+        sources[name] = source
+    
+    return sources
+
+
+class MultiCameraProcessor:
+    """
+    Runs one VideoProcessor per camera around a shared detector.
+    
+    Each round reads the latest frame from every camera, runs the
+    detector once on all frames that need it, then tracks each camera
+    separately.
+    """
+    
+    def __init__(
+        self,
+        sources: Union[List[str], Dict[str, str]],
+        speed_limit: float = SPEED_LIMIT,
+        show_preview: bool = True,
+        backend: str = DETECTOR_BACKEND,
+        low_confidence: Optional[float] = LOW_CONFIDENCE_THRESHOLD,
+        adaptive_stride: bool = ADAPTIVE_STRIDE,
+        motion_gate: bool = MOTION_GATE,
+        threaded_capture: bool = THREADED_CAPTURE,
+        capture_policy: str = CAPTURE_POLICY,
+        max_wait: float = BATCH_MAX_WAIT,
+        checkpoint_dir: Optional[str] = CHECKPOINT_DIR,
+        log_dir: str = LOG_DIR
+    ):
+        """
+        Initialize the multi-camera processor.
+        
+        Args:
+            sources: Video sources, as a list or as a dict of name -> source
+            speed_limit: Speed limit in km/h
+            show_preview: Whether to show a preview window per camera
+            backend: Detector inference backend ("ultralytics" or "onnx")
+            low_confidence: Threshold of the detector's low-confidence
+                tier (None disables it)
+            adaptive_stride: Per-camera keyframe scheduling
+            motion_gate: Per-camera motion gate in front of the detector
+            threaded_capture: Decode each camera in a background thread
+            capture_policy: Reader queue policy (see VideoProcessor)
+            max_wait: Max seconds a round waits for slow cameras
+            checkpoint_dir: Directory for per-camera tracker checkpoints
+                (None disables them)
+            log_dir: Directory for the per-camera speed logs
+        """
+        if not isinstance(sources, dict):
+            sources = {f"cam{i}": source for i, source in enumerate(sources)}
+        if not sources:
+            raise ValueError("At least one video source is required")
+        
+        self.show_preview = show_preview
+        self.threaded_capture = threaded_capture
+        self.max_wait = max_wait
+        
+        # One model for all cameras
+        self.detector = VehicleDetector(backend=backend, low_confidence=low_confidence)
+        
+        self.cameras: Dict[str, VideoProcessor] = {
+            camera_id: VideoProcessor(
+                source=source,
+                speed_limit=speed_limit,
+                show_preview=show_preview,
+                adaptive_stride=adaptive_stride,
+                motion_gate=motion_gate,
+                threaded_capture=threaded_capture,
+                capture_policy=capture_policy,
+                detector=self.detector,
+                camera_id=camera_id,
+                checkpoint_dir=checkpoint_dir,
+                log_dir=log_dir
+            )
+            for camera_id, source in sources.items()
+        }
+        
+        self.rounds = 0
+        self.batch_frames = 0
+        self.detector_time = 0.0
+        self.is_running = False
+        
+        print(f"✓ Multi-camera: {len(self.cameras)} sources, shared detector")
+    
+    def _read_round(self) -> List[Tuple[str, np.ndarray, Optional[float]]]:
+        """
+        Read one frame from every camera that has one ready.
+        
+        Cameras share one deadline, so a stalled stream delays the
+        round by at most max_wait instead of blocking the others.
+        
+        Returns:
+            List of (camera_id, frame, timestamp)
+        """
+        frames = []
+        deadline = time.monotonic() + self.max_wait
+        
+        for camera_id, processor in self.cameras.items():
+            if processor.reader is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+                ret, frame, timestamp = processor._read_frame(timeout)
+            else:
+                ret, frame, timestamp = processor._read_frame()
+                if not ret:
+                    # Loop video for demo
+                    processor.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            
+            if ret:
+                frames.append((camera_id, frame, timestamp))
+        
+        return frames
+    
+    def process_round(
+        self,
+        frames: List[Tuple[str, np.ndarray, Optional[float]]]
+    ) -> List[Tuple[str, np.ndarray, list]]:
+        """
+        Process one frame per camera with a single detector call.
+        
+        Args:
+            frames: List of (camera_id, frame, timestamp)
+        
+        Returns:
+            List of (camera_id, annotated_frame, detections_data)
+        """
+        # Ask each camera whether its frame needs the detector
+        plans = []
+        skipped = []
+        batch = []
+        for camera_id, frame, timestamp in frames:
+            run_detector, detections = self.cameras[camera_id]._gate_detection(frame)
+            plans.append(run_detector)
+            skipped.append(detections)
+            if run_detector:
+                batch.append(frame)
+        
+        # Cross-camera batch
+        batch_detections = []
+        elapsed = 0.0
+        if batch:
+            start = time.perf_counter()
+            batch_detections = self.detector.detect_batch(batch)
+            elapsed = time.perf_counter() - start
+            self.detector_time += elapsed
+            self.batch_frames += len(batch)
+        
+        results = []
+        batch_index = 0
+        for (camera_id, frame, timestamp), run_detector, detections in zip(frames, plans, skipped):
+            processor = self.cameras[camera_id]
+            
+            if run_detector:
+                detections = batch_detections[batch_index]
+                batch_index += 1
+                processor._record_detection(elapsed / len(batch))
+            
+            annotated, data = processor._complete_frame(frame, detections, timestamp)
+            results.append((camera_id, annotated, data))
+        
+        self.rounds += 1
+        return results
+    
+    def run(self) -> Generator[Tuple[str, np.ndarray, list], None, None]:
+        """
+        Run the multi-camera processing loop.
+        
+        Yields:
+            Tuple of (camera_id, frame, detections_data) for each
+            processed frame
+        """
+        self.is_running = True
+        
+        print("\n" + "=" * 50)
+        print("SpeedWatch Pro - Running (multi-camera)")
+        print("=" * 50)
+        for camera_id, processor in self.cameras.items():
+            print(f"  {camera_id}: {processor.source}")
+        print("Press 'q' to quit")
+        print("=" * 50 + "\n")
+        
+        for processor in self.cameras.values():
+            processor.is_running = True
+            if self.threaded_capture:
+                processor.reader = FrameReader(
+                    processor.cap, policy=processor.capture_policy
+                ).start()
+        
+        try:
+            while self.is_running:
+                for camera_id, annotated, detections in self.process_round(self._read_round()):
+                    yield camera_id, annotated, detections
+                    
+                    processor = self.cameras[camera_id]
+                    if self.show_preview and not processor._show_preview(annotated):
+                        self.is_running = False
+                        break
+        
+        finally:
+            self.stop()
+    
+    def stop(self):
+        """Stop all cameras and cleanup."""
+        self.is_running = False
+        for processor in self.cameras.values():
+            processor.stop()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get aggregate and per-camera statistics."""
+        cameras = {camera_id: processor.get_stats() for camera_id, processor in self.cameras.items()}
+        
+        return {
+            "cameras": cameras,
+            "total_vehicles": sum(stats["total_vehicles"] for stats in cameras.values()),
+            "overspeed_count": sum(stats["overspeed_count"] for stats in cameras.values()),
+            "rounds": self.rounds,
+            "avg_batch_size": round(self.batch_frames / self.rounds, 2) if self.rounds else 0.0,
+            "is_running": self.is_running
+        }
@@ -0,0 +1,246 @@
+"""
+SpeedWatch Pro - Pipeline Engine
+================================
+Runs processing stages concurrently in threads connected by bounded
+queues, so throughput approaches the cost of the slowest stage rather
+than the sum of all stages.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+# Import settings
+import sys
+sys.path.append('..')
+from config.settings import PIPELINE_QUEUE_SIZE
+
+
+# Marks the end of the stream on a queue
+_END = object()
+
+
+class Stage:
+    """
+    One step of a pipeline.
+    
+    A stage applies fn to every item. Stages with several workers
+    process items concurrently and may finish them out of order; an
+    ordered stage always sees its input in sequence and therefore has
+    exactly one worker.
+    
+    Attributes:
+        name: Stage name (for stats)
+        items: Items processed
+        busy: Seconds spent inside fn, summed over workers
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Any], Any],
+        workers: int = 1,
+        ordered: bool = False
+    ):
+        """
+        Initialize the stage.
+        
+        Args:
+            name: Stage name
+            fn: Function applied to every item
+            workers: Worker threads
+            ordered: Process items strictly in sequence (needs 1 worker)
+        """
+        if ordered and workers != 1:
+            raise ValueError(f"Ordered stage '{name}' must have exactly one worker")
+        
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.ordered = ordered
+        
+        self.items = 0
+        self.busy = 0.0
+        self._lock = threading.Lock()
+    
+    def run(self, payload: Any) -> Any:
+        """Apply fn to one item and account for the time taken."""
+        start = time.perf_counter()
+        result = self.fn(payload)
+        elapsed = time.perf_counter() - start
+        
+        with self._lock:
+            self.items += 1
+            self.busy += elapsed
+        
+        return result
+
+
+class Pipeline:
+    """
+    Threads a stream of items through a chain of stages.
+    
+    A feeder thread pulls items from source() until it returns None.
+    Each item gets a sequence number; results() yields the final
+    outputs strictly in that order no matter how many workers a stage
+    has.
+    """
+    
+    def __init__(
+        self,
+        source: Callable[[], Optional[Any]],
+        stages: List[Stage],
+        queue_size: int = PIPELINE_QUEUE_SIZE
+    ):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            source: Returns the next item, or None at end of stream
+            stages: Stages in processing order
+            queue_size: Capacity of each inter-stage queue
+        """
+        self.source = source
+        self.stages = stages
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+        
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._alive = [stage.workers for stage in stages]
+        self._alive_lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+    
+    def _put(self, q: queue.Queue, item: Any):
+        """Put onto a queue, giving up if the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def _get(self, q: queue.Queue) -> Any:
+        """Get from a queue; returns _END if the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+    
+    def _fail(self, error: BaseException):
+        """Record the first error and shut the pipeline down."""
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+    
+    def _feed(self):
+        """Feeder thread: number items from the source."""
+        sequence = 0
+        try:
+            while not self._stop.is_set():
+                item = self.source()
+                if item is None:
+                    break
+                self._put(self.queues[0], (sequence, item))
+                sequence += 1
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put(self.queues[0], _END)
+    
+    def _work(self, index: int):
+        """Worker thread for stage index."""
+        stage = self.stages[index]
+        inbox, outbox = self.queues[index], self.queues[index + 1]
+        pending: Dict[int, Any] = {}
+        next_sequence = 0
+        
+        try:
+            while True:
+                entry = self._get(inbox)
+                if entry is _END:
+                    # Let sibling workers see the end marker too
+                    if stage.workers > 1:
+                        self._put(inbox, _END)
+                    break
+                
+                sequence, payload = entry
+                if not stage.ordered:
+                    self._put(outbox, (sequence, stage.run(payload)))
+                    continue
+                
+                # Re-sequence output of concurrent upstream workers
+                pending[sequence] = payload
+                while next_sequence in pending:
+                    result = stage.run(pending.pop(next_sequence))
+                    self._put(outbox, (next_sequence, result))
+                    next_sequence += 1
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            # The last worker of a stage passes the end marker on
+            with self._alive_lock:
+                self._alive[index] -= 1
+                last = self._alive[index] == 0
+            if last:
+                self._put(outbox, _END)
+    
+    def start(self) -> "Pipeline":
+        """Start the feeder and all stage workers."""
+        self._threads = [threading.Thread(target=self._feed, name="pipeline-feed", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                self._threads.append(threading.Thread(
+                    target=self._work, args=(index,),
+                    name=f"pipeline-{stage.name}-{worker}", daemon=True
+                ))
+        
+        for thread in self._threads:
+            thread.start()
+        return self
+    
+    def stop(self):
+        """Stop all threads and wait for them to exit."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+    
+    def results(self) -> Generator[Any, None, None]:
+        """
+        Yield final stage outputs in input order.
+        
+        Raises:
+            The first exception raised by the source or any stage
+        """
+        pending: Dict[int, Any] = {}
+        next_sequence = 0
+        outbox = self.queues[-1]
+        
+        while True:
+            entry = self._get(outbox)
+            if entry is _END:
+                break
+            
+            sequence, result = entry
+            pending[sequence] = result
+            while next_sequence in pending:
+                yield pending.pop(next_sequence)
+                next_sequence += 1
+        
+        if self._error is not None:
+            raise self._error
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-stage throughput and queue depths."""
+        stats = {}
+        for stage, inbox in zip(self.stages, self.queues):
+            stats[stage.name] = {
+                "workers": stage.workers,
+                "items": stage.items,
+                "ms_per_item": round(stage.busy / stage.items * 1000, 2) if stage.items else 0.0,
+                "queue_depth": inbox.qsize(),
+            }
+        return stats
@@ -0,0 +1,72 @@
+"""
+SpeedWatch Pro - Spatial Index
+==============================
+Uniform grid for finding point pairs within a radius without building
+the full pairwise distance matrix. Cells are one radius wide, so every
+pair within the radius lies in the same or an adjacent cell.
+"""
+
+import numpy as np
+from typing import Tuple
+
+
+def pairs_within(
+    a: np.ndarray,
+    b: np.ndarray,
+    radius: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all pairs of points from a and b at most radius apart.
+    
+    Points of b are bucketed into grid cells by one sort; each point of
+    a then looks up its 3x3 cell neighbourhood with binary searches.
+    Cost is O((|a| + |b|) log |b| + candidates) instead of O(|a| |b|).
+    
+    Args:
+        a: Points of shape (N, 2)
+        b: Points of shape (M, 2)
+        radius: Max distance (also the grid cell size)
+    
+    Returns:
+        Tuple of (a_index, b_index, distance) arrays, one entry per pair
+    """
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 2)
+    b = np.asarray(b, dtype=np.float64).reshape(-1, 2)
+    if len(a) == 0 or len(b) == 0:
+        return np.empty(0, np.intp), np.empty(0, np.intp), np.empty(0)
+    
+    # Integer cell coordinates, shifted so neighbours of every cell are >= 0
+    origin = np.minimum(a.min(axis=0), b.min(axis=0))
+    cell_a = np.floor((a - origin) / radius).astype(np.int64) + 1
+    cell_b = np.floor((b - origin) / radius).astype(np.int64) + 1
+    width = max(cell_a[:, 0].max(), cell_b[:, 0].max()) + 2
+    
+    key_b = cell_b[:, 1] * width + cell_b[:, 0]
+    order = np.argsort(key_b, kind="stable")
+    sorted_keys = key_b[order]
+    
+    a_index, b_index = [], []
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            key = (cell_a[:, 1] + dy) * width + (cell_a[:, 0] + dx)
+            start = np.searchsorted(sorted_keys, key, "left")
+            counts = np.searchsorted(sorted_keys, key, "right") - start
+            total = counts.sum()
+            if total == 0:
+                continue
+            
+            # Expand each [start, start + count) run into explicit pairs
+            rows = np.repeat(np.arange(len(a)), counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            a_index.append(rows)
+            b_index.append(order[np.repeat(start, counts) + offsets])
+    
+    if not a_index:
+        return np.empty(0, np.intp), np.empty(0, np.intp), np.empty(0)
+    
+    a_index = np.concatenate(a_index)
+    b_index = np.concatenate(b_index)
+    distance = np.hypot(*(a[a_index] - b[b_index]).T)
+    
+    keep = distance <= radius
+    return a_index[keep], b_index[keep], distance[keep]
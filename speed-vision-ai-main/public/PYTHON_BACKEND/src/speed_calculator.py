@@ -5,16 +5,18 @@ Calculates vehicle speed from tracked positions.
 """
 
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import Sequence, Tuple, Optional
 from dataclasses import dataclass
 
 # Import settings
 import sys
 sys.path.append('..')
 from config.settings import (
-    PIXELS_PER_METER, FPS, SPEED_LIMIT, MIN_DISTANCE_THRESHOLD
+    PIXELS_PER_METER, FPS, SPEED_LIMIT, MIN_DISTANCE_THRESHOLD, SPEED_WINDOW
 )
 
+from src.track_store import Track, TrackStore
+
 
 @dataclass
 class SpeedResult:
@@ -26,6 +28,24 @@ class SpeedResult:
     time_seconds: float
 
 
+@dataclass
+class SpeedBatch:
+    """
+    Speeds of many tracks as parallel NumPy arrays.
+    
+    Row i of every array describes slots[i]. Rows where valid is False
+    had too little data (like a None from calculate_speed) and hold
+    zeros.
+    """
+    slots: np.ndarray
+    valid: np.ndarray
+    speed_kmh: np.ndarray
+    speed_mph: np.ndarray
+    is_overspeed: np.ndarray
+    distance_pixels: np.ndarray
+    time_seconds: np.ndarray
+
+
 class SpeedCalculator:
     """
     Calculates vehicle speed from position history.
@@ -37,13 +57,15 @@ class SpeedCalculator:
         pixels_per_meter: Calibration factor
         fps: Video frame rate
         speed_limit: Speed limit for overspeed detection
+        window: Positions per speed estimate
     """
     
     def __init__(
         self,
         pixels_per_meter: float = PIXELS_PER_METER,
         fps: float = FPS,
-        speed_limit: float = SPEED_LIMIT
+        speed_limit: float = SPEED_LIMIT,
+        window: int = SPEED_WINDOW
     ):
         """
         Initialize the speed calculator.
@@ -52,25 +74,32 @@ class SpeedCalculator:
             pixels_per_meter: Pixels per real-world meter
             fps: Video frame rate
             speed_limit: Speed limit in km/h
+            window: Measured positions per speed estimate
         """
         self.pixels_per_meter = pixels_per_meter
         self.fps = fps
         self.speed_limit = speed_limit
+        self.window = window
     
     def calculate_speed(
         self,
-        positions: List[Tuple[int, int]],
-        timestamps: Optional[List[float]] = None
+        positions: Sequence[Tuple[int, int]],
+        timestamps: Optional[Sequence[float]] = None
     ) -> Optional[SpeedResult]:
         """
         Calculate speed from position history.
         
         Uses a sliding window approach for smoother speed estimation.
+        Only measured positions should be passed in; positions that
+        were interpolated between detector keyframes carry no new
+        information and are kept out of the track history.
         
         Args:
-            positions: List of (x, y) positions
-            timestamps: Optional list of timestamps
-            
+            positions: Measured (x, y) positions (list or (n, 2) array)
+            timestamps: Optional timestamps, one per position.
+                Required when samples are not one frame apart (e.g.
+                with a detection stride above 1).
+        
         Returns:
             SpeedResult or None if not enough data
         """
@@ -78,7 +107,7 @@ class SpeedCalculator:
             return None
         
         # Use last N positions for smoothing
-        n_positions = min(10, len(positions))
+        n_positions = min(self.window, len(positions))
         recent_positions = positions[-n_positions:]
         
         # Calculate total displacement
@@ -94,12 +123,128 @@ class SpeedCalculator:
             return None
         
         # Calculate time elapsed
-        if timestamps and len(timestamps) >= n_positions:
+        if timestamps is not None and len(timestamps) >= n_positions:
             recent_timestamps = timestamps[-n_positions:]
             time_elapsed = recent_timestamps[-1] - recent_timestamps[0]
         else:
             time_elapsed = (n_positions - 1) / self.fps
         
+        return self._speed_result(total_distance, time_elapsed)
+    
+    def track_speed(self, track: Track) -> Optional[SpeedResult]:
+        """
+        Calculate a track's speed from its stored path length.
+        
+        Same result as calculate_speed(track.positions, track.timestamps),
+        bit for bit. The store re-sums the window's steps on every
+        append (O(window) per sample; see TrackStore._sum_path for why
+        it is not an add/subtract running sum), so reading it here is
+        O(1) and no history is read back.
+        
+        Args:
+            track: Live track
+        
+        Returns:
+            SpeedResult or None if not enough data
+        """
+        store = track.store
+        if store.path_window != self.window:
+            return self.calculate_speed(track.positions, track.timestamps)
+        
+        length = int(store.length[track.slot])
+        if length < 2:
+            return None
+        
+        total_distance = store.path_length[track.slot]
+        if total_distance < MIN_DISTANCE_THRESHOLD:
+            return None
+        
+        # Times of the newest sample and the oldest one in the window
+        first = length - min(self.window, length)
+        times = store.timestamps[track.slot]
+        time_elapsed = times[(length - 1) % store.history] - times[first % store.history]
+        
+        return self._speed_result(total_distance, time_elapsed)
+    
+    def calculate_speeds(
+        self,
+        track_store: TrackStore,
+        slots: Optional[np.ndarray] = None,
+        from_velocity: bool = False
+    ) -> SpeedBatch:
+        """
+        Calculate the speed of many tracks at once.
+        
+        The tracks' windows are read from the store as padded arrays
+        with validity masks, and path length, elapsed time, km/h, mph
+        and overspeed come from a few array operations instead of a
+        calculate_speed call per track. Row by row, the results are
+        those of track_speed (or speed_from_velocity).
+        
+        Args:
+            track_store: Store holding the tracks
+            slots: Slots to measure (default: all active tracks)
+            from_velocity: Use each track's velocity column (e.g. from
+                the Kalman filter) instead of its position history
+        
+        Returns:
+            SpeedBatch with one row per slot
+        """
+        if slots is None:
+            slots = track_store.active_slots()
+        slots = np.asarray(slots, dtype=np.intp)
+        
+        if from_velocity:
+            velocity = track_store.velocity[slots]
+            speed_pixels = np.hypot(velocity[:, 0], velocity[:, 1])
+            time_elapsed = np.full(len(slots), (self.window - 1) / self.fps)
+            total_distance = speed_pixels * time_elapsed
+            valid = total_distance >= MIN_DISTANCE_THRESHOLD
+            
+            speed_kmh = np.zeros(len(slots))
+            speed_kmh[valid] = speed_pixels[valid] / self.pixels_per_meter * 3.6
+        else:
+            positions, timestamps, mask = track_store.windows(slots, self.window)
+            
+            if track_store.path_window == self.window:
+                total_distance = track_store.path_length[slots]
+            else:
+                steps = np.diff(positions.astype(np.int64), axis=1)
+                steps = np.sqrt((steps * steps).sum(axis=2))
+                
+                # Summed oldest first, like calculate_speed
+                total_distance = np.zeros(len(slots))
+                for column in range(steps.shape[1]):
+                    total_distance += np.where(mask[:, column], steps[:, column], 0.0)
+            
+            # Newest sample minus the oldest real one of the window
+            first = np.argmax(mask, axis=1)
+            time_elapsed = timestamps[:, -1] - timestamps[np.arange(len(slots)), first]
+            
+            valid = (
+                (mask.sum(axis=1) >= 2)
+                & (total_distance >= MIN_DISTANCE_THRESHOLD)
+                & (time_elapsed > 0)
+            )
+            
+            speed_kmh = np.zeros(len(slots))
+            distance_meters = total_distance[valid] / self.pixels_per_meter
+            speed_kmh[valid] = distance_meters / time_elapsed[valid] * 3.6
+        
+        speed_mph = speed_kmh * 0.621371
+        
+        return SpeedBatch(
+            slots=slots,
+            valid=valid,
+            speed_kmh=np.round(speed_kmh, 1),
+            speed_mph=np.round(speed_mph, 1),
+            is_overspeed=speed_kmh > self.speed_limit,
+            distance_pixels=np.where(valid, total_distance, 0.0),
+            time_seconds=np.where(valid, time_elapsed, 0.0)
+        )
+    
+    def _speed_result(self, total_distance: float, time_elapsed: float) -> Optional[SpeedResult]:
+        """Convert a path length over a time span to a SpeedResult."""
         if time_elapsed <= 0:
             return None
         
@@ -119,6 +264,40 @@ class SpeedCalculator:
             time_seconds=time_elapsed
         )
     
+    def speed_from_velocity(
+        self,
+        velocity: Tuple[float, float]
+    ) -> Optional[SpeedResult]:
+        """
+        Calculate speed from an estimated velocity (e.g. the state of a
+        Kalman filter) instead of a position history.
+        
+        The minimum distance threshold is applied to the displacement
+        over the same window calculate_speed uses.
+        
+        Args:
+            velocity: (vx, vy) in pixels per second
+        
+        Returns:
+            SpeedResult or None if the vehicle is (nearly) stationary
+        """
+        speed_pixels = float(np.hypot(velocity[0], velocity[1]))
+        window = (self.window - 1) / self.fps
+        
+        if speed_pixels * window < MIN_DISTANCE_THRESHOLD:
+            return None
+        
+        speed_kmh = speed_pixels / self.pixels_per_meter * 3.6
+        speed_mph = speed_kmh * 0.621371
+        
+        return SpeedResult(
+            speed_kmh=round(speed_kmh, 1),
+            speed_mph=round(speed_mph, 1),
+            is_overspeed=speed_kmh > self.speed_limit,
+            distance_pixels=speed_pixels * window,
+            time_seconds=window
+        )
+    
     def calculate_instantaneous_speed(
         self,
         p1: Tuple[int, int],
@@ -132,7 +311,7 @@ class SpeedCalculator:
             p1: First position (x, y)
             p2: Second position (x, y)
             dt: Time difference in seconds
-            
+        
         Returns:
             Speed in km/h
         """
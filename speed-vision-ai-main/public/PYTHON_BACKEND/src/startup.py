@@ -0,0 +1,86 @@
+"""
+SpeedWatch Pro - Startup Profiler
+=================================
+Measures per-module import time and startup phases against a budget.
+"""
+
+import importlib
+import sys
+import time
+from typing import Dict, Any, List
+
+# Import settings
+sys.path.append('..')
+from config.settings import STARTUP_BUDGET
+
+
+class StartupProfile:
+    """
+    Records how long startup takes and where the time goes.
+    
+    Heavy modules are imported through timed_import() so each one's
+    import cost is measured on its own. Phases (e.g. "model_ready")
+    are recorded as seconds since the profile was created.
+    
+    Attributes:
+        budget: Target startup time in seconds
+        imports: Import time in seconds per module
+        phases: Elapsed time in seconds when each phase was reached
+    """
+    
+    def __init__(self, budget: float = STARTUP_BUDGET):
+        self.budget = budget
+        self.start = time.perf_counter()
+        self.imports: Dict[str, float] = {}
+        self.phases: Dict[str, float] = {}
+    
+    def timed_import(self, name: str):
+        """
+        Import a module and record how long it took.
+        
+        Modules that are already loaded are returned without being
+        recorded, so each module is only charged once.
+        """
+        if name in sys.modules:
+            return sys.modules[name]
+        
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        self.imports[name] = time.perf_counter() - start
+        return module
+    
+    def mark(self, phase: str):
+        """Record that a startup phase has been reached."""
+        self.phases[phase] = time.perf_counter() - self.start
+    
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the profile was created."""
+        return time.perf_counter() - self.start
+    
+    def within_budget(self, phase: str) -> bool:
+        """Check whether a phase was reached within the budget."""
+        return self.phases.get(phase, self.elapsed) <= self.budget
+    
+    def report(self) -> List[str]:
+        """Format import and phase timings as report lines."""
+        lines = ["Startup profile:"]
+        for name, seconds in sorted(self.imports.items(), key=lambda item: -item[1]):
+            lines.append(f"  import {name:<24} {seconds * 1000:8.1f} ms")
+        for phase, seconds in self.phases.items():
+            status = "ok" if seconds <= self.budget else "OVER BUDGET"
+            lines.append(f"  {phase:<31} {seconds * 1000:8.1f} ms  ({status})")
+        lines.append(f"  budget {self.budget * 1000:.0f} ms")
+        return lines
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get timings for the API (milliseconds)."""
+        return {
+            "budget_ms": round(self.budget * 1000, 1),
+            "imports_ms": {name: round(s * 1000, 1) for name, s in self.imports.items()},
+            "phases_ms": {phase: round(s * 1000, 1) for phase, s in self.phases.items()},
+        }
+
+
+# Process-wide profile, created as early as main.py imports it
+profile = StartupProfile()
@@ -0,0 +1,503 @@
+"""
+SpeedWatch Pro - Supervisor
+===========================
+Multi-process mode for camera counts beyond what one process can
+handle. Each camera runs in its own worker process that decodes into a
+shared-memory frame ring; a pool of detector processes reads frames
+straight out of those rings. Only small (slot, sequence) jobs and the
+resulting detections travel over queues.
+
+The supervisor restarts crashed workers with backoff and periodically
+re-pins camera workers to CPU cores by measured load.
+"""
+
+import os
+import queue
+import re
+import time
+import multiprocessing as mp
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .detector import VehicleDetector, DetectionZone
+from .frame_ring import FrameRing, unlink
+from .video_processor import VideoProcessor
+
+# Import settings
+import sys
+sys.path.append('..')
+from config.settings import (
+    DETECTOR_BACKEND, LOW_CONFIDENCE_THRESHOLD, CROP_TO_ZONE, BATCH_MAX_WAIT,
+    DETECTOR_PROCESSES, FRAME_RING_SLOTS, DETECTION_TIMEOUT,
+    SUPERVISOR_POLL_INTERVAL, RESTART_BACKOFF, REBALANCE_INTERVAL
+)
+
+
+# A job for the detector pool:
+# (camera_id, ring_name, frame_shape, ring_slots, slot, sequence)
+Job = Tuple[str, str, Tuple[int, int, int], int, int, int]
+
+
+class PooledDetector:
+    """
+    Stands in for VehicleDetector inside a camera worker.
+    
+    Inference runs in the detector pool; the camera worker only needs
+    the detection zone (for drawing and the motion gate), so no model
+    is loaded here.
+    """
+    
+    def __init__(self):
+        self.zone = DetectionZone() if CROP_TO_ZONE else None
+    
+    def detect(self, frame: np.ndarray):
+        raise RuntimeError("Detection runs in the detector pool")
+    
+    def detect_batch(self, frames: List[np.ndarray]):
+        raise RuntimeError("Detection runs in the detector pool")
+
+
+def camera_worker(
+    camera_id: str,
+    source: str,
+    ring_name: str,
+    jobs: mp.Queue,
+    results: mp.Queue,
+    status: mp.Queue,
+    stop: mp.Event,
+    processor_kwargs: Dict[str, Any]
+):
+    """
+    Camera process: decode, submit to the detector pool, track.
+    
+    Frames are decoded directly into the shared ring. Up to one frame
+    per ring slot is in flight; frames are tracked strictly in order
+    as their detections come back. A frame whose detections do not
+    arrive within DETECTION_TIMEOUT (e.g. its detector process died)
+    is tracked by prediction instead.
+    
+    With adaptive stride or the motion gate, whether a frame needs the
+    detector depends on the tracks up to the previous frame. Decoding
+    then pauses while a frame waits for detections, so every decision
+    sees fully tracked history (no lag) at the cost of overlapping this
+    camera's decode with its own inference.
+    """
+    processor = VideoProcessor(
+        source=source,
+        show_preview=False,
+        threaded_capture=False,
+        detector=PooledDetector(),
+        camera_id=camera_id,
+        **processor_kwargs
+    )
+    shape = (processor.frame_height, processor.frame_width, 3)
+    ring = FrameRing(ring_name, shape, FRAME_RING_SLOTS, create=True)
+    
+    # Keyframe and motion decisions must not run ahead of tracking
+    gated = processor.stride is not None or processor.motion_gate is not None
+    
+    # sequence -> [slot, timestamp, detections, ready, submitted_at]
+    in_flight: Dict[int, list] = {}
+    sequence = 0
+    next_done = 0
+    failures = 0
+    last_report = 0.0
+    
+    try:
+        while not stop.is_set():
+            # Decode into a free slot (gated cameras: once all earlier
+            # frames are tracked)
+            if len(in_flight) < ring.slots and not (gated and in_flight):
+                slot = ring.slot(sequence)
+                view = ring.view(slot)
+                ret, frame = processor.cap.read(view)
+                
+                if not ret:
+                    failures += 1
+                    if failures > 1:
+                        raise RuntimeError(f"Video source stopped: {source}")
+                    # Loop video for demo
+                    processor.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                failures = 0
+                
+                if frame.shape != view.shape:
+                    cv2.resize(frame, (shape[1], shape[0]), dst=view)
+                elif not np.may_share_memory(frame, view):
+                    np.copyto(view, frame)
+                ring.publish(slot, sequence)
+                
+                run_detector, detections = processor._gate_detection(view)
+                if run_detector:
+                    jobs.put((camera_id, ring.name, shape, ring.slots, slot, sequence))
+                
+                timestamp = (sequence + 1) / processor.fps
+                in_flight[sequence] = [slot, timestamp, detections, not run_detector, time.monotonic()]
+                sequence += 1
+            
+            # Collect detections; block briefly only when no frame can
+            # be decoded
+            waiting = gated and any(not entry[3] for entry in in_flight.values())
+            block = len(in_flight) >= ring.slots or waiting
+            while True:
+                try:
+                    name, done, detections = results.get(block, timeout=0.05)
+                except queue.Empty:
+                    break
+                block = False
+                
+                # Drop results meant for an earlier run of this camera
+                if name == ring.name and done in in_flight and not in_flight[done][3]:
+                    in_flight[done][2] = detections
+                    in_flight[done][3] = True
+                    processor._record_detection(time.monotonic() - in_flight[done][4])
+            
+            # Track completed frames in order
+            while next_done in in_flight:
+                slot, timestamp, detections, ready, submitted = in_flight[next_done]
+                if not ready:
+                    if time.monotonic() - submitted < DETECTION_TIMEOUT:
+                        break
+                    detections = None
+                
+                processor._complete_frame(ring.view(slot), detections, timestamp, draw=False)
+                del in_flight[next_done]
+                next_done += 1
+            
+            now = time.monotonic()
+            if now - last_report >= SUPERVISOR_POLL_INTERVAL:
+                last_report = now
+                status.put((camera_id, os.getpid(), time.process_time(), processor.get_stats()))
+    
+    except KeyboardInterrupt:
+        pass
+    
+    finally:
+        processor.stop()
+        ring.close()
+
+
+def _collect_jobs(jobs: mp.Queue, batch_size: int, max_wait: float) -> List[Job]:
+    """Wait for one job, then gather more for up to max_wait."""
+    try:
+        batch = [jobs.get(timeout=SUPERVISOR_POLL_INTERVAL)]
+    except queue.Empty:
+        return []
+    
+    deadline = time.monotonic() + max_wait
+    while len(batch) < batch_size:
+        try:
+            batch.append(jobs.get(timeout=max(0.0, deadline - time.monotonic())))
+        except queue.Empty:
+            break
+    
+    return batch
+
+
+def detector_worker(
+    jobs: mp.Queue,
+    results: Dict[str, mp.Queue],
+    stop: mp.Event,
+    backend: str,
+    low_confidence: Optional[float],
+    batch_size: int,
+    max_wait: float
+):
+    """
+    Detector process: batch jobs from all cameras into one forward pass.
+    
+    Frames are read in place from each camera's ring. A job whose ring
+    is gone (the camera restarted) or whose slot has been reused is
+    skipped; the camera falls back to prediction for it.
+    """
+    detector = VehicleDetector(backend=backend, low_confidence=low_confidence)
+    rings: Dict[str, FrameRing] = {}
+    
+    try:
+        while not stop.is_set():
+            batch = _collect_jobs(jobs, batch_size, max_wait)
+            
+            frames = []
+            valid = []
+            for camera_id, ring_name, shape, slots, slot, sequence in batch:
+                ring = rings.get(camera_id)
+                if ring is None or ring.name != ring_name:
+                    if ring is not None:
+                        ring.close()
+                        del rings[camera_id]
+                    try:
+                        ring = rings[camera_id] = FrameRing(ring_name, shape, slots)
+                    except FileNotFoundError:
+                        continue
+                
+                if ring.holds(slot, sequence):
+                    frames.append(ring.view(slot))
+                    valid.append((camera_id, ring_name, sequence))
+            
+            if not frames:
+                continue
+            
+            for (camera_id, ring_name, sequence), detections in zip(valid, detector.detect_batch(frames)):
+                results[camera_id].put((ring_name, sequence, detections))
+    
+    except KeyboardInterrupt:
+        pass
+    
+    finally:
+        for ring in rings.values():
+            ring.close()
+
+
+@dataclass
+class _Worker:
+    """A supervised process and its restart state."""
+    name: str
+    target: Callable
+    args: Callable[[], tuple]
+    camera_id: Optional[str] = None
+    ring_name: Optional[str] = None
+    process: Optional[mp.Process] = None
+    generation: int = 0
+    restarts: int = 0
+    backoff: float = RESTART_BACKOFF
+    started_at: float = 0.0
+    restart_at: Optional[float] = None
+    core: Optional[int] = None
+    # (process_time, wall time) from the previous status report
+    cpu_sample: Tuple[float, float] = (0.0, 0.0)
+    load: float = 0.0
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+class Supervisor:
+    """
+    Starts, watches and restarts camera and detector processes.
+    """
+    
+    def __init__(
+        self,
+        sources: Dict[str, str],
+        detector_processes: int = DETECTOR_PROCESSES,
+        backend: str = DETECTOR_BACKEND,
+        low_confidence: Optional[float] = LOW_CONFIDENCE_THRESHOLD,
+        batch_size: Optional[int] = None,
+        processor_kwargs: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the supervisor.
+        
+        Args:
+            sources: Dict of camera name -> video source
+            detector_processes: Size of the detector process pool
+            backend: Detector inference backend
+            low_confidence: Threshold of the detector's low-confidence
+                tier (None disables it)
+            batch_size: Max frames per detector call (defaults to the
+                number of cameras per detector process)
+            processor_kwargs: Extra VideoProcessor options for every camera
+        """
+        if not sources:
+            raise ValueError("At least one video source is required")
+        
+        self.sources = sources
+        self.backend = backend
+        self.low_confidence = low_confidence
+        self.batch_size = batch_size or max(1, -(-len(sources) // max(1, detector_processes)))
+        self.processor_kwargs = processor_kwargs or {}
+        
+        # Spawn: children must not inherit model or capture state
+        self.ctx = mp.get_context("spawn")
+        self.jobs = self.ctx.Queue(maxsize=len(sources) * FRAME_RING_SLOTS)
+        self.results = {camera_id: self.ctx.Queue() for camera_id in sources}
+        self.status = self.ctx.Queue()
+        self.stop_event = self.ctx.Event()
+        
+        self.workers: List[_Worker] = []
+        for index in range(detector_processes):
+            self.workers.append(_Worker(
+                name=f"detector-{index}",
+                target=detector_worker,
+                args=lambda: (self.jobs, self.results, self.stop_event, self.backend,
+                              self.low_confidence, self.batch_size, BATCH_MAX_WAIT)
+            ))
+        for camera_id in sources:
+            self.workers.append(self._camera(camera_id))
+        
+        self.is_running = False
+        self._last_rebalance = 0.0
+    
+    def _camera(self, camera_id: str) -> _Worker:
+        """Create the supervised worker for a camera."""
+        worker = _Worker(name=f"camera-{camera_id}", target=camera_worker, args=None, camera_id=camera_id)
+        worker.args = lambda: (
+            camera_id, self.sources[camera_id], worker.ring_name, self.jobs,
+            self.results[camera_id], self.status, self.stop_event, self.processor_kwargs
+        )
+        return worker
+    
+    def _spawn(self, worker: _Worker):
+        """Start (or restart) a worker process."""
+        if worker.camera_id is not None:
+            # A fresh ring per generation so stale jobs cannot match
+            safe_id = re.sub(r"\W", "_", worker.camera_id)
+            worker.ring_name = f"speedwatch_{os.getpid()}_{safe_id}_{worker.generation}"
+        
+        worker.process = self.ctx.Process(
+            target=worker.target, args=worker.args(), name=worker.name, daemon=True
+        )
+        worker.process.start()
+        worker.generation += 1
+        worker.started_at = time.monotonic()
+        worker.restart_at = None
+        worker.cpu_sample = (0.0, 0.0)
+        
+        if worker.core is not None:
+            self._pin(worker, worker.core)
+    
+    def start(self) -> "Supervisor":
+        """Start all worker processes."""
+        self.is_running = True
+        for worker in self.workers:
+            self._spawn(worker)
+        
+        print(f"✓ Supervisor: {len(self.sources)} camera process(es), "
+              f"{len(self.workers) - len(self.sources)} detector process(es)")
+        return self
+    
+    def _check_health(self):
+        """Schedule restarts for dead workers and run due restarts."""
+        now = time.monotonic()
+        
+        for worker in self.workers:
+            if worker.process.is_alive():
+                # Stable for a minute: forget earlier crashes
+                if now - worker.started_at > 60.0:
+                    worker.backoff = RESTART_BACKOFF
+                continue
+            
+            if worker.restart_at is None:
+                print(f"⚠️ {worker.name} exited (code {worker.process.exitcode}); "
+                      f"restarting in {worker.backoff:.0f}s")
+                worker.restart_at = now + worker.backoff
+                worker.backoff = min(worker.backoff * 2, 60.0)
+                
+                # A crashed camera cannot remove its own ring
+                if worker.ring_name is not None:
+                    unlink(worker.ring_name)
+            
+            elif now >= worker.restart_at:
+                worker.restarts += 1
+                self._spawn(worker)
+    
+    def _drain_status(self):
+        """Read stats reports from camera workers."""
+        by_camera = {worker.camera_id: worker for worker in self.workers if worker.camera_id}
+        
+        while True:
+            try:
+                camera_id, pid, cpu_time, stats = self.status.get_nowait()
+            except queue.Empty:
+                break
+            
+            worker = by_camera.get(camera_id)
+            if worker is None or worker.process.pid != pid:
+                continue
+            
+            # CPU seconds used per wall second since the last report
+            now = time.monotonic()
+            last_cpu, last_wall = worker.cpu_sample
+            if last_wall:
+                worker.load = (cpu_time - last_cpu) / max(now - last_wall, 1e-6)
+            worker.cpu_sample = (cpu_time, now)
+            worker.stats = stats
+    
+    def _pin(self, worker: _Worker, core: int):
+        """Pin a worker process to one CPU core."""
+        worker.core = core
+        try:
+            os.sched_setaffinity(worker.process.pid, {core})
+        except (AttributeError, OSError):
+            # Not supported on this platform, or the process just exited
+            pass
+    
+    def rebalance(self) -> Dict[str, int]:
+        """
+        Re-assign camera workers to CPU cores by measured load.
+        
+        Cameras are placed heaviest first on the least loaded core.
+        Detector processes stay unpinned so they can use every core.
+        
+        Returns:
+            Dict of camera name -> core
+        """
+        if not hasattr(os, "sched_getaffinity"):
+            return {}
+        
+        cores = sorted(os.sched_getaffinity(0))
+        core_load = {core: 0.0 for core in cores}
+        assignment = {}
+        
+        cameras = [worker for worker in self.workers if worker.camera_id is not None]
+        for worker in sorted(cameras, key=lambda w: w.load, reverse=True):
+            core = min(cores, key=lambda c: core_load[c])
+            core_load[core] += max(worker.load, 1e-3)
+            if worker.process is not None and worker.process.is_alive():
+                self._pin(worker, core)
+            assignment[worker.camera_id] = core
+        
+        return assignment
+    
+    def poll(self):
+        """One supervision step: stats, health checks, rebalancing."""
+        self._drain_status()
+        self._check_health()
+        
+        now = time.monotonic()
+        if REBALANCE_INTERVAL and now - self._last_rebalance >= REBALANCE_INTERVAL:
+            self._last_rebalance = now
+            self.rebalance()
+    
+    def run(self):
+        """Start the workers and supervise them until interrupted."""
+        self.start()
+        try:
+            while self.is_running:
+                self.poll()
+                time.sleep(SUPERVISOR_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            print("\n\nInterrupted by user.")
+        finally:
+            self.stop()
+    
+    def stop(self, timeout: float = 5.0):
+        """Stop all workers and remove their frame rings."""
+        self.is_running = False
+        self.stop_event.set()
+        
+        for worker in self.workers:
+            if worker.process is None:
+                continue
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join(1.0)
+            if worker.ring_name is not None:
+                unlink(worker.ring_name)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get aggregate and per-camera statistics."""
+        cameras = {
+            worker.camera_id: dict(worker.stats, load=round(worker.load, 2), core=worker.core)
+            for worker in self.workers if worker.camera_id is not None
+        }
+        
+        return {
+            "cameras": cameras,
+            "total_vehicles": sum(stats.get("total_vehicles", 0) for stats in cameras.values()),
+            "overspeed_count": sum(stats.get("overspeed_count", 0) for stats in cameras.values()),
+            "restarts": {worker.name: worker.restarts for worker in self.workers},
+            "is_running": self.is_running
+        }
@@ -0,0 +1,463 @@
+"""
+SpeedWatch Pro - Track Store
+============================
+Struct-of-arrays storage for track state. Every per-track value lives
+in a preallocated NumPy column indexed by slot, and position history is
+a fixed-size ring per slot, so per-frame updates are vector writes
+with no per-track allocation. Slots are recycled through a free list.
+
+The path length over each track's last few positions is kept up to
+date as samples arrive, from a ring of per-step distances summed in
+the order SpeedCalculator.calculate_speed sums them, so it matches a
+fresh calculation exactly and speeds cost the same at any history
+length.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Import settings
+import sys
+sys.path.append('..')
+from config.settings import CLASS_NAMES, TRACK_CAPACITY, TRACK_HISTORY, SPEED_WINDOW
+
+
+class TrackStore:
+    """
+    Columnar track state with a position/timestamp ring per slot.
+    
+    The store grows (doubling every column) if more than capacity
+    tracks are alive at once; size capacity for the busiest scene to
+    keep that off the hot path.
+    
+    Attributes:
+        positions: Measured centroid ring, shape (capacity, history, 2)
+        timestamps: Timestamp ring, shape (capacity, history)
+        length: Samples ever written per slot (ring head = length % history)
+        centroid: Current (possibly predicted) centroid, shape (capacity, 2)
+        hits, disappeared, speed: Per-track counters and last speed
+        steps: Distance from the previous sample to each sample of
+            the ring (pixels), shape (capacity, history)
+        path_length: Distance travelled over the last path_window
+            measured positions (pixels)
+    """
+    
+    def __init__(
+        self,
+        capacity: int = TRACK_CAPACITY,
+        history: int = TRACK_HISTORY,
+        path_window: int = SPEED_WINDOW
+    ):
+        """
+        Initialize the store.
+        
+        Args:
+            capacity: Initial number of track slots
+            history: Measured positions kept per track
+            path_window: Positions covered by path_length
+        
+        Raises:
+            ValueError: If path_window does not fit in the history
+        """
+        if not 2 <= path_window < history:
+            raise ValueError(
+                f"Path window {path_window} must be at least 2 and below the history length {history}"
+            )
+        
+        self.history = history
+        self.path_window = path_window
+        self._allocate_columns(capacity)
+        self._free = list(range(capacity - 1, -1, -1))
+    
+    def _allocate_columns(self, capacity: int):
+        """Create zeroed columns for capacity slots."""
+        self.positions = np.zeros((capacity, self.history, 2), dtype=np.int32)
+        self.timestamps = np.zeros((capacity, self.history), dtype=np.float64)
+        self.length = np.zeros(capacity, dtype=np.int64)
+        self.steps = np.zeros((capacity, self.history), dtype=np.float64)
+        
+        self.track_id = np.full(capacity, -1, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.centroid = np.zeros((capacity, 2), dtype=np.int32)
+        self.bbox = np.zeros((capacity, 4), dtype=np.int32)
+        self.has_bbox = np.zeros(capacity, dtype=bool)
+        self.class_id = np.full(capacity, -1, dtype=np.int32)
+        self.confidence = np.zeros(capacity, dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float64)
+        self.hits = np.zeros(capacity, dtype=np.int32)
+        self.disappeared = np.zeros(capacity, dtype=np.int32)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.interpolated = np.zeros(capacity, dtype=bool)
+        self.kf_slot = np.full(capacity, -1, dtype=np.int32)
+        self.first_seen = np.zeros(capacity, dtype=np.float64)
+        self.path_length = np.zeros(capacity, dtype=np.float64)
+    
+    @property
+    def capacity(self) -> int:
+        return len(self.active)
+    
+    def _columns(self) -> Dict[str, np.ndarray]:
+        """All per-slot columns by name."""
+        return {name: value for name, value in vars(self).items() if isinstance(value, np.ndarray)}
+    
+    def _grow(self):
+        """Double capacity, keeping existing slots in place."""
+        old = self._columns()
+        capacity = self.capacity
+        self._allocate_columns(2 * capacity)
+        for name, value in old.items():
+            getattr(self, name)[:capacity] = value
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+    
+    def allocate(self, track_id: int) -> int:
+        """
+        Take a free slot for a new track.
+        
+        Returns:
+            Slot index, reset to an empty track
+        """
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        
+        self.length[slot] = 0
+        self.track_id[slot] = track_id
+        self.active[slot] = True
+        self.has_bbox[slot] = False
+        self.class_id[slot] = -1
+        self.confidence[slot] = 0.0
+        self.velocity[slot] = 0.0
+        self.hits[slot] = 0
+        self.disappeared[slot] = 0
+        self.speed[slot] = 0.0
+        self.valid[slot] = False
+        self.interpolated[slot] = False
+        self.kf_slot[slot] = -1
+        self.path_length[slot] = 0.0
+        return slot
+    
+    def release(self, slot: int):
+        """Return a slot to the free list."""
+        self.active[slot] = False
+        self.track_id[slot] = -1
+        self._free.append(slot)
+    
+    def active_slots(self) -> np.ndarray:
+        """Slots of live tracks, in track id (registration) order."""
+        slots = np.flatnonzero(self.active)
+        return slots[np.argsort(self.track_id[slots], kind="stable")]
+    
+    def append(self, slots: np.ndarray, positions: np.ndarray, timestamp: float):
+        """
+        Write one measured sample to each slot's ring.
+        
+        Args:
+            slots: Slot indices, shape (M,)
+            positions: Centroids, shape (M, 2)
+            timestamp: Sample time (shared by all slots)
+        """
+        length = self.length[slots]
+        heads = length % self.history
+        
+        # Step from the previous sample (the first sample has none)
+        steps = np.zeros(len(slots))
+        moved = length > 0
+        steps[moved] = self._steps(slots[moved], length[moved] - 1, positions[moved])
+        
+        self.positions[slots, heads] = positions
+        self.timestamps[slots, heads] = timestamp
+        self.steps[slots, heads] = steps
+        self.length[slots] += 1
+        self._sum_path(slots)
+    
+    def _steps(self, slots: np.ndarray, samples: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """
+        Distance from a stored sample of each slot to a position.
+        
+        Computed as sqrt of the integer squared distance, the same
+        value SpeedCalculator.calculate_speed gets for one step.
+        
+        Args:
+            slots: Slot indices, shape (M,)
+            samples: Sample number per slot (not yet wrapped to the ring)
+            positions: Positions to measure to, shape (M, 2)
+        """
+        delta = positions.astype(np.int64) - self.positions[slots, samples % self.history]
+        return np.sqrt((delta * delta).sum(axis=1))
+    
+    def _sum_path(self, slots: np.ndarray):
+        """
+        Set path_length of some slots from their step rings.
+        
+        The steps inside the window are added oldest first, one
+        column at a time, which is the order calculate_speed adds them
+        in, so both get bit-identical sums.
+        
+        This re-sums path_window - 1 steps per append (one vector add
+        each, across all slots) instead of keeping a running sum that
+        adds the newest step and subtracts the oldest. Such a sum
+        drifts from a fresh one by floating-point rounding, and even a
+        last-bit difference can flip the MIN_DISTANCE_THRESHOLD check,
+        an overspeed comparison or the 0.05 km/h rounding of a speed
+        that calculate_speed would report. Steps themselves are never
+        recomputed, so reads stay O(1) and appends are O(window).
+        """
+        length = self.length[slots]
+        total = np.zeros(len(slots))
+        for back in range(self.path_window - 1, 0, -1):
+            sample = length - back
+            total += np.where(sample >= 1, self.steps[slots, sample % self.history], 0.0)
+        self.path_length[slots] = total
+    
+    def _fill_steps(self, slots: np.ndarray):
+        """Recompute the step rings of some slots from their positions."""
+        positions, _, mask = self.windows(slots, self.history)
+        delta = np.diff(positions.astype(np.int64), axis=1)
+        steps = np.sqrt((delta * delta).sum(axis=2))
+        
+        # Column j is the step into sample length - history + 1 + j,
+        # known when the sample before it is still in the ring
+        samples = self.length[slots, None] - self.history + 1 + np.arange(self.history - 1)
+        known = mask[:, :-1]
+        rows = np.broadcast_to(slots[:, None], samples.shape)
+        self.steps[rows[known], samples[known] % self.history] = steps[known]
+    
+    def last_positions(self, slots: np.ndarray) -> np.ndarray:
+        """Most recent measured centroid per slot, shape (M, 2)."""
+        return self.positions[slots, (self.length[slots] - 1) % self.history]
+    
+    def last_timestamps(self, slots: np.ndarray) -> np.ndarray:
+        """Time of the most recent measurement per slot, shape (M,)."""
+        return self.timestamps[slots, (self.length[slots] - 1) % self.history]
+    
+    def export(self, slots: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Copy the rows of some slots out of every column.
+        
+        Slot bookkeeping (active flag, Kalman row) is left out, since
+        it only means something inside this store.
+        
+        Returns:
+            Dict of column name -> rows, in the order of slots
+        """
+        return {
+            name: column[slots]
+            for name, column in self._columns().items()
+            if name not in ("active", "kf_slot")
+        }
+    
+    def load(self, rows: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Allocate a slot per exported row and fill it (see export).
+        
+        Args:
+            rows: Columns as returned by export
+        
+        Returns:
+            The new slots, in row order
+        
+        Raises:
+            ValueError: If the rows were exported with another history length
+        """
+        if rows["positions"].shape[1:] != (self.history, 2):
+            raise ValueError(
+                f"History length {rows['positions'].shape[1]} does not match {self.history}"
+            )
+        
+        slots = np.array([self.allocate(int(track_id)) for track_id in rows["track_id"]], dtype=np.intp)
+        for name, column in self._columns().items():
+            if name in rows:
+                column[slots] = rows[name]
+        
+        # Recomputed rather than trusted, so rows exported before these
+        # columns existed (or with another window) load correctly
+        self._fill_steps(slots)
+        self._sum_path(slots)
+        return slots
+    
+    def windows(self, slots: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Last size measured samples of many slots as padded arrays.
+        
+        Samples are right-aligned (newest in the last column); slots
+        with fewer samples are padded at the front with zeros.
+        
+        Args:
+            slots: Slot indices, shape (M,)
+            size: Samples per slot, at most the history length
+        
+        Returns:
+            Tuple of (positions (M, size, 2), timestamps (M, size),
+            mask (M, size)) where mask marks real samples
+        """
+        length = self.length[slots]
+        samples = length[:, None] - size + np.arange(size)
+        mask = samples >= 0
+        index = samples % self.history
+        rows = slots[:, None]
+        
+        positions = np.where(mask[..., None], self.positions[rows, index], 0)
+        timestamps = np.where(mask, self.timestamps[rows, index], 0.0)
+        return positions, timestamps, mask
+    
+    def window(self, slot: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Measured history of one slot, oldest first.
+        
+        Returns:
+            Tuple of (positions (n, 2), timestamps (n,)), n <= history
+        """
+        length = int(self.length[slot])
+        n = min(length, self.history)
+        index = np.arange(length - n, length) % self.history
+        return self.positions[slot, index], self.timestamps[slot, index]
+
+
+@dataclass
+class TrackState:
+    """Detached copy of a track's state (safe to use from other threads)."""
+    id: int
+    centroid: Tuple[int, int]
+    bbox: Optional[Tuple[int, int, int, int]]
+    class_name: str
+    class_id: int
+    confidence: float
+    positions: np.ndarray
+    timestamps: np.ndarray
+    hits: int
+    disappeared: int
+    speed: float
+    is_valid: bool
+    velocity: Tuple[float, float]
+    interpolated: bool
+    first_seen: float
+
+
+class Track:
+    """
+    A tracked object: a live view of one slot in a TrackStore.
+    
+    Reads and writes go straight to the store's columns, so a Track
+    must not be used after its track is deregistered (take a
+    snapshot() to keep its state).
+    """
+    
+    __slots__ = ("id", "slot", "store")
+    
+    def __init__(self, id: int, slot: int, store: TrackStore):
+        self.id = id
+        self.slot = slot
+        self.store = store
+    
+    @property
+    def centroid(self) -> Tuple[int, int]:
+        return tuple(self.store.centroid[self.slot].tolist())
+    
+    @centroid.setter
+    def centroid(self, value: Tuple[int, int]):
+        self.store.centroid[self.slot] = value
+    
+    @property
+    def bbox(self) -> Optional[Tuple[int, int, int, int]]:
+        if not self.store.has_bbox[self.slot]:
+            return None
+        return tuple(self.store.bbox[self.slot].tolist())
+    
+    @bbox.setter
+    def bbox(self, value: Optional[Tuple[int, int, int, int]]):
+        self.store.has_bbox[self.slot] = value is not None
+        if value is not None:
+            self.store.bbox[self.slot] = value
+    
+    @property
+    def class_id(self) -> int:
+        return int(self.store.class_id[self.slot])
+    
+    @property
+    def class_name(self) -> str:
+        return CLASS_NAMES.get(self.class_id, "vehicle")
+    
+    @property
+    def confidence(self) -> float:
+        return float(self.store.confidence[self.slot])
+    
+    @property
+    def positions(self) -> np.ndarray:
+        """Measured centroids, oldest first, shape (n, 2)."""
+        return self.store.window(self.slot)[0]
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Measurement times, oldest first, shape (n,)."""
+        return self.store.window(self.slot)[1]
+    
+    @property
+    def hits(self) -> int:
+        return int(self.store.hits[self.slot])
+    
+    @property
+    def disappeared(self) -> int:
+        return int(self.store.disappeared[self.slot])
+    
+    @property
+    def speed(self) -> float:
+        return float(self.store.speed[self.slot])
+    
+    @speed.setter
+    def speed(self, value: float):
+        self.store.speed[self.slot] = value
+    
+    @property
+    def is_valid(self) -> bool:
+        return bool(self.store.valid[self.slot])
+    
+    @property
+    def velocity(self) -> Tuple[float, float]:
+        """Velocity in pixels per second."""
+        return tuple(self.store.velocity[self.slot].tolist())
+    
+    @property
+    def interpolated(self) -> bool:
+        """Whether centroid/bbox were predicted rather than measured."""
+        return bool(self.store.interpolated[self.slot])
+    
+    @property
+    def first_seen(self) -> float:
+        """Timestamp of the track's first detection."""
+        return float(self.store.first_seen[self.slot])
+    
+    @property
+    def path_length(self) -> float:
+        """Distance (pixels) over the last path_window measured positions."""
+        return float(self.store.path_length[self.slot])
+    
+    @property
+    def kf_slot(self) -> int:
+        """Row in the tracker's Kalman filter bank (-1 without one)."""
+        return int(self.store.kf_slot[self.slot])
+    
+    def snapshot(self) -> TrackState:
+        """Copy the track's current state out of the store."""
+        positions, timestamps = self.store.window(self.slot)
+        return TrackState(
+            id=self.id,
+            centroid=self.centroid,
+            bbox=self.bbox,
+            class_name=self.class_name,
+            class_id=self.class_id,
+            confidence=self.confidence,
+            positions=positions,
+            timestamps=timestamps,
+            hits=self.hits,
+            disappeared=self.disappeared,
+            speed=self.speed,
+            is_valid=self.is_valid,
+            velocity=self.velocity,
+            interpolated=self.interpolated,
+            first_seen=self.first_seen
+        )
+    
+    def __repr__(self) -> str:
+        return f"Track(id={self.id}, centroid={self.centroid}, hits={self.hits}, valid={self.is_valid})"
@@ -6,30 +6,30 @@ Centroid-based multi-object tracking with optional Kalman filter.
 
 import numpy as np
 from collections import OrderedDict
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, field
-from scipy.spatial import distance as dist
+from typing import Callable, Dict, List, Tuple, Optional, Union
 
 # Import settings
 import sys
 sys.path.append('..')
-from config.settings import MAX_DISAPPEARED, MAX_DISTANCE, MIN_HITS
+from config.settings import (
+    MAX_DISAPPEARED, MAX_DISTANCE, MIN_HITS, ASSOCIATION_METHOD, KALMAN_FILTER,
+    KALMAN_GATE_SIGMAS, GRID_GATING_MIN_TRACKS, ASSOCIATION_COST, ASSOCIATION_COST_GATES,
+    ASSOCIATION_FALLBACK_DIAGONALS
+)
 
+from src.detections import DetectionBatch, CLASS_IDS
+from src.association import ASSIGNMENT_METHODS, COST_FUNCTIONS, PAIR_COST_FUNCTIONS, SparseCost
+from src.kalman import ConstantVelocityKalman
+from src.spatial_index import pairs_within
+from src.track_store import Track, TrackState, TrackStore
 
-@dataclass
-class Track:
-    """Represents a tracked object."""
-    id: int
-    centroid: Tuple[int, int]
-    bbox: Optional[Tuple[int, int, int, int]] = None
-    class_name: str = "vehicle"
-    confidence: float = 0.0
-    positions: List[Tuple[int, int]] = field(default_factory=list)
-    timestamps: List[float] = field(default_factory=list)
-    hits: int = 0
-    disappeared: int = 0
-    speed: float = 0.0
-    is_valid: bool = False
+# Track lifecycle events (see CentroidTracker.subscribe)
+TRACK_CREATED = "created"      # registered from an unmatched detection
+TRACK_CONFIRMED = "confirmed"  # reached min_hits (became valid)
+TRACK_UPDATED = "updated"      # matched a detection this frame
+TRACK_LOST = "lost"            # first frame without a matching detection
+TRACK_DELETED = "deleted"      # removed; callbacks get its final TrackState
+TRACK_EVENTS = (TRACK_CREATED, TRACK_CONFIRMED, TRACK_UPDATED, TRACK_LOST, TRACK_DELETED)
 
 
 class CentroidTracker:
@@ -37,19 +37,34 @@ class CentroidTracker:
     Multi-object tracker using centroid-based association.
     
     This tracker maintains object identities across frames by
-    minimizing the distance between centroids.
+    minimizing the distance between centroids. Track state lives in a
+    columnar TrackStore; the Track objects handed out are views of it.
+    
+    Consumers that only care about changes subscribe to lifecycle
+    events instead of scanning every track on every frame.
     
     Attributes:
         max_disappeared: Frames before removing a lost track
         max_distance: Maximum distance for centroid matching
         min_hits: Minimum detections before track is valid
+        assign: Assignment function (see association.py)
+        box_cost: Box-aware cost function, or None for centroid distance
+        pair_cost: Pairwise form of box_cost (None for custom costs,
+            which are evaluated densely)
+        cost_gate: Gate of box_cost, in its units
+        kalman: Kalman filter bank, or None when disabled
+        store: Columnar track state
     """
     
     def __init__(
         self,
         max_disappeared: int = MAX_DISAPPEARED,
         max_distance: int = MAX_DISTANCE,
-        min_hits: int = MIN_HITS
+        min_hits: int = MIN_HITS,
+        association: str = ASSOCIATION_METHOD,
+        kalman: bool = KALMAN_FILTER,
+        cost: Union[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = ASSOCIATION_COST,
+        cost_gate: Optional[float] = None
     ):
         """
         Initialize the tracker.
@@ -58,13 +73,87 @@ class CentroidTracker:
             max_disappeared: Max frames to keep lost tracks
             max_distance: Max centroid distance for matching
             min_hits: Min detections before track is valid
+            association: "greedy" or "hungarian" (optimal)
+            kalman: Track with a constant-velocity Kalman filter
+            cost: "centroid", a name from association.COST_FUNCTIONS,
+                or a function of (track_boxes, boxes) returning costs
+            cost_gate: Gate for a box-aware cost (defaults to
+                ASSOCIATION_COST_GATES for named costs)
         """
+        if association not in ASSIGNMENT_METHODS:
+            raise ValueError(
+                f"Unknown association method '{association}'. "
+                f"Choose from: {', '.join(ASSIGNMENT_METHODS)}"
+            )
+        
         self.max_disappeared = max_disappeared
         self.max_distance = max_distance
         self.min_hits = min_hits
+        self.assign = ASSIGNMENT_METHODS[association]
+        
+        self.pair_cost = None
+        if cost == "centroid":
+            self.box_cost = None
+        elif callable(cost):
+            if cost_gate is None:
+                raise ValueError("cost_gate is required for a custom cost function")
+            self.box_cost = cost
+        elif cost in COST_FUNCTIONS:
+            self.box_cost = COST_FUNCTIONS[cost]
+            self.pair_cost = PAIR_COST_FUNCTIONS[cost]
+            if cost_gate is None:
+                cost_gate = ASSOCIATION_COST_GATES[cost]
+        else:
+            raise ValueError(
+                f"Unknown association cost '{cost}'. "
+                f"Choose from: centroid, {', '.join(COST_FUNCTIONS)}"
+            )
+        self.cost_gate = cost_gate
+        self.kalman = ConstantVelocityKalman() if kalman else None
         
         self.next_id = 0
+        self.store = TrackStore()
         self.tracks: Dict[int, Track] = OrderedDict()
+        
+        # Frames predicted since the last measured update
+        self._predicted_frames = 0
+        
+        # Timestamp of the latest update or prediction
+        self.clock = 0.0
+        
+        # Confirmed tracks, maintained from lifecycle transitions
+        self._valid_tracks: Dict[int, Track] = OrderedDict()
+        self._subscribers: Dict[str, List[Callable]] = {event: [] for event in TRACK_EVENTS}
+    
+    def subscribe(self, event: str, callback: Callable[[Union[Track, TrackState]], None]):
+        """
+        Call a function on every occurrence of a lifecycle event.
+        
+        Callbacks run synchronously inside update()/deregister() with
+        the affected Track (a TrackState for "deleted"). Events of one
+        kind within a frame arrive in track id order.
+        
+        Args:
+            event: One of TRACK_EVENTS
+            callback: Function taking the track
+        """
+        if event not in self._subscribers:
+            raise ValueError(
+                f"Unknown track event '{event}'. "
+                f"Choose from: {', '.join(TRACK_EVENTS)}"
+            )
+        self._subscribers[event].append(callback)
+    
+    def _emit(self, event: str, slots: np.ndarray):
+        """Notify subscribers of an event for each slot."""
+        callbacks = self._subscribers[event]
+        if not callbacks:
+            return
+        
+        for slot in slots:
+            track = self.tracks[int(self.store.track_id[slot])]
+            for callback in callbacks:
+                callback(track)
     
     def register(
         self,
@@ -72,7 +161,8 @@ class CentroidTracker:
         bbox: Optional[Tuple[int, int, int, int]] = None,
         class_name: str = "vehicle",
         confidence: float = 0.0,
-        timestamp: float = 0.0
+        timestamp: float = 0.0,
+        class_id: Optional[int] = None
     ) -> int:
         """
         Register a new track.
@@ -83,39 +173,71 @@ class CentroidTracker:
             class_name: Vehicle type
             confidence: Detection confidence
             timestamp: Frame timestamp
-            
+            class_id: Class id (overrides class_name)
+        
         Returns:
             New track ID
         """
-        track = Track(
-            id=self.next_id,
-            centroid=centroid,
-            bbox=bbox,
-            class_name=class_name,
-            confidence=confidence,
-            positions=[centroid],
-            timestamps=[timestamp],
-            hits=1
-        )
+        store = self.store
+        slot = store.allocate(self.next_id)
+        
+        store.centroid[slot] = centroid
+        store.has_bbox[slot] = bbox is not None
+        if bbox is not None:
+            store.bbox[slot] = bbox
+        store.class_id[slot] = CLASS_IDS.get(class_name, -1) if class_id is None else class_id
+        store.confidence[slot] = confidence
+        store.hits[slot] = 1
+        store.first_seen[slot] = timestamp
+        store.append(np.array([slot]), np.array([centroid]), timestamp)
+        
+        if self.kalman is not None:
+            store.kf_slot[slot] = self.kalman.create(centroid, timestamp)
+        
+        track = Track(self.next_id, slot, store)
         self.tracks[self.next_id] = track
         self.next_id += 1
+        
+        self._emit(TRACK_CREATED, [slot])
         return track.id
     
-    def deregister(self, track_id: int) -> Optional[Track]:
+    def deregister(self, track_id: int) -> Optional[TrackState]:
         """
         Remove a track.
         
         Args:
             track_id: ID of track to remove
-            
+        
         Returns:
-            The removed Track object, or None
+            The removed track's final state, or None
         """
-        return self.tracks.pop(track_id, None)
+        track = self.tracks.pop(track_id, None)
+        if track is None:
+            return None
+        
+        self._valid_tracks.pop(track_id, None)
+        state = track.snapshot()
+        if track.kf_slot >= 0:
+            self.kalman.release(track.kf_slot)
+        self.store.release(track.slot)
+        
+        for callback in self._subscribers[TRACK_DELETED]:
+            callback(state)
+        return state
+    
+    def _mark_missed(self, slots: np.ndarray, missed: int):
+        """Count missed frames and drop tracks that have been gone too long."""
+        store = self.store
+        lost = slots[store.disappeared[slots] == 0]
+        store.disappeared[slots] += missed
+        self._emit(TRACK_LOST, lost)
+        
+        for slot in slots[store.disappeared[slots] > self.max_disappeared]:
+            self.deregister(int(store.track_id[slot]))
     
     def update(
         self,
-        centroids: np.ndarray,
+        detections: Union[DetectionBatch, np.ndarray],
         bboxes: Optional[List[Tuple[int, int, int, int]]] = None,
         class_names: Optional[List[str]] = None,
         confidences: Optional[List[float]] = None,
@@ -124,118 +246,517 @@ class CentroidTracker:
         """
         Update tracks with new detections.
         
+        Detections are associated in two passes: regular detections
+        first, then the batch's low-confidence tier (if any) against
+        the tracks still unmatched. Low-confidence detections extend
+        existing tracks but never start new ones.
+        
         Args:
-            centroids: Numpy array of shape (N, 2)
+            detections: DetectionBatch, or a numpy array of shape (N, 2)
+                with centroids (older callers; the optional lists below
+                then describe the same detections)
             bboxes: Optional list of bounding boxes
             class_names: Optional list of class names
             confidences: Optional list of confidences
             timestamp: Current frame timestamp
-            
+        
         Returns:
             Dictionary of active tracks
         """
+        if not isinstance(detections, DetectionBatch):
+            detections = DetectionBatch.from_lists(
+                detections, bboxes, class_names, confidences
+            )
+        
+        # Frames that were only predicted count towards disappearance too
+        missed = 1 + self._predicted_frames
+        self._predicted_frames = 0
+        self.clock = timestamp
+        
+        store = self.store
+        centroids = detections.centers
+        low = detections.low if detections.low is not None and len(detections.low) else None
+        slots = store.active_slots()
+        
         # Handle empty detections
-        if len(centroids) == 0:
-            for track_id in list(self.tracks.keys()):
-                self.tracks[track_id].disappeared += 1
-                if self.tracks[track_id].disappeared > self.max_disappeared:
-                    self.deregister(track_id)
+        if len(centroids) == 0 and low is None:
+            self._mark_missed(slots, missed)
             return self.tracks
         
-        # Initialize optional lists
-        if bboxes is None:
-            bboxes = [None] * len(centroids)
-        if class_names is None:
-            class_names = ["vehicle"] * len(centroids)
-        if confidences is None:
-            confidences = [0.0] * len(centroids)
-        
         # Register all if no existing tracks
-        if len(self.tracks) == 0:
-            for i, centroid in enumerate(centroids):
-                self.register(
-                    tuple(centroid),
-                    bboxes[i],
-                    class_names[i],
-                    confidences[i],
-                    timestamp
-                )
+        if len(slots) == 0:
+            for col in range(len(centroids)):
+                self._register_detection(detections, col, timestamp)
             return self.tracks
         
         # Match existing tracks with new detections
-        track_ids = list(self.tracks.keys())
-        track_centroids = np.array([
-            self.tracks[tid].centroid for tid in track_ids
-        ])
+        if self.kalman is not None:
+            # Associate against where each track should be by now
+            kf_slots = store.kf_slot[slots]
+            track_centroids = self.kalman.predict(kf_slots, timestamp)
+        else:
+            track_centroids = store.centroid[slots]
         
-        # Compute distances
-        D = dist.cdist(track_centroids, centroids)
+        if self.kalman is not None:
+            # Widen the gate for uncertain tracks by shrinking their
+            # distances; confident tracks keep max_distance
+            radius = self.kalman.gate_radius(kf_slots, KALMAN_GATE_SIGMAS)
+        else:
+            radius = np.full(len(slots), float(self.max_distance))
         
-        # Find minimum distance assignments
-        rows = D.min(axis=1).argsort()
-        cols = D.argmin(axis=1)[rows]
+        track_boxes = None
+        if self.box_cost is not None and store.has_bbox[slots].all():
+            # Boxes moved to the positions the tracks are matched at
+            shift = np.rint(track_centroids).astype(np.int32) - store.centroid[slots]
+            track_boxes = store.bbox[slots] + np.tile(shift, 2)
         
-        used_rows = set()
-        used_cols = set()
+        was_valid = store.valid[slots]
         
-        for row, col in zip(rows, cols):
-            if row in used_rows or col in used_cols:
-                continue
-            
-            if D[row, col] > self.max_distance:
-                continue
-            
-            track_id = track_ids[row]
-            centroid = tuple(centroids[col])
-            
-            # Update track
-            track = self.tracks[track_id]
-            track.centroid = centroid
-            track.bbox = bboxes[col]
-            track.class_name = class_names[col]
-            track.confidence = confidences[col]
-            track.positions.append(centroid)
-            track.timestamps.append(timestamp)
-            track.hits += 1
-            track.disappeared = 0
-            track.is_valid = track.hits >= self.min_hits
-            
-            # Keep only recent positions (for speed calculation)
-            if len(track.positions) > 30:
-                track.positions = track.positions[-30:]
-                track.timestamps = track.timestamps[-30:]
+        # Match within the gate
+        rows, cols = self._associate(track_centroids, track_boxes, detections, radius)
+        
+        self._update_tracks(slots[rows], detections, cols, timestamp)
+        
+        used_rows = np.zeros(len(slots), dtype=bool)
+        used_rows[rows] = True
+        
+        # Second pass: low-confidence detections for the tracks left over
+        if low is not None:
+            rest = np.flatnonzero(~used_rows)
+            low_rows, low_cols = self._associate(
+                track_centroids[rest],
+                None if track_boxes is None else track_boxes[rest],
+                low,
+                radius[rest]
+            )
             
-            used_rows.add(row)
-            used_cols.add(col)
+            self._update_tracks(slots[rest[low_rows]], low, low_cols, timestamp)
+            used_rows[rest[low_rows]] = True
+        
+        # Lifecycle events for matched tracks, in track id order
+        confirmed = slots[used_rows & store.valid[slots] & ~was_valid]
+        for slot in confirmed:
+            track_id = int(store.track_id[slot])
+            self._valid_tracks[track_id] = self.tracks[track_id]
+        self._emit(TRACK_CONFIRMED, confirmed)
+        self._emit(TRACK_UPDATED, slots[used_rows])
         
         # Handle unmatched tracks (disappeared)
-        for row in range(len(track_ids)):
-            if row not in used_rows:
-                track_id = track_ids[row]
-                self.tracks[track_id].disappeared += 1
-                if self.tracks[track_id].disappeared > self.max_disappeared:
-                    self.deregister(track_id)
+        self._mark_missed(slots[~used_rows], missed)
         
         # Register new detections
-        for col in range(len(centroids)):
-            if col not in used_cols:
-                self.register(
-                    tuple(centroids[col]),
-                    bboxes[col],
-                    class_names[col],
-                    confidences[col],
-                    timestamp
-                )
+        used_cols = np.zeros(len(centroids), dtype=bool)
+        used_cols[cols] = True
+        for col in np.flatnonzero(~used_cols):
+            self._register_detection(detections, col, timestamp)
+        
+        return self.tracks
+    
+    def _associate(
+        self,
+        track_centroids: np.ndarray,
+        track_boxes: Optional[np.ndarray],
+        detections: DetectionBatch,
+        radius: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Match detections to tracks within the gate.
+        
+        Uses the box-aware cost when one is configured and both sides
+        have boxes (see _associate_boxes), and centroid distance
+        otherwise.
+        
+        Args:
+            track_centroids: Track positions, shape (T, 2)
+            track_boxes: Track boxes at those positions, shape (T, 4), or None
+            detections: Detections to match
+            radius: Per-track gate radius in pixels, shape (T,)
+        
+        Returns:
+            Tuple of (rows, cols) of matched (track, detection) pairs
+        """
+        centroids = detections.centers
+        if len(track_centroids) == 0 or len(centroids) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        
+        if track_boxes is not None and detections.boxes is not None:
+            return self._associate_boxes(track_centroids, track_boxes, detections, radius)
+        
+        if len(track_centroids) >= GRID_GATING_MIN_TRACKS:
+            D = self._grid_cost(track_centroids, centroids, radius)
+        else:
+            D = self._dense_cost(track_centroids, centroids, radius)
+        
+        return self.assign(D, self.max_distance)
+    
+    def _associate_boxes(
+        self,
+        track_centroids: np.ndarray,
+        track_boxes: np.ndarray,
+        detections: DetectionBatch,
+        radius: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Match by box cost among the pairs inside the centroid gate.
+        
+        Candidate pairs come from the centroid gate (through the spatial
+        grid in crowded scenes), widened to the longer side of each
+        track's box so large vehicles keep the reach their box gives
+        them. Box costs are computed for those pairs only. Tracks and
+        detections the box gate leaves unmatched (e.g. boxes that no
+        longer overlap after a detection stride) are then matched by
+        centroid distance within a few box diagonals of the track,
+        capped at max_distance, so small far-field boxes keep a
+        correspondingly small gate.
+        
+        Args:
+            track_centroids: Track positions, shape (T, 2)
+            track_boxes: Track boxes at those positions, shape (T, 4)
+            detections: Detections to match (with boxes)
+            radius: Per-track gate radius in pixels, shape (T,)
+        
+        Returns:
+            Tuple of (rows, cols) of matched (track, detection) pairs
+        """
+        boxes = detections.boxes
+        shape = (len(track_centroids), len(boxes))
+        
+        sizes = track_boxes[:, 2:] - track_boxes[:, :2]
+        reach = np.maximum(np.maximum(radius, self.max_distance), sizes.max(axis=1))
+        rows, cols, distances = self._candidate_pairs(track_centroids, detections.centers, reach)
+        
+        if self.pair_cost is not None:
+            costs = self.pair_cost(track_boxes[rows], boxes[cols])
+        else:
+            costs = self.box_cost(track_boxes, boxes)[rows, cols]
+        matched_rows, matched_cols = self.assign(SparseCost(rows, cols, costs, shape), self.cost_gate)
+        
+        # Centroid fallback for the tracks and detections left over,
+        # gated by box size (and widened for Kalman tracks as in
+        # _dense_cost); costs are distances in units of the gate
+        used_rows = np.zeros(shape[0], dtype=bool)
+        used_rows[matched_rows] = True
+        used_cols = np.zeros(shape[1], dtype=bool)
+        used_cols[matched_cols] = True
+        free = ~used_rows[rows] & ~used_cols[cols]
+        
+        rows, cols, distances = rows[free], cols[free], distances[free]
+        diagonals = np.sqrt((sizes.astype(np.float64) ** 2).sum(axis=1))
+        gate = np.minimum(ASSOCIATION_FALLBACK_DIAGONALS * diagonals, self.max_distance)
+        if self.kalman is not None:
+            gate = gate * (np.maximum(radius, self.max_distance) / self.max_distance)
+        fallback_rows, fallback_cols = self.assign(
+            SparseCost(rows, cols, distances / np.maximum(gate[rows], 1.0), shape), 1.0
+        )
+        
+        return (
+            np.concatenate([matched_rows, fallback_rows]).astype(np.intp),
+            np.concatenate([matched_cols, fallback_cols]).astype(np.intp)
+        )
+    
+    def _candidate_pairs(
+        self,
+        track_centroids: np.ndarray,
+        centroids: np.ndarray,
+        reach: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Track/detection pairs whose centroids are within a track's reach.
+        
+        Args:
+            track_centroids: Track positions, shape (T, 2)
+            centroids: Detection centroids, shape (N, 2)
+            reach: Per-track search radius in pixels, at least
+                max_distance, shape (T,)
+        
+        Returns:
+            Tuple of (rows, cols, distances) arrays, one entry per pair
+        """
+        track_centroids = np.asarray(track_centroids, dtype=np.float64)
+        centroids = centroids.astype(np.float64)
+        
+        if len(track_centroids) >= GRID_GATING_MIN_TRACKS:
+            # Tracks reaching max_distance share one grid query
+            narrow = reach <= self.max_distance
+            rows, cols, distances = pairs_within(track_centroids[narrow], centroids, self.max_distance)
+            rows = np.flatnonzero(narrow)[rows]
+            wide = np.flatnonzero(~narrow)
+        else:
+            rows = cols = np.empty(0, dtype=np.intp)
+            distances = np.empty(0)
+            wide = np.arange(len(track_centroids))
+        
+        # Large vehicles (or every track in small scenes) against all
+        # detections
+        if len(wide):
+            delta = track_centroids[wide, None, :] - centroids[None, :, :]
+            D = np.sqrt((delta ** 2).sum(axis=2))
+            wide_rows, wide_cols = np.nonzero(D <= reach[wide, None])
+            rows = np.concatenate([rows, wide[wide_rows]])
+            cols = np.concatenate([cols, wide_cols])
+            distances = np.concatenate([distances, D[wide_rows, wide_cols]])
+        
+        return rows, cols, distances
+    
+    def _dense_cost(
+        self,
+        track_centroids: np.ndarray,
+        centroids: np.ndarray,
+        radius: np.ndarray
+    ) -> np.ndarray:
+        """
+        Full track x detection distance matrix, scaled by gate radius.
+        
+        Args:
+            track_centroids: Track positions, shape (T, 2)
+            centroids: Detection centroids, shape (N, 2)
+            radius: Per-track gate radius in pixels, shape (T,)
+        
+        Returns:
+            Cost matrix of shape (T, N)
+        """
+        # Plain NumPy; keeps scipy off the import path
+        delta = track_centroids[:, None, :] - centroids[None, :, :].astype(np.float64)
+        D = np.sqrt((delta ** 2).sum(axis=2))
+        
+        if self.kalman is not None:
+            D = D * (self.max_distance / np.maximum(radius, self.max_distance))[:, None]
+        return D
+    
+    def _grid_cost(
+        self,
+        track_centroids: np.ndarray,
+        centroids: np.ndarray,
+        radius: np.ndarray
+    ) -> SparseCost:
+        """
+        Costs of the pairs inside the gate, found with a spatial grid.
+        
+        Same costs as _dense_cost for every pair that passes the gate,
+        without evaluating the pairs that cannot.
+        
+        Args:
+            track_centroids: Track positions, shape (T, 2)
+            centroids: Detection centroids, shape (N, 2)
+            radius: Per-track gate radius in pixels, shape (T,)
+        
+        Returns:
+            SparseCost of shape (T, N)
+        """
+        track_centroids = np.asarray(track_centroids, dtype=np.float64)
+        centroids = centroids.astype(np.float64)
+        
+        # Tracks gated at max_distance share one grid query
+        narrow = radius <= self.max_distance
+        rows, cols, costs = pairs_within(track_centroids[narrow], centroids, self.max_distance)
+        rows = np.flatnonzero(narrow)[rows]
+        
+        # Uncertain (newly seen) tracks have wider gates; they are few,
+        # so compare them against every detection
+        wide = np.flatnonzero(~narrow)
+        if len(wide):
+            D = self._dense_cost(track_centroids[wide], centroids, radius[wide])
+            wide_rows, wide_cols = np.nonzero(D <= self.max_distance)
+            rows = np.concatenate([rows, wide[wide_rows]])
+            cols = np.concatenate([cols, wide_cols])
+            costs = np.concatenate([costs, D[wide_rows, wide_cols]])
+        
+        return SparseCost(rows, cols, costs, (len(track_centroids), len(centroids)))
+    
+    def _register_detection(
+        self,
+        detections: DetectionBatch,
+        col: int,
+        timestamp: float
+    ) -> int:
+        """Register a new track from row col of a detection batch."""
+        bbox = None if detections.boxes is None else tuple(detections.boxes[col].tolist())
+        return self.register(
+            tuple(detections.centers[col].tolist()),
+            bbox,
+            confidence=float(detections.confidences[col]),
+            timestamp=timestamp,
+            class_id=int(detections.class_ids[col])
+        )
+    
+    def _update_tracks(
+        self,
+        slots: np.ndarray,
+        detections: DetectionBatch,
+        cols: np.ndarray,
+        timestamp: float
+    ):
+        """Write matched detections into their tracks' slots (vectorized)."""
+        if len(slots) == 0:
+            return
+        
+        store = self.store
+        centers = detections.centers[cols]
+        
+        if self.kalman is not None:
+            kf_slots = store.kf_slot[slots]
+            self.kalman.update(kf_slots, centers)
+            store.velocity[slots] = self.kalman.velocities(kf_slots)
+        else:
+            dt = timestamp - store.last_timestamps(slots)
+            moving = dt > 0
+            delta = centers - store.last_positions(slots)
+            store.velocity[slots[moving]] = delta[moving] / dt[moving, None]
+        
+        store.centroid[slots] = centers
+        store.interpolated[slots] = False
+        if detections.boxes is not None:
+            store.bbox[slots] = detections.boxes[cols]
+            store.has_bbox[slots] = True
+        store.class_id[slots] = detections.class_ids[cols]
+        store.confidence[slots] = detections.confidences[cols]
+        
+        # Ring write: the oldest sample beyond the history is overwritten
+        store.append(slots, centers, timestamp)
+        store.hits[slots] += 1
+        store.disappeared[slots] = 0
+        store.valid[slots] = store.hits[slots] >= self.min_hits
+    
+    def predict(self, timestamp: float) -> Dict[int, Track]:
+        """
+        Advance tracks to a frame that was not run through the detector.
+        
+        Each track's centroid and bbox are moved along its estimated
+        velocity from the last measured sample (or by the Kalman filter
+        when enabled). Predicted positions are marked as interpolated
+        and are NOT added to the position history, so speed is always
+        computed from measured samples.
+        
+        Args:
+            timestamp: Current frame timestamp
+        
+        Returns:
+            Dictionary of active tracks
+        """
+        self._predicted_frames += 1
+        self.clock = timestamp
+        
+        store = self.store
+        slots = store.active_slots()
+        if len(slots) == 0:
+            return self.tracks
+        
+        if self.kalman is not None:
+            predicted = self.kalman.predict(store.kf_slot[slots], timestamp)
+        else:
+            dt = timestamp - store.last_timestamps(slots)
+            predicted = store.last_positions(slots) + store.velocity[slots] * dt[:, None]
+        predicted = np.rint(predicted).astype(np.int32)
+        
+        # Move boxes with their centroids
+        shift = predicted - store.centroid[slots]
+        store.bbox[slots] += np.tile(shift, 2)
+        
+        store.centroid[slots] = predicted
+        store.interpolated[slots] = True
         
         return self.tracks
     
     def get_valid_tracks(self) -> Dict[int, Track]:
-        """Get only valid (confirmed) tracks."""
-        return {
-            tid: track 
-            for tid, track in self.tracks.items() 
-            if track.is_valid
-        }
+        """
+        Get only valid (confirmed) tracks.
+        
+        The dict is kept up to date by the tracker (in confirmation
+        order) and must not be modified by callers.
+        """
+        return self._valid_tracks
+    
+    def checkpoint_state(self) -> Dict[str, np.ndarray]:
+        """
+        Live tracks, Kalman states and the id counter as plain arrays.
+        
+        Returns:
+            Dict of name -> array, suitable for np.savez (see restore_state)
+        """
+        slots = self.store.active_slots()
+        state = self.store.export(slots)
+        state["next_id"] = np.array(self.next_id)
+        state["clock"] = np.array(self.clock)
+        
+        if self.kalman is not None:
+            kf_slots = self.store.kf_slot[slots]
+            state["kf_x"] = self.kalman.x[kf_slots]
+            state["kf_P"] = self.kalman.P[kf_slots]
+            state["kf_t"] = self.kalman.t[kf_slots]
+        
+        return state
+    
+    def restore_state(
+        self,
+        state: Dict[str, np.ndarray],
+        time_shift: float = 0.0,
+        missed_frames: int = 0
+    ) -> int:
+        """
+        Replace all tracks with ones saved by checkpoint_state.
+        
+        Track ids continue after the saved ones, so ids are never
+        reused across a restart.
+        
+        Args:
+            state: Arrays from checkpoint_state
+            time_shift: Seconds added to every saved timestamp, to move
+                tracks onto the current frame timeline
+            missed_frames: Frames that went by unobserved; they count
+                towards disappearance like missed detections
+        
+        Returns:
+            Number of tracks still alive after aging
+        """
+        for track_id in list(self.tracks):
+            self.deregister(track_id)
+        
+        store = self.store
+        slots = store.load(state)
+        store.timestamps[slots] += time_shift
+        store.first_seen[slots] += time_shift
+        
+        self.next_id = max(self.next_id, int(state["next_id"]))
+        self.clock = float(state["clock"]) + time_shift
+        self._predicted_frames = 0
+        
+        for slot in slots:
+            track_id = int(store.track_id[slot])
+            self.tracks[track_id] = Track(track_id, slot, store)
+            if store.valid[slot]:
+                self._valid_tracks[track_id] = self.tracks[track_id]
+        
+        if self.kalman is not None:
+            for i, slot in enumerate(slots):
+                kf_slot = self.kalman.create(store.centroid[slot], self.clock)
+                store.kf_slot[slot] = kf_slot
+                if "kf_x" in state:
+                    self.kalman.x[kf_slot] = state["kf_x"][i]
+                    self.kalman.P[kf_slot] = state["kf_P"][i]
+                    self.kalman.t[kf_slot] = state["kf_t"][i] + time_shift
+                else:
+                    self.kalman.x[kf_slot, 2:] = store.velocity[slot]
+        
+        return self.age(missed_frames)
+    
+    def age(self, missed_frames: int) -> int:
+        """
+        Count frames that went by unobserved against every track.
+        
+        Args:
+            missed_frames: Frames without detections
+        
+        Returns:
+            Number of tracks still alive
+        """
+        if missed_frames > 0:
+            self._mark_missed(self.store.active_slots(), missed_frames)
+        return len(self.tracks)
+    
+    def clear(self):
+        """Delete every track (emitting "deleted" for each), e.g. on shutdown."""
+        for track_id in list(self.tracks):
+            self.deregister(track_id)
 
 
 # Convenience function for testing
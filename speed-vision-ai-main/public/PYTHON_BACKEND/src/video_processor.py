@@ -8,13 +8,20 @@ import cv2
 import numpy as np
 import os
 import csv
+import time
+import threading
+import zipfile
 from datetime import datetime
-from typing import Optional, Generator, Dict, Any
+from typing import Optional, Generator, Dict, Any, List, Tuple, Callable
 from pathlib import Path
 
-from .detector import VehicleDetector, Detection
-from .tracker import CentroidTracker, Track
+from .detector import VehicleDetector
+from .detections import DetectionBatch
+from .tracker import CentroidTracker, Track, TrackState, TRACK_DELETED
 from .speed_calculator import SpeedCalculator, SpeedResult
+from .motion_gate import MotionGate
+from .capture import FrameReader, is_live_source
+from .pipeline import Pipeline, Stage
 
 # Import settings
 import sys
@@ -23,10 +30,83 @@ from config.settings import (
     SPEED_LIMIT, LOG_DIR, SAVE_SNAPSHOTS,
     COLOR_NORMAL, COLOR_OVERSPEED, COLOR_WARNING, COLOR_TEXT,
     FONT, FONT_SCALE, FONT_THICKNESS, BOX_THICKNESS,
-    FPS, DETECTION_ZONE_START, DETECTION_ZONE_END
+    FPS, DETECTION_ZONE_START, DETECTION_ZONE_END,
+    BATCH_SIZE, BATCH_MAX_WAIT, DETECTOR_BACKEND, LOW_CONFIDENCE_THRESHOLD,
+    ADAPTIVE_STRIDE, MAX_DETECTION_STRIDE, STRIDE_MAX_SHIFT,
+    STRIDE_TRACKS_PER_STEP, MAX_DISTANCE, MOTION_GATE,
+    THREADED_CAPTURE, CAPTURE_POLICY, PIPELINED, PIPELINE_QUEUE_SIZE,
+    PIPELINE_DETECT_WORKERS, PIPELINE_RENDER_WORKERS, CHECKPOINT_DIR, CHECKPOINT_INTERVAL
 )
 
 
+class AdaptiveStride:
+    """
+    Chooses how many frames to advance between detector runs.
+    
+    The stride k shrinks when there are many tracks, when tracks move
+    fast enough that prediction between keyframes could leave the
+    association gate, or while tracks are still unconfirmed. It grows
+    when the detector is slower than the frame interval, since running
+    it more often than it can keep up with only adds lag.
+    """
+    
+    def __init__(
+        self,
+        max_stride: int = MAX_DETECTION_STRIDE,
+        max_shift: float = STRIDE_MAX_SHIFT * MAX_DISTANCE,
+        tracks_per_step: int = STRIDE_TRACKS_PER_STEP
+    ):
+        """
+        Initialize the stride controller.
+        
+        Args:
+            max_stride: Largest allowed stride
+            max_shift: Max pixels a track may be predicted ahead
+            tracks_per_step: Live tracks per one-step stride reduction
+        """
+        self.max_stride = max_stride
+        self.max_shift = max_shift
+        self.tracks_per_step = tracks_per_step
+        
+        # Smoothed detector latency in seconds
+        self.latency = 0.0
+    
+    def record_latency(self, seconds: float):
+        """Record how long a detector call took."""
+        if self.latency == 0.0:
+            self.latency = seconds
+        else:
+            self.latency = 0.8 * self.latency + 0.2 * seconds
+    
+    def next_stride(self, tracks: Dict[int, Track], fps: float) -> int:
+        """
+        Get the number of frames until the next detector run.
+        
+        Args:
+            tracks: Currently active tracks
+            fps: Video frame rate
+        
+        Returns:
+            Stride k >= 1 (1 means detect on the next frame)
+        """
+        stride = self.max_stride - len(tracks) // self.tracks_per_step
+        
+        if tracks:
+            # Keep the predicted shift of the fastest track within the gate
+            fastest = max(np.hypot(*track.velocity) for track in tracks.values()) / fps
+            if fastest > 0:
+                stride = min(stride, int(self.max_shift // fastest))
+            
+            # New tracks have no velocity yet; confirm them quickly
+            if any(not track.is_valid for track in tracks.values()):
+                stride = min(stride, 2)
+        
+        # A detector slower than the frame interval cannot run every frame
+        stride = max(stride, int(np.ceil(self.latency * fps)))
+        
+        return int(np.clip(stride, 1, self.max_stride))
+
+
 class VideoProcessor:
     """
     Main video processing pipeline.
@@ -39,7 +119,20 @@ class VideoProcessor:
         self,
         source: str = "0",
         speed_limit: float = SPEED_LIMIT,
-        show_preview: bool = True
+        show_preview: bool = True,
+        batch_size: int = BATCH_SIZE,
+        batch_max_wait: float = BATCH_MAX_WAIT,
+        backend: str = DETECTOR_BACKEND,
+        low_confidence: Optional[float] = LOW_CONFIDENCE_THRESHOLD,
+        adaptive_stride: bool = ADAPTIVE_STRIDE,
+        motion_gate: bool = MOTION_GATE,
+        threaded_capture: bool = THREADED_CAPTURE,
+        capture_policy: str = CAPTURE_POLICY,
+        pipelined: bool = PIPELINED,
+        detector: Optional[VehicleDetector] = None,
+        camera_id: Optional[str] = None,
+        checkpoint_dir: Optional[str] = CHECKPOINT_DIR,
+        log_dir: str = LOG_DIR
     ):
         """
         Initialize the video processor.
@@ -48,27 +141,112 @@ class VideoProcessor:
             source: Video file path or camera index (as string)
             speed_limit: Speed limit in km/h
             show_preview: Whether to show live preview window
+            batch_size: Max frames per detector call (1 disables batching)
+            batch_max_wait: Max seconds to wait for a batch to fill
+            backend: Detector inference backend ("ultralytics" or "onnx")
+            low_confidence: Threshold of the detector's low-confidence
+                tier, which only extends existing tracks (None disables it)
+            adaptive_stride: Run the detector every k frames and predict
+                track positions in between
+            motion_gate: Skip inference on frames with no motion while
+                no vehicles are being tracked
+            threaded_capture: Decode frames ahead in a background thread
+            capture_policy: "block", "drop_oldest" or "auto" (block for
+                files, drop_oldest for live sources)
+            pipelined: Run detect, track/speed, render and logging as
+                concurrent stages (replaces micro-batching; turns off
+                adaptive stride and motion gate)
+            detector: Detector to use instead of loading a new one
+                (lets several cameras share one model)
+            camera_id: Camera name, used to keep logs of several
+                cameras apart
+            checkpoint_dir: Directory for tracker checkpoints (None
+                disables them; see save_checkpoint)
+            log_dir: Directory for the speed log CSV and snapshots
         """
         self.source = source
         self.speed_limit = speed_limit
         self.show_preview = show_preview
+        self.batch_size = max(1, int(batch_size))
+        self.batch_max_wait = batch_max_wait
+        self.camera_id = camera_id
+        
+        # Initialize video capture (first: its frame size sets the
+        # detector's warm-up shape)
+        self._init_video_capture()
         
         # Initialize components
-        self.detector = VehicleDetector()
+        if detector is None:
+            detector = VehicleDetector(
+                backend=backend,
+                low_confidence=low_confidence,
+                warmup_shape=(self.frame_height, self.frame_width) if self.frame_width else None
+            )
+        self.detector = detector
         self.tracker = CentroidTracker()
         self.speed_calc = SpeedCalculator(speed_limit=speed_limit)
         
-        # Initialize video capture
-        self._init_video_capture()
+        # Pipelined detection runs up to a few queues ahead of tracking,
+        # so keyframe and motion decisions would see stale tracks
+        if pipelined and (adaptive_stride or motion_gate):
+            print("⚠️ Adaptive stride and motion gate are not supported with --pipelined; disabled")
+            adaptive_stride = motion_gate = False
+        
+        # Detection stride (keyframe scheduling)
+        self.stride = AdaptiveStride() if adaptive_stride else None
+        self._frames_to_detection = 0
+        self.detector_runs = 0
+        self.detector_time = 0.0
+        
+        # Detect workers of the pipeline share the detector counters
+        self._stats_lock = threading.Lock()
+        
+        # Motion gate in front of the detector
+        self.motion_gate = MotionGate(zone=self.detector.zone) if motion_gate else None
+        
+        # Background decoding (started by run())
+        if capture_policy == "auto":
+            capture_policy = "drop_oldest" if is_live_source(source) else "block"
+        self.capture_policy = capture_policy
+        self.threaded_capture = threaded_capture
+        self.reader: Optional[FrameReader] = None
+        
+        # Stage pipeline (built by run())
+        self.pipelined = pipelined
+        self.pipeline: Optional[Pipeline] = None
         
         # Setup logging
-        self._setup_logging()
+        self._setup_logging(log_dir)
         
         # Stats
         self.frame_count = 0
         self.total_vehicles = 0
         self.overspeed_count = 0
         self.is_running = False
+        
+        # Live tracks already counted and logged (pruned on deletion)
+        self._logged_tracks = set()
+        
+        # Speeds are re-measured for the tracks matched each frame, in
+        # one batch; vehicle records follow the tracker's deleted events
+        self.speeds: Dict[int, float] = {}
+        self._new_records: List[Tuple[Track, float]] = []
+        self._record_callbacks: List[Callable[[Dict[str, Any]], None]] = []
+        self.finalized_count = 0
+        self.tracker.subscribe(TRACK_DELETED, self._on_track_deleted)
+        
+        # Records finalized while restoring a checkpoint, held for
+        # subscribers that attach before the first frame
+        self._restored_records: List[Dict[str, Any]] = []
+        
+        # Warm restart from the last checkpoint, if any
+        self.checkpoint_file: Optional[Path] = None
+        if checkpoint_dir:
+            name = f"tracker_{self.camera_id}.npz" if self.camera_id else "tracker.npz"
+            self.checkpoint_file = Path(checkpoint_dir) / name
+            self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+            self.restore_checkpoint()
+        self._last_checkpoint = time.monotonic()
     
     def _init_video_capture(self):
         """Initialize video capture."""
@@ -85,11 +263,15 @@ class VideoProcessor:
         self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.fps = self.cap.get(cv2.CAP_PROP_FPS) or FPS
         
-        print(f"✓ Video source: {self.frame_width}x{self.frame_height} @ {self.fps:.1f} fps")
+        print(f"✓ Video source{self._label()}: {self.frame_width}x{self.frame_height} @ {self.fps:.1f} fps")
+    
+    def _label(self) -> str:
+        """Camera suffix for console output ("" for a single camera)."""
+        return f" [{self.camera_id}]" if self.camera_id else ""
     
-    def _setup_logging(self):
+    def _setup_logging(self, log_dir: str):
         """Setup logging directories and files."""
-        self.log_dir = Path(LOG_DIR)
+        self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
         
         self.snapshots_dir = self.log_dir / "snapshots"
@@ -97,7 +279,10 @@ class VideoProcessor:
         
         # Create daily log file
         date_str = datetime.now().strftime("%Y-%m-%d")
-        self.log_file = self.log_dir / f"speed_log_{date_str}.csv"
+        if self.camera_id:
+            self.log_file = self.log_dir / f"speed_log_{self.camera_id}_{date_str}.csv"
+        else:
+            self.log_file = self.log_dir / f"speed_log_{date_str}.csv"
         
         # Write header if new file
         if not self.log_file.exists():
@@ -140,7 +325,8 @@ class VideoProcessor:
     def _save_snapshot(self, frame: np.ndarray, track: Track, speed: float):
         """Save a snapshot of an overspeed vehicle."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"overspeed_{track.id}_{timestamp}_{int(speed)}kmh.jpg"
+        prefix = f"overspeed_{self.camera_id}" if self.camera_id else "overspeed"
+        filename = f"{prefix}_{track.id}_{timestamp}_{int(speed)}kmh.jpg"
         filepath = self.snapshots_dir / filename
         
         # Crop to bounding box with some padding
@@ -164,12 +350,17 @@ class VideoProcessor:
         overlay = frame.copy()
         
         # Draw detection zone
-        zone_top = int(self.frame_height * DETECTION_ZONE_START)
-        zone_bottom = int(self.frame_height * DETECTION_ZONE_END)
-        cv2.line(overlay, (0, zone_top), (self.frame_width, zone_top), 
-                 COLOR_WARNING, 1, cv2.LINE_AA)
-        cv2.line(overlay, (0, zone_bottom), (self.frame_width, zone_bottom),
-                 COLOR_WARNING, 1, cv2.LINE_AA)
+        zone = self.detector.zone
+        zone_points = zone.points(frame.shape) if zone is not None else None
+        if zone_points is not None:
+            cv2.polylines(overlay, [zone_points], True, COLOR_WARNING, 1, cv2.LINE_AA)
+        else:
+            zone_top = int(self.frame_height * DETECTION_ZONE_START)
+            zone_bottom = int(self.frame_height * DETECTION_ZONE_END)
+            cv2.line(overlay, (0, zone_top), (self.frame_width, zone_top), 
+                     COLOR_WARNING, 1, cv2.LINE_AA)
+            cv2.line(overlay, (0, zone_bottom), (self.frame_width, zone_bottom),
+                     COLOR_WARNING, 1, cv2.LINE_AA)
         
         # Draw each tracked vehicle
         for track_id, track in tracks.items():
@@ -268,53 +459,273 @@ class VideoProcessor:
             FONT, 0.5, COLOR_TEXT, 1, cv2.LINE_AA
         )
     
-    def process_frame(self, frame: np.ndarray) -> tuple:
+    def _gate_detection(self, frame: np.ndarray) -> Tuple[bool, Optional[DetectionBatch]]:
         """
-        Process a single frame.
+        Decide whether a frame needs the detector.
+        
+        Args:
+            frame: BGR image as numpy array
         
         Returns:
-            Tuple of (annotated_frame, detections_data)
+            Tuple of (run_detector, detections). When the detector is
+            skipped, detections is an empty batch for static scenes or
+            None between keyframes (the tracker predicts positions).
         """
-        self.frame_count += 1
-        timestamp = self.frame_count / self.fps
+        if self._frames_to_detection > 0:
+            # Between keyframes: predict positions instead of detecting
+            self._frames_to_detection -= 1
+            return False, None
+        
+        if self.motion_gate is not None and not self.motion_gate.should_detect(
+            frame, has_tracks=len(self.tracker.tracks) > 0
+        ):
+            # Empty, static scene: nothing for the detector to find
+            return False, DetectionBatch.empty()
+        
+        return True, None
+    
+    def _record_detection(self, elapsed: float):
+        """Account for one frame's share of detector time."""
+        with self._stats_lock:
+            self.detector_runs += 1
+            self.detector_time += elapsed
+            if self.stride is not None:
+                self.stride.record_latency(elapsed)
+    
+    def _detect_step(self, frame: np.ndarray) -> Optional[DetectionBatch]:
+        """
+        Run the detector on a frame, unless stride or motion gate skip it.
+        
+        Args:
+            frame: BGR image as numpy array
         
-        # Detect vehicles
+        Returns:
+            Detections, or None for frames between detector keyframes
+        """
+        run_detector, detections = self._gate_detection(frame)
+        if not run_detector:
+            return detections
+        
+        start = time.perf_counter()
         detections = self.detector.detect(frame)
+        self._record_detection(time.perf_counter() - start)
+        
+        return detections
+    
+    def save_checkpoint(self):
+        """
+        Write tracker state, logged vehicles and counters to the
+        checkpoint file.
+        
+        The file is written next to the old one and swapped in with an
+        atomic rename, so a crash mid-write never leaves a torn file.
+        """
+        state = self.tracker.checkpoint_state()
+        state["logged_tracks"] = np.fromiter(self._logged_tracks, dtype=np.int64)
+        state["counters"] = np.array([self.total_vehicles, self.overspeed_count])
+        state["speed_ids"] = np.fromiter(self.speeds.keys(), dtype=np.int64)
+        state["speed_values"] = np.fromiter(self.speeds.values(), dtype=np.float64)
+        state["saved_at"] = np.array(time.time())
+        state["source"] = np.array(self.source)
+        
+        temp_file = self.checkpoint_file.with_suffix(".tmp")
+        with open(temp_file, "wb") as f:
+            np.savez(f, **state)
+        os.replace(temp_file, self.checkpoint_file)
+    
+    def restore_checkpoint(self) -> bool:
+        """
+        Restore state saved by save_checkpoint.
+        
+        Saved tracks are moved onto the new frame timeline (which
+        starts near zero) and aged by the time the process was down,
+        so vehicles that left meanwhile are finalized and dropped.
+        Their records are passed to record subscribers that attach
+        before the first frame is processed.
+        
+        A checkpoint saved for another source (e.g. another video, or
+        cameras given in a different order) is ignored.
+        
+        Returns:
+            True if a checkpoint was restored
+        """
+        if self.checkpoint_file is None or not self.checkpoint_file.exists():
+            return False
+        
+        try:
+            with np.load(self.checkpoint_file) as data:
+                state = {name: data[name] for name in data.files}
+            
+            saved_source = str(state["source"])
+            if saved_source != self.source:
+                print(f"⚠️ Ignoring checkpoint {self.checkpoint_file}: saved for source {saved_source}")
+                return False
+            
+            gap = max(0.0, time.time() - float(state["saved_at"]))
+            logged_tracks = set(state["logged_tracks"].tolist())
+            total_vehicles, overspeed_count = (int(v) for v in state["counters"])
+            speeds = dict(zip(state["speed_ids"].tolist(), state["speed_values"].tolist()))
+            
+            # Tracks first: if they cannot be loaded, nothing else is kept
+            self.tracker.restore_state(state, time_shift=-(float(state["clock"]) + gap))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            print(f"⚠️ Ignoring checkpoint {self.checkpoint_file}: {e}")
+            return False
+        
+        self._logged_tracks = logged_tracks
+        self.total_vehicles, self.overspeed_count = total_vehicles, overspeed_count
+        self.speeds = speeds
+        
+        # Age the tracks by the downtime; vehicles that left meanwhile
+        # are finalized against the restored logged ids
+        restored: List[Dict[str, Any]] = []
+        collect = restored.append
+        self._record_callbacks.append(collect)
+        try:
+            alive = self.tracker.age(int(gap * self.fps))
+        finally:
+            self._record_callbacks.remove(collect)
+        
+        self._restored_records = restored
+        print(f"✓ Restored checkpoint{self._label()}: {alive} tracks, "
+              f"next id {self.tracker.next_id}, {gap:.1f}s old")
+        return True
+    
+    def subscribe_records(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Receive a finalized record for every counted vehicle.
         
-        # Prepare data for tracker
-        centroids = self.detector.get_centroids(detections)
-        bboxes = [d.bbox for d in detections]
-        class_names = [d.class_name for d in detections]
-        confidences = [d.confidence for d in detections]
+        The record is produced exactly once per vehicle, when its track
+        is deleted (left the scene, or the processor stopped with
+        checkpoints disabled). Records of vehicles that left while the
+        processor was down are delivered on subscription, if it happens
+        before the first frame.
         
-        # Update tracker
-        tracks = self.tracker.update(
-            centroids, bboxes, class_names, confidences, timestamp
+        Args:
+            callback: Function taking the record dict
+        """
+        self._record_callbacks.append(callback)
+        for record in self._restored_records:
+            callback(record)
+    
+    def _update_speeds(self, timestamp: float):
+        """
+        Re-measure the speeds of the confirmed tracks matched at timestamp.
+        
+        All of them go through SpeedCalculator.calculate_speeds at once;
+        only vehicles counted for the first time are visited one by one.
+        """
+        store = self.tracker.store
+        slots = store.active_slots()
+        slots = slots[store.valid[slots] & (store.last_timestamps(slots) == timestamp)]
+        if len(slots) == 0:
+            return
+        
+        batch = self.speed_calc.calculate_speeds(
+            store, slots, from_velocity=self.tracker.kalman is not None
         )
+        ids = store.track_id[slots]
         
-        # Calculate speeds
-        speeds = {}
-        new_vehicles = set()
+        for track_id in ids[~batch.valid].tolist():
+            self.speeds.pop(track_id, None)
         
-        for track_id, track in tracks.items():
-            if track.is_valid:
-                result = self.speed_calc.calculate_speed(
-                    track.positions, track.timestamps
-                )
-                if result:
-                    speeds[track_id] = result.speed_kmh
-                    track.speed = result.speed_kmh
-                    
-                    # Log new detections
-                    if track_id not in self._logged_tracks:
-                        self._logged_tracks.add(track_id)
-                        self.total_vehicles += 1
-                        if result.is_overspeed:
-                            self.overspeed_count += 1
-                        self._log_detection(track, result.speed_kmh, frame)
+        measured = slots[batch.valid]
+        speeds = batch.speed_kmh[batch.valid]
+        store.speed[measured] = speeds
+        self.speeds.update(zip(ids[batch.valid].tolist(), speeds.tolist()))
+        
+        # Log new detections
+        for track_id, speed, is_overspeed in zip(
+            ids[batch.valid].tolist(), speeds.tolist(), batch.is_overspeed[batch.valid].tolist()
+        ):
+            if track_id in self._logged_tracks:
+                continue
+            self._logged_tracks.add(track_id)
+            self.total_vehicles += 1
+            if is_overspeed:
+                self.overspeed_count += 1
+            self._new_records.append((self.tracker.tracks[track_id], speed))
+    
+    def _on_track_deleted(self, state: TrackState):
+        """Finalize the record of a counted vehicle whose track ended."""
+        self.speeds.pop(state.id, None)
+        if state.id not in self._logged_tracks:
+            return
         
+        record = {
+            "id": state.id,
+            "vehicle_id": state.id,
+            "camera_id": self.camera_id,
+            "vehicle_type": state.class_name,
+            "speed": round(state.speed, 1),
+            "speed_limit": self.speed_limit,
+            "is_overspeed": state.speed > self.speed_limit,
+            "confidence": round(state.confidence, 2),
+            "first_seen": state.first_seen,
+            "last_seen": float(state.timestamps[-1]),
+            "timestamp": datetime.now().isoformat()
+        }
+        self.finalized_count += 1
+        for callback in self._record_callbacks:
+            callback(record)
+        
+        # Ids are never reused, so the entry is not needed any more; this
+        # keeps the set as small as the number of live tracks
+        self._logged_tracks.discard(state.id)
+    
+    def _track_step(
+        self,
+        detections: Optional[DetectionBatch],
+        timestamp: float
+    ) -> Tuple[Dict[int, Track], Dict[int, float], List[Tuple[Track, float]]]:
+        """
+        Update tracks and speeds for one frame.
+        
+        Args:
+            detections: Detections for the frame, or None to predict
+            timestamp: Frame time in seconds
+        
+        Returns:
+            Tuple of (tracks, speeds, new_records) where new_records
+            lists the (track, speed) pairs measured for the first time
+        """
+        self._new_records = []
+        self._restored_records = []
+        
+        if detections is None:
+            tracks = self.tracker.predict(timestamp)
+        else:
+            # Update tracker (detections stay columnar end to end)
+            tracks = self.tracker.update(detections, timestamp=timestamp)
+            self._update_speeds(timestamp)
+            
+            if self.stride is not None:
+                self._frames_to_detection = self.stride.next_stride(tracks, self.fps) - 1
+        
+        if self.checkpoint_file is not None and time.monotonic() - self._last_checkpoint >= CHECKPOINT_INTERVAL:
+            self.save_checkpoint()
+            self._last_checkpoint = time.monotonic()
+        
+        return tracks, dict(self.speeds), self._new_records
+    
+    def _render_step(
+        self,
+        frame: np.ndarray,
+        tracks: Dict[int, Track],
+        speeds: Dict[int, float],
+        draw: bool = True
+    ) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """
+        Draw overlays and build the API detection data for one frame.
+        
+        Args:
+            draw: Draw overlays; without it the frame is returned as is
+        
+        Returns:
+            Tuple of (annotated_frame, detections_data)
+        """
         # Draw overlays
-        annotated = self._draw_overlay(frame, tracks, speeds)
+        annotated = self._draw_overlay(frame, tracks, speeds) if draw else frame
         
         # Prepare detection data for API
         detections_data = []
@@ -336,45 +747,318 @@ class VideoProcessor:
         
         return annotated, detections_data
     
+    def process_frame(
+        self,
+        frame: np.ndarray,
+        detections: Optional[DetectionBatch] = None,
+        timestamp: Optional[float] = None
+    ) -> tuple:
+        """
+        Process a single frame.
+        
+        Args:
+            frame: BGR image as numpy array
+            detections: Precomputed detections for this frame (e.g. from
+                a batched detector call). Detection runs here if omitted.
+            timestamp: Frame time in seconds. Defaults to the processed
+                frame count over fps; pass it when frames may have been
+                dropped before processing.
+        
+        Returns:
+            Tuple of (annotated_frame, detections_data)
+        """
+        if detections is None:
+            detections = self._detect_step(frame)
+        
+        return self._complete_frame(frame, detections, timestamp)
+    
+    def _complete_frame(
+        self,
+        frame: np.ndarray,
+        detections: Optional[DetectionBatch],
+        timestamp: Optional[float],
+        draw: bool = True
+    ) -> tuple:
+        """
+        Track, log and draw a frame whose detection step is done.
+        
+        Args:
+            frame: BGR image as numpy array
+            detections: Detections, or None to predict track positions
+            timestamp: Frame time in seconds (see process_frame)
+            draw: Draw overlays (headless workers skip it)
+        
+        Returns:
+            Tuple of (annotated_frame, detections_data)
+        """
+        self.frame_count += 1
+        if timestamp is None:
+            timestamp = self.frame_count / self.fps
+        
+        tracks, speeds, new_records = self._track_step(detections, timestamp)
+        
+        for track, speed in new_records:
+            self._log_detection(track, speed, frame)
+        
+        return self._render_step(frame, tracks, speeds, draw)
+    
+    def process_batch(
+        self,
+        frames: List[np.ndarray],
+        timestamps: Optional[List[Optional[float]]] = None
+    ) -> List[tuple]:
+        """
+        Process a micro-batch of consecutive frames.
+        
+        Every frame first goes through the stride and motion gate; the
+        frames that still need the detector are detected in one batch,
+        then tracking and speed calculation run frame by frame in order.
+        Gate decisions for the whole batch are made before any of it is
+        tracked, so they see tracks up to batch_size frames old (a
+        stride keyframe is never skipped, only detected early).
+        
+        Args:
+            frames: Consecutive BGR frames
+            timestamps: Optional frame times (see process_frame)
+        
+        Returns:
+            List of (annotated_frame, detections_data) tuples
+        """
+        if timestamps is None:
+            timestamps = [None] * len(frames)
+        
+        plans = [self._gate_detection(frame) for frame in frames]
+        batch = [frame for frame, (run_detector, _) in zip(frames, plans) if run_detector]
+        
+        batch_detections = []
+        elapsed = 0.0
+        if batch:
+            start = time.perf_counter()
+            batch_detections = self.detector.detect_batch(batch)
+            elapsed = time.perf_counter() - start
+        
+        results = []
+        batch_index = 0
+        for frame, (run_detector, detections), timestamp in zip(frames, plans, timestamps):
+            if run_detector:
+                detections = batch_detections[batch_index]
+                batch_index += 1
+                self._record_detection(elapsed / len(batch))
+            
+            results.append(self._complete_frame(frame, detections, timestamp))
+        return results
+    
+    def _read_frame(
+        self,
+        timeout: Optional[float] = None
+    ) -> Tuple[bool, Optional[np.ndarray], Optional[float]]:
+        """
+        Read the next frame, from the reader thread if one is running.
+        
+        Args:
+            timeout: Max seconds to wait (reader thread only)
+        
+        Returns:
+            Tuple of (ok, frame, timestamp). The timestamp comes from the
+            frame's position in the source, so it stays correct when the
+            reader drops frames; it is None for synchronous reads.
+        """
+        if self.reader is None:
+            ret, frame = self.cap.read()
+            return ret, frame, None
+        
+        ret, frame, sequence = self.reader.read(timeout)
+        return ret, frame, (sequence + 1) / self.fps if ret else None
+    
+    def _read_batch(self) -> Tuple[List[np.ndarray], List[Optional[float]]]:
+        """
+        Read up to batch_size frames from the capture.
+        
+        Stops early once batch_max_wait has elapsed since the first
+        frame arrived, so live sources never stall waiting for a full
+        batch. Returns empty lists when the source is exhausted.
+        
+        Returns:
+            Tuple of (frames, timestamps)
+        """
+        frames = []
+        timestamps = []
+        deadline = None
+        
+        while len(frames) < self.batch_size:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ret, frame, timestamp = self._read_frame(timeout)
+            if not ret:
+                break
+            frames.append(frame)
+            timestamps.append(timestamp)
+            
+            if deadline is None:
+                deadline = time.monotonic() + self.batch_max_wait
+            elif time.monotonic() >= deadline:
+                break
+        
+        return frames, timestamps
+    
+    def _show_preview(self, annotated: np.ndarray) -> bool:
+        """Show a frame in the preview window. Returns False on quit."""
+        cv2.imshow(f"SpeedWatch Pro{self._label()}", annotated)
+        
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            return False
+        elif key == ord('s'):
+            cv2.imwrite(f"snapshot_{self.frame_count}.jpg", annotated)
+            print(f"Saved snapshot_{self.frame_count}.jpg")
+        
+        return True
+    
+    def _next_frame(self) -> Optional[Tuple[np.ndarray, Optional[float]]]:
+        """Pipeline source: the next (frame, timestamp), None once stopped."""
+        while self.is_running:
+            ret, frame, timestamp = self._read_frame()
+            if ret:
+                return frame, timestamp
+            # Loop video for demo
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return None
+    
+    def _pipeline_detect(self, item: tuple) -> tuple:
+        """Pipeline stage: detect."""
+        frame, timestamp = item
+        return frame, timestamp, self._detect_step(frame)
+    
+    def _pipeline_track(self, item: tuple) -> tuple:
+        """Pipeline stage: track and measure speed (strictly in order)."""
+        frame, timestamp, detections = item
+        
+        self.frame_count += 1
+        if timestamp is None:
+            timestamp = self.frame_count / self.fps
+        
+        tracks, speeds, new_records = self._track_step(detections, timestamp)
+        
+        # Later stages run concurrently with the next tracker update, so
+        # hand them copies of the tracks they draw and log
+        tracks = {
+            track_id: track.snapshot()
+            for track_id, track in tracks.items()
+            if track.is_valid and track.bbox
+        }
+        new_records = [(track.snapshot(), speed) for track, speed in new_records]
+        
+        return frame, tracks, speeds, new_records
+    
+    def _pipeline_render(self, item: tuple) -> tuple:
+        """Pipeline stage: draw overlays."""
+        frame, tracks, speeds, new_records = item
+        annotated, detections_data = self._render_step(frame, tracks, speeds)
+        return annotated, detections_data, frame, new_records
+    
+    def _pipeline_sink(self, item: tuple) -> tuple:
+        """Pipeline stage: write the speed log and snapshots."""
+        annotated, detections_data, frame, new_records = item
+        for track, speed in new_records:
+            self._log_detection(track, speed, frame)
+        return annotated, detections_data
+    
+    def _detect_workers(self) -> int:
+        """
+        Detector threads for the pipeline.
+        
+        Backends that are not thread-safe (ultralytics) get a single
+        worker whatever PIPELINE_DETECT_WORKERS says.
+        """
+        backend = getattr(self.detector, "backend", None)
+        if PIPELINE_DETECT_WORKERS > 1 and not getattr(backend, "thread_safe", False):
+            return 1
+        return max(1, PIPELINE_DETECT_WORKERS)
+    
+    def _build_pipeline(self) -> Pipeline:
+        """Build the capture -> detect -> track -> render -> sink pipeline."""
+        return Pipeline(
+            self._next_frame,
+            [
+                Stage("detect", self._pipeline_detect, workers=self._detect_workers()),
+                Stage("track", self._pipeline_track, ordered=True),
+                Stage("render", self._pipeline_render, workers=PIPELINE_RENDER_WORKERS),
+                Stage("sink", self._pipeline_sink, ordered=True),
+            ],
+            queue_size=PIPELINE_QUEUE_SIZE
+        )
+    
+    def _run_pipelined(self) -> Generator[tuple, None, None]:
+        """Yield frames from the stage pipeline in input order."""
+        self.pipeline = self._build_pipeline().start()
+        try:
+            for annotated, detections in self.pipeline.results():
+                yield annotated, detections
+                
+                if self.show_preview and not self._show_preview(annotated):
+                    self.is_running = False
+                    break
+        finally:
+            self.pipeline.stop()
+    
     def run(self) -> Generator[tuple, None, None]:
         """
         Run the video processing loop.
         
+        With pipelined=True the stages run concurrently in background
+        threads; frames are still yielded in capture order.
+        
         Yields:
             Tuple of (frame, detections_data) for each processed frame
         """
         self.is_running = True
-        self._logged_tracks = set()
         
         print("\n" + "=" * 50)
         print("SpeedWatch Pro - Running")
         print("=" * 50)
         print(f"Speed Limit: {self.speed_limit} km/h")
         print(f"Preview: {'Enabled' if self.show_preview else 'Disabled'}")
+        if self.threaded_capture:
+            print(f"Capture: threaded ({self.capture_policy})")
+        if self.pipelined:
+            detect_workers = self._detect_workers()
+            print(f"Pipeline: detect x{detect_workers}, render x{PIPELINE_RENDER_WORKERS}")
+            if detect_workers < PIPELINE_DETECT_WORKERS:
+                print("⚠️ Detector backend is not thread-safe; using one detect worker")
+        elif self.batch_size > 1:
+            print(f"Batching: {self.batch_size} frames / {self.batch_max_wait * 1000:.0f} ms")
         print("Press 'q' to quit, 's' to save snapshot")
         print("=" * 50 + "\n")
         
+        if self.threaded_capture:
+            self.reader = FrameReader(self.cap, policy=self.capture_policy).start()
+        
         try:
+            if self.pipelined:
+                yield from self._run_pipelined()
+                return
+            
             while self.is_running:
-                ret, frame = self.cap.read()
-                if not ret:
-                    # Loop video for demo
-                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                    continue
-                
-                annotated, detections = self.process_frame(frame)
-                
-                yield annotated, detections
+                if self.batch_size > 1:
+                    frames, timestamps = self._read_batch()
+                    if not frames:
+                        # Loop video for demo
+                        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        continue
+                    results = self.process_batch(frames, timestamps)
+                else:
+                    ret, frame, timestamp = self._read_frame()
+                    if not ret:
+                        # Loop video for demo
+                        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        continue
+                    results = [self.process_frame(frame, timestamp=timestamp)]
                 
-                if self.show_preview:
-                    cv2.imshow("SpeedWatch Pro", annotated)
+                for annotated, detections in results:
+                    yield annotated, detections
                     
-                    key = cv2.waitKey(1) & 0xFF
-                    if key == ord('q'):
+                    if self.show_preview and not self._show_preview(annotated):
+                        self.is_running = False
                         break
-                    elif key == ord('s'):
-                        cv2.imwrite(f"snapshot_{self.frame_count}.jpg", annotated)
-                        print(f"Saved snapshot_{self.frame_count}.jpg")
         
         finally:
             self.stop()
@@ -382,11 +1066,23 @@ class VideoProcessor:
     def stop(self):
         """Stop processing and cleanup."""
         self.is_running = False
+        if self.reader is not None:
+            self.reader.stop()
+            self.reader = None
         self.cap.release()
-        cv2.destroyAllWindows()
+        if self.show_preview:
+            cv2.destroyAllWindows()
+        
+        if self.checkpoint_file is not None:
+            # Vehicles still in view carry over to the next start and
+            # are finalized when their tracks end there
+            self.save_checkpoint()
+        else:
+            # Vehicles still in view get their final records now
+            self.tracker.clear()
         
         print("\n" + "=" * 50)
-        print("Session Summary")
+        print(f"Session Summary{self._label()}")
         print("=" * 50)
         print(f"Total Frames: {self.frame_count}")
         print(f"Total Vehicles: {self.total_vehicles}")
@@ -396,13 +1092,33 @@ class VideoProcessor:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get current statistics."""
-        return {
+        stats = {
+            "camera_id": self.camera_id,
             "total_vehicles": self.total_vehicles,
             "overspeed_count": self.overspeed_count,
+            "finalized_records": self.finalized_count,
             "frame_count": self.frame_count,
+            "detector_runs": self.detector_runs,
             "speed_limit": self.speed_limit,
             "is_running": self.is_running
         }
+        
+        if self.reader is not None:
+            stats["capture"] = self.reader.get_stats()
+        
+        if self.pipeline is not None:
+            stats["pipeline"] = self.pipeline.get_stats()
+        
+        if self.motion_gate is not None:
+            gate = self.motion_gate.get_stats()
+            # Estimate CPU saved from the average cost of a detector pass
+            with self._stats_lock:
+                detector_time, detector_runs = self.detector_time, self.detector_runs
+            avg_latency = detector_time / detector_runs if detector_runs else 0.0
+            gate["cpu_seconds_saved"] = round(gate["skips"] * avg_latency, 2)
+            stats["motion_gate"] = gate
+        
+        return stats
     
     def update_speed_limit(self, limit: float):
         """Update the speed limit."""
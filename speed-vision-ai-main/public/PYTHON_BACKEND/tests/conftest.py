@@ -0,0 +1,11 @@
+"""
+SpeedWatch Pro - Test Configuration
+===================================
+Puts the backend root on the import path, so tests import modules the
+way main.py does (config.settings, src.tracker, ...).
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
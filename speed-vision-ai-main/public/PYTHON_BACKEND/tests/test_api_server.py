@@ -0,0 +1,90 @@
+"""Tests for the API server while the model loads in the background."""
+
+import threading
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import src.api_server as api_server
+import src.video_processor as video_processor
+from src.startup import StartupProfile
+
+
+class SlowProcessor:
+    """VideoProcessor stand-in whose model takes until `loaded` is set."""
+    
+    started = threading.Event()
+    loaded = threading.Event()
+    error = None
+    
+    def __init__(self, source, show_preview, **kwargs):
+        self.started.set()
+        assert self.loaded.wait(5.0)
+        if self.error is not None:
+            raise self.error
+    
+    def subscribe_records(self, callback):
+        pass
+    
+    def run(self):
+        return iter(())
+
+
+@pytest.fixture
+def client(monkeypatch):
+    SlowProcessor.started = threading.Event()
+    SlowProcessor.loaded = threading.Event()
+    SlowProcessor.error = None
+    monkeypatch.setattr(video_processor, "VideoProcessor", SlowProcessor)
+    monkeypatch.setattr(api_server, "profile", StartupProfile(budget=1.0))
+    for key in ("processor", "model_status", "model_error", "is_running"):
+        monkeypatch.setitem(api_server.state, key, api_server.state[key])
+    
+    # Not a context manager: the startup handlers (location lookup,
+    # demo simulation) stay off
+    return TestClient(api_server.app)
+
+
+def start_loading():
+    thread = threading.Thread(target=api_server.run_processor, args=("camera.mp4", {}), daemon=True)
+    thread.start()
+    assert SlowProcessor.started.wait(5.0)
+    return thread
+
+
+def test_status_reports_loading_until_the_model_is_ready(client):
+    assert client.get("/status").json()["model_status"] == "not_loaded"
+    
+    thread = start_loading()
+    status = client.get("/status").json()
+    
+    assert status["model_status"] == "loading"
+    assert status["model_error"] is None
+    assert api_server.state["processor"] is None
+    
+    SlowProcessor.loaded.set()
+    thread.join(5.0)
+    status = client.get("/status").json()
+    
+    assert status["model_status"] == "ready"
+    assert isinstance(api_server.state["processor"], SlowProcessor)
+    assert "model_ready" in status["startup"]["phases_ms"]
+
+
+def test_status_reports_a_failed_model_load(client):
+    SlowProcessor.error = RuntimeError("model file missing")
+    
+    thread = start_loading()
+    assert client.get("/status").json()["model_status"] == "loading"
+    
+    SlowProcessor.loaded.set()
+    thread.join(5.0)
+    status = client.get("/status").json()
+    
+    assert status["model_status"] == "error"
+    assert status["model_error"] == "model file missing"
+    assert "model_ready" not in status["startup"]["phases_ms"]
@@ -0,0 +1,99 @@
+"""Tests for track/detection assignment."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from src.association import (
+    SparseCost, gated_components, greedy_assignment, optimal_assignment
+)
+
+pytest.importorskip("scipy")
+
+
+def matched_pairs(assignment):
+    rows, cols = assignment
+    return sorted(zip(rows.tolist(), cols.tolist()))
+
+
+def total_cost(cost, pairs):
+    return sum(cost[row, col] for row, col in pairs)
+
+
+def best_assignment(cost, max_cost):
+    """Brute force: most pairs inside the gate, then the lowest total."""
+    n_rows, n_cols = cost.shape
+    best = (0, 0.0)
+    for cols in itertools.permutations(list(range(n_cols)) + [None] * n_rows, n_rows):
+        pairs = [(row, col) for row, col in enumerate(cols) if col is not None and cost[row, col] <= max_cost]
+        key = (len(pairs), -total_cost(cost, pairs))
+        if key > best:
+            best = key
+    return best[0], -best[1]
+
+
+def test_hungarian_matches_more_pairs_than_greedy():
+    # Greedy gives detection 0 to track 0, which was also track 1's only
+    # choice; swapping costs more but matches both
+    cost = np.array([[1.0, 2.0], [2.0, 100.0]])
+    
+    assert matched_pairs(greedy_assignment(cost, 10.0)) == [(0, 0)]
+    assert matched_pairs(optimal_assignment(cost, 10.0)) == [(0, 1), (1, 0)]
+
+
+def test_sparse_cost_gives_same_matches_as_dense():
+    rng = np.random.default_rng(0)
+    cost = rng.uniform(0, 20, size=(12, 15))
+    sparse = SparseCost.from_dense(cost, 8.0)
+    
+    for assign in (greedy_assignment, optimal_assignment):
+        assert matched_pairs(assign(sparse, 8.0)) == matched_pairs(assign(cost, 8.0))
+
+
+def test_gated_components_split_independent_groups():
+    # Tracks 0 and 1 compete for detections 0 and 1; track 3 and
+    # detection 3 only see each other; tracks 2 and 4 see nothing
+    rows = np.array([0, 1, 1, 3])
+    cols = np.array([0, 0, 1, 3])
+    
+    components = sorted(
+        (comp_rows.tolist(), comp_cols.tolist(), sorted(pairs.tolist()))
+        for comp_rows, comp_cols, pairs in gated_components(rows, cols, (5, 5))
+    )
+    
+    assert components == [([0, 1], [0, 1], [0, 1, 2]), ([3], [3], [3])]
+
+
+def test_optimal_assignment_ignores_pairs_outside_the_gate():
+    # Track 2 only reaches detection 2 outside the gate; track 3 and
+    # detection 3 form an isolated pair
+    inf = 1e6
+    cost = np.array([
+        [1.0, 4.0, inf, inf],
+        [2.0, 1.0, inf, inf],
+        [inf, inf, 50.0, inf],
+        [inf, inf, inf, 3.0],
+    ])
+    
+    assert matched_pairs(optimal_assignment(cost, 10.0)) == [(0, 0), (1, 1), (3, 3)]
+    
+    sparse = SparseCost(
+        rows=np.array([0, 0, 1, 1, 2, 3]),
+        cols=np.array([0, 1, 0, 1, 2, 3]),
+        costs=np.array([1.0, 4.0, 2.0, 1.0, 50.0, 3.0]),
+        shape=(4, 4)
+    )
+    assert matched_pairs(optimal_assignment(sparse, 10.0)) == [(0, 0), (1, 1), (3, 3)]
+
+
+def test_optimal_assignment_matches_brute_force():
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        cost = rng.uniform(0, 10, size=(4, 5))
+        pairs = matched_pairs(optimal_assignment(cost, 5.0))
+        
+        assert all(cost[row, col] <= 5.0 for row, col in pairs)
+        count, total = best_assignment(cost, 5.0)
+        assert len(pairs) == count
+        assert total_cost(cost, pairs) == pytest.approx(total)
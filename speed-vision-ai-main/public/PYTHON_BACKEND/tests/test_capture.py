@@ -0,0 +1,85 @@
+"""Tests for the threaded frame reader."""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.capture import FrameReader, is_live_source
+
+
+class StubCapture:
+    """Capture of numbered frames (pixel value = frame index)."""
+    
+    def __init__(self, frames=None):
+        self.frames = frames
+        self.index = 0
+    
+    def read(self):
+        if self.frames is not None and self.index >= self.frames:
+            return False, None
+        frame = np.full((4, 4, 3), self.index % 256, dtype=np.uint8)
+        self.index += 1
+        return True, frame
+    
+    def set(self, prop, value):
+        return False
+
+
+def read_all(reader, delay=0.0):
+    """Read (sequence, pixel) pairs until the end of the stream."""
+    items = []
+    while True:
+        ok, frame, sequence = reader.read(timeout=2.0)
+        if not ok:
+            return items
+        items.append((sequence, int(frame[0, 0, 0])))
+        time.sleep(delay)
+
+
+def test_drop_oldest_keeps_the_newest_frames():
+    reader = FrameReader(StubCapture(20), policy="drop_oldest", queue_size=3, loop=False).start()
+    reader._thread.join(timeout=2.0)
+    
+    # The end-of-stream marker takes the last slot
+    assert read_all(reader) == [(18, 18), (19, 19)]
+    assert reader.frames_decoded == 20
+    assert reader.frames_dropped == 18
+    reader.stop()
+
+
+def test_block_never_drops_a_frame():
+    reader = FrameReader(StubCapture(20), policy="block", queue_size=3, loop=False).start()
+    time.sleep(0.1)
+    
+    # The decoder waits for the consumer instead of running ahead
+    assert reader.frames_decoded <= 3 + 1
+    
+    assert read_all(reader, delay=0.002) == [(i, i) for i in range(20)]
+    assert reader.frames_dropped == 0
+    assert reader.get_stats()["max_queue_depth"] == 3
+    reader.stop()
+
+
+@pytest.mark.parametrize("policy", ["block", "drop_oldest"])
+def test_stop_ends_an_endless_source(policy):
+    reader = FrameReader(StubCapture(), policy=policy, queue_size=3).start()
+    thread = reader._thread
+    assert reader.read(timeout=2.0)[0]
+    
+    start = time.perf_counter()
+    reader.stop()
+    
+    assert time.perf_counter() - start < 1.0
+    assert not thread.is_alive()
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        FrameReader(StubCapture(), policy="drop_newest")
+
+
+def test_live_sources():
+    assert is_live_source("0")
+    assert is_live_source("rtsp://camera/stream")
+    assert not is_live_source("videos/highway.mp4")
@@ -0,0 +1,76 @@
+"""Tests for columnar detections."""
+
+import numpy as np
+import pytest
+
+from src.detections import DetectionBatch, box_iou, box_iou_pairs
+
+
+def make_batch():
+    return DetectionBatch.from_raw(
+        boxes=np.array([[0, 0, 10, 10], [20, 20, 41, 31], [5.7, 5.2, 15.9, 25.1]]),
+        confidences=np.array([0.9, 0.3, 0.6]),
+        class_ids=np.array([2, 7, 3])
+    )
+
+
+def test_from_raw_truncates_boxes_and_centers_them():
+    batch = make_batch()
+    
+    assert batch.boxes.dtype == np.int32
+    assert batch.boxes[2].tolist() == [5, 5, 15, 25]
+    assert batch.centers.tolist() == [[5, 5], [30, 25], [10, 15]]
+    assert len(batch) == 3
+
+
+def test_select_by_mask_and_by_index():
+    batch = make_batch()
+    
+    by_mask = batch.select(np.array([True, False, True]))
+    by_index = batch.select(np.array([2, 0]))
+    
+    assert by_mask.class_ids.tolist() == [2, 3]
+    assert by_mask.centers.tolist() == [[5, 5], [10, 15]]
+    assert by_index.class_ids.tolist() == [3, 2]
+    assert by_index.boxes.tolist() == [[5, 5, 15, 25], [0, 0, 10, 10]]
+
+
+def test_select_without_boxes():
+    batch = DetectionBatch.from_lists(np.array([[1, 2], [3, 4]]), class_names=["car", "bus"])
+    
+    selected = batch.select(np.array([1]))
+    
+    assert selected.boxes is None
+    assert selected.centers.tolist() == [[3, 4]]
+    assert selected.class_ids.tolist() == [5]
+
+
+def test_empty_batch():
+    batch = DetectionBatch.empty()
+    
+    assert len(batch) == 0
+    assert batch.to_list() == []
+
+
+def test_box_iou_matches_pairwise_form():
+    a = np.array([[0, 0, 10, 10], [5, 5, 15, 15]])
+    b = np.array([[0, 0, 10, 10], [10, 10, 20, 20], [5, 0, 15, 10]])
+    
+    matrix = box_iou(a, b)
+    
+    assert matrix.shape == (2, 3)
+    assert matrix[0, 0] == 1.0
+    assert matrix[0, 1] == 0.0
+    for i in range(2):
+        assert box_iou_pairs(np.repeat(a[i:i + 1], 3, axis=0), b).tolist() == matrix[i].tolist()
+
+
+def test_split_tiers_moves_low_confidence_detections_aside():
+    batch = make_batch().split_tiers(0.5)
+    
+    assert len(batch) == 2
+    assert batch.confidences.tolist() == pytest.approx([0.9, 0.6])
+    assert batch.class_ids.tolist() == [2, 3]
+    assert len(batch.low) == 1
+    assert batch.low.class_ids.tolist() == [7]
+    assert batch.low.low is None
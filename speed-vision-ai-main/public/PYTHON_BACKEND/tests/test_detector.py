@@ -0,0 +1,347 @@
+"""Tests for the vehicle detector: ONNX decoding, zones, tiled inference and warm-up."""
+
+import cv2
+import numpy as np
+import pytest
+
+import src.detector as detector
+import src.video_processor as video_processor
+from src.detector import (
+    DetectionZone, DetectorBackend, OnnxBackend, TileGrid, VehicleDetector,
+    letterbox, merge_boxes, points_in_polygon
+)
+
+FRAME_SHAPE = (1080, 1920, 3)
+
+
+class PaintedBackend(DetectorBackend):
+    """Detects every painted rectangle in a crop as a car."""
+    
+    name = "painted"
+    input_size = 320
+    
+    def __init__(self, model_path=None, cache=None):
+        self.cache = cache
+        self.calls = []
+    
+    def infer(self, frames, conf, iou, classes, imgsz=None):
+        self.calls.append((imgsz, [frame.shape[:2] for frame in frames]))
+        
+        outputs = []
+        for frame in frames:
+            count, _, stats, _ = cv2.connectedComponentsWithStats((frame[..., 0] > 0).astype(np.uint8))
+            x, y, w, h = stats[1:, 0], stats[1:, 1], stats[1:, 2], stats[1:, 3]
+            outputs.append((
+                np.column_stack((x, y, x + w, y + h)).astype(np.float32),
+                np.full(count - 1, 0.9, dtype=np.float32),
+                np.full(count - 1, 2, dtype=int)
+            ))
+        return outputs
+
+
+def make_detector(monkeypatch, **kwargs):
+    monkeypatch.setitem(detector.BACKENDS, PaintedBackend.name, PaintedBackend)
+    kwargs = {"tiled": True, "warmup_runs": 0, "cache_dir": None, **kwargs}
+    return VehicleDetector(backend=PaintedBackend.name, **kwargs)
+
+
+def paint(*boxes):
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    for x1, y1, x2, y2 in boxes:
+        frame[y1:y2, x1:x2] = 255
+    return frame
+
+
+def test_letterbox_pads_to_a_square_or_to_the_stride():
+    frame = np.full((720, 1280, 3), 200, dtype=np.uint8)
+    
+    square, scale, pad = letterbox(frame, 640)
+    rect, rect_scale, rect_pad = letterbox(frame, 640, stride=32)
+    
+    assert square.shape == (640, 640, 3) and scale == 0.5 and pad == (0, 140)
+    assert (square[:140] == 114).all() and (square[500:] == 114).all()
+    assert (square[140:500] == 200).all()
+    assert rect.shape == (384, 640, 3) and rect_scale == 0.5 and rect_pad == (0, 12)
+    assert (rect[12:372] == 200).all()
+
+
+class FakeSession:
+    """ONNX Runtime session returning a fixed YOLOv8 output."""
+    
+    def __init__(self, output):
+        self.output = output
+        self.inputs = []
+    
+    def run(self, names, feeds):
+        self.inputs.append(feeds["images"])
+        return [self.output]
+
+
+def yolo_output(anchors, scale=0.5, pad=(0, 12)):
+    """(1, 4 + 80, N) output for frame boxes and {class: score} dicts."""
+    output = np.zeros((1, 84, len(anchors)), dtype=np.float32)
+    for index, ((x1, y1, x2, y2), class_scores) in enumerate(anchors):
+        x1, x2 = x1 * scale + pad[0], x2 * scale + pad[0]
+        y1, y2 = y1 * scale + pad[1], y2 * scale + pad[1]
+        output[0, :4, index] = [(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1]
+        for class_id, score in class_scores.items():
+            output[0, 4 + class_id, index] = score
+    return output
+
+
+def onnx_backend(output):
+    """An OnnxBackend around a fake session, as for a dynamic export."""
+    backend = OnnxBackend.__new__(OnnxBackend)
+    backend.session = FakeSession(output)
+    backend.input_name = "images"
+    backend.dynamic_batch = backend.dynamic_shape = True
+    backend.input_size = 640
+    return backend
+
+
+def test_onnx_output_decodes_to_frame_boxes():
+    backend = onnx_backend(yolo_output([
+        ((100, 200, 300, 400), {2: 0.9}),
+        ((110, 200, 310, 400), {2: 0.8}),            # duplicate car
+        ((100, 200, 300, 400), {7: 0.7}),            # truck on the same spot
+        ((800, 300, 1000, 500), {0: 0.95, 2: 0.6}),  # person outscores car
+        ((400, 100, 500, 200), {2: 0.1, 5: 0.2}),    # below the threshold
+        ((1200, 600, 1400, 800), {5: 0.55}),         # bus off the frame edge
+    ]))
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    
+    [(boxes, scores, class_ids)] = backend.infer([frame], 0.5, 0.5, [2, 3, 5, 7])
+    
+    assert [tensor.shape for tensor in backend.session.inputs] == [(1, 3, 384, 640)]
+    np.testing.assert_allclose(boxes, [
+        [100, 200, 300, 400],
+        [100, 200, 300, 400],
+        [800, 300, 1000, 500],
+        [1200, 600, 1280, 720],
+    ], atol=1e-3)
+    assert scores.tolist() == pytest.approx([0.9, 0.7, 0.6, 0.55])
+    assert class_ids.tolist() == [2, 7, 2, 5]
+
+
+def test_onnx_output_without_vehicles_is_empty():
+    backend = onnx_backend(yolo_output([((100, 200, 300, 400), {0: 0.9})]))
+    
+    [(boxes, scores, class_ids)] = backend.infer(
+        [np.zeros((720, 1280, 3), dtype=np.uint8)], 0.5, 0.5, [2, 3, 5, 7]
+    )
+    
+    assert boxes.shape == (0, 4) and len(scores) == 0 and len(class_ids) == 0
+
+
+def test_points_in_polygon_handles_concave_shapes():
+    # An L: the top-right quarter of the square is cut away
+    polygon = np.array([[0, 0], [50, 0], [50, 50], [100, 50], [100, 100], [0, 100]], dtype=np.float32)
+    points = np.array([[25, 25], [75, 25], [75, 75], [25, 75], [150, 75], [50, -10]], dtype=np.float32)
+    
+    assert points_in_polygon(points, polygon).tolist() == [True, False, True, True, False, False]
+
+
+def test_band_zone_crops_and_maps_back_to_the_frame():
+    zone = DetectionZone(start=0.2, end=0.8, polygon=None)
+    frame = paint((100, 300, 200, 400))
+    
+    crop, offset = zone.crop(frame)
+    
+    assert zone.points(FRAME_SHAPE) is None
+    assert crop.shape == (648, 1920, 3) and offset == (0, 216)
+    assert np.shares_memory(crop, frame)
+    assert (crop[84:184, 100:200] == 255).all()
+    
+    raw = (np.array([[100, 84, 200, 184]], dtype=np.float32), np.array([0.9]), np.array([2]))
+    boxes, confidences, class_ids = zone.to_frame(raw, offset, FRAME_SHAPE)
+    assert boxes.tolist() == [[100, 300, 200, 400]]
+    assert confidences.tolist() == [0.9] and class_ids.tolist() == [2]
+
+
+def test_polygon_zone_drops_detections_centered_outside_it():
+    # A triangle over the lower half: wide at the bottom, a point on top
+    zone = DetectionZone(polygon=[(0.0, 1.0), (0.5, 0.5), (1.0, 1.0)])
+    
+    crop, offset = zone.crop(np.zeros(FRAME_SHAPE, dtype=np.uint8))
+    assert zone.bounds(FRAME_SHAPE) == (0, 540, 1920, 1080)
+    assert crop.shape == (540, 1920, 3) and offset == (0, 540)
+    
+    raw = (
+        np.array([
+            [910, 300, 1010, 400],   # below the apex: inside
+            [100, 50, 200, 150],     # top-left corner of the crop: outside
+            [1700, 450, 1800, 530],  # bottom-right, near the edge: inside
+        ], dtype=np.float32),
+        np.array([0.9, 0.8, 0.7]),
+        np.array([2, 2, 7])
+    )
+    boxes, confidences, class_ids = zone.to_frame(raw, offset, FRAME_SHAPE)
+    
+    assert boxes.tolist() == [[910, 840, 1010, 940], [1700, 990, 1800, 1070]]
+    assert confidences.tolist() == [0.9, 0.7] and class_ids.tolist() == [2, 7]
+
+
+def test_detector_runs_on_the_zone_crop_only(monkeypatch):
+    zone = DetectionZone(polygon=[(0.0, 1.0), (0.5, 0.5), (1.0, 1.0)])
+    vehicle_detector = make_detector(monkeypatch, tiled=False, zone=zone)
+    
+    batch = vehicle_detector.detect(paint((910, 840, 1010, 940), (100, 590, 200, 690), (100, 100, 200, 200)))
+    
+    assert vehicle_detector.backend.calls == [(vehicle_detector.zone_input_size, [(540, 1920)])]
+    assert batch.boxes.tolist() == [[910, 840, 1010, 940]]
+
+
+def test_tiles_cover_the_zone_per_tier():
+    grid = TileGrid(tiers=[(0.35, 480, 480), (1.0, 1280, 640)], overlap=0.2)
+    
+    tiles = grid.tiles(FRAME_SHAPE)
+    
+    far, near = tiles[tiles[:, 4] == 480], tiles[tiles[:, 4] == 640]
+    assert (far[:, 2] - far[:, 0] == 480).all() and (far[:, 1] == 0).all()
+    assert (near[:, 2] - near[:, 0] == 1280).all() and (near[:, 3] == 1080).all()
+    assert near[:, 1].min() < far[:, 3].max()
+    
+    covered = np.zeros(FRAME_SHAPE[:2], dtype=bool)
+    for x1, y1, x2, y2, _ in tiles:
+        covered[y1:y2, x1:x2] = True
+    assert covered.all()
+    assert grid.tiles(FRAME_SHAPE) is tiles
+
+
+def test_keep_mask_drops_only_boxes_another_tile_holds_whole():
+    grid = TileGrid(tiers=[(1.0, 480, 480)], overlap=0.2)
+    tile = grid.tiles((480, 960, 3))[0]
+    assert tile[:4].tolist() == [0, 0, 480, 480]
+    
+    boxes = np.array([
+        [100, 100, 200, 200],  # inside the tile
+        [420, 100, 480, 200],  # cut, but the next tile starts at 384
+        [300, 100, 480, 200],  # cut, and wider than the overlap
+    ], dtype=np.float32)
+    
+    assert grid.cut_mask(boxes, tile, (480, 960, 3)).any(axis=1).tolist() == [False, True, True]
+    assert grid.keep_mask(boxes, tile, (480, 960, 3)).tolist() == [True, False, True]
+
+
+def test_merge_boxes_nms_and_wbf():
+    boxes = np.array([[0, 0, 100, 100], [10, 0, 110, 100], [300, 300, 400, 400], [0, 0, 100, 100]], dtype=np.float32)
+    scores = np.array([0.9, 0.6, 0.8, 0.7], dtype=np.float32)
+    class_ids = np.array([2, 2, 2, 7])
+    
+    nms = merge_boxes(boxes, scores, class_ids, 0.5, "nms")
+    wbf = merge_boxes(boxes, scores, class_ids, 0.5, "wbf")
+    
+    assert nms[0].tolist() == [[0, 0, 100, 100], [300, 300, 400, 400], [0, 0, 100, 100]]
+    assert nms[2].tolist() == [2, 2, 7]
+    assert wbf[0][0].tolist() == pytest.approx([4, 0, 104, 100])
+    assert wbf[0][1:].tolist() == nms[0][1:].tolist()
+    assert wbf[1].tolist() == nms[1].tolist()
+
+
+def test_tiled_detection_maps_boxes_to_the_frame_per_tier(monkeypatch):
+    vehicle_detector = make_detector(monkeypatch)
+    
+    batch = vehicle_detector.detect(paint((100, 600, 200, 700)))
+    
+    assert batch.boxes.tolist() == [[100, 600, 200, 700]]
+    tiles = vehicle_detector.tiles.tiles(FRAME_SHAPE)
+    calls = dict(vehicle_detector.backend.calls)
+    assert sorted(calls) == [480, 640]
+    for input_size, shapes in calls.items():
+        sizes = tiles[tiles[:, 4] == input_size]
+        assert shapes == [(y2 - y1, x2 - x1) for x1, y1, x2, y2, _ in sizes]
+
+
+@pytest.mark.parametrize("box", [
+    (370, 230, 500, 300),   # wider than the far tier's horizontal overlap
+    (600, 500, 1300, 800),  # near-field truck across the near tier's seam
+    (100, 330, 200, 400),   # across the seam between the two tiers
+    (200, 230, 1700, 300),  # spans several far-field tiles
+])
+def test_vehicle_across_a_seam_is_found_once(monkeypatch, box):
+    vehicle_detector = make_detector(monkeypatch)
+    
+    batch = vehicle_detector.detect(paint(box))
+    
+    assert batch.boxes.tolist() == [list(box)]
+
+
+def test_tiled_batch_keeps_frames_apart(monkeypatch):
+    vehicle_detector = make_detector(monkeypatch)
+    
+    batches = vehicle_detector.detect_batch([paint((370, 230, 500, 300)), paint(), paint((100, 600, 200, 700))])
+    
+    assert [batch.boxes.tolist() for batch in batches] == [
+        [[370, 230, 500, 300]], [], [[100, 600, 200, 700]]
+    ]
+    assert len(vehicle_detector.backend.calls) == 2
+
+
+@pytest.mark.parametrize("crop_to_zone", [True, False])
+def test_batch_results_follow_frame_order(monkeypatch, crop_to_zone):
+    monkeypatch.setattr(detector, "CROP_TO_ZONE", crop_to_zone)
+    vehicle_detector = make_detector(monkeypatch, tiled=False)
+    boxes = [(100, 300, 200, 400), None, (900, 500, 1100, 600), (1500, 700, 1700, 800)]
+    
+    batches = vehicle_detector.detect_batch([paint(box) if box else paint() for box in boxes])
+    
+    assert [batch.boxes.tolist() for batch in batches] == [[list(box)] if box else [] for box in boxes]
+    assert len(vehicle_detector.backend.calls) == 1
+    assert len(vehicle_detector.backend.calls[0][1]) == 4
+
+
+def tile_calls(vehicle_detector, frame_shape):
+    """Backend calls of one tiled pass: each tier's tiles in one batch."""
+    tiles = vehicle_detector.tiles.tiles(frame_shape)
+    return [
+        (size, [(y2 - y1, x2 - x1) for x1, y1, x2, y2, _ in tiles[tiles[:, 4] == size]])
+        for size in vehicle_detector.input_sizes()
+    ]
+
+
+@pytest.mark.parametrize("tiled, crop_to_zone, sizes", [
+    (True, True, [480, 640]),   # one per tile tier
+    (False, True, [480]),       # ZONE_INPUT_SIZE
+    (False, False, [320]),      # the backend's own input size
+])
+def test_warmup_runs_at_every_input_size(monkeypatch, tmp_path, tiled, crop_to_zone, sizes):
+    monkeypatch.setattr(detector, "CROP_TO_ZONE", crop_to_zone)
+    
+    vehicle_detector = make_detector(monkeypatch, tiled=tiled, warmup_runs=2, cache_dir=str(tmp_path))
+    
+    assert vehicle_detector.input_sizes() == sizes
+    if tiled:
+        warm = tile_calls(vehicle_detector, FRAME_SHAPE)
+    elif crop_to_zone:
+        # The zone band of a 1920x1080 frame, not a 480x480 square
+        warm = [(480, [(648, 1920)])]
+    else:
+        warm = [(None, [FRAME_SHAPE[:2]])]
+    assert vehicle_detector.backend.calls == warm * 2
+    assert vehicle_detector.backend.cache.cache_dir == tmp_path
+
+
+def test_warmup_uses_the_cameras_frame_size(monkeypatch, tmp_path):
+    monkeypatch.setattr(detector, "CROP_TO_ZONE", True)
+    monkeypatch.setitem(detector.BACKENDS, PaintedBackend.name, PaintedBackend)
+    cv2.imwrite(str(tmp_path / "frame_0.png"), np.zeros((720, 1280, 3), dtype=np.uint8))
+    
+    processor = video_processor.VideoProcessor(
+        source=str(tmp_path / "frame_%d.png"),
+        show_preview=False,
+        backend=PaintedBackend.name,
+        threaded_capture=False,
+        checkpoint_dir=None,
+        log_dir=str(tmp_path / "logs")
+    )
+    
+    # The zone band of the 1280x720 source
+    assert processor.detector.backend.calls == [(480, [(432, 1280)])] * detector.WARMUP_RUNS
+    processor.stop()
+
+
+def test_warmup_can_be_turned_off(monkeypatch):
+    vehicle_detector = make_detector(monkeypatch, warmup_runs=0)
+    
+    assert vehicle_detector.backend.calls == []
+    assert vehicle_detector.backend.cache is None
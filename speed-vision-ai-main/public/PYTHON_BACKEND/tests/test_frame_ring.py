@@ -0,0 +1,83 @@
+"""Tests for the shared-memory frame ring."""
+
+import uuid
+
+import numpy as np
+import pytest
+
+from src.frame_ring import FrameRing, unlink
+
+SHAPE = (48, 64, 3)
+
+
+@pytest.fixture
+def ring_name():
+    name = f"speedwatch_test_{uuid.uuid4().hex[:12]}"
+    yield name
+    unlink(name)
+
+
+def test_reader_sees_the_writers_frame_without_a_copy(ring_name):
+    writer = FrameRing(ring_name, SHAPE, slots=4, create=True)
+    reader = FrameRing(ring_name, SHAPE, slots=4)
+    
+    slot = writer.slot(6)
+    writer.view(slot)[:] = 7
+    writer.publish(slot, 6)
+    
+    frame = reader.view(slot)
+    assert slot == 2
+    assert reader.holds(slot, 6)
+    assert frame.shape == SHAPE and (frame == 7).all()
+    assert np.shares_memory(frame, reader.frames)
+    
+    # Later writes show through a view taken earlier
+    writer.view(slot)[0, 0] = 9
+    assert frame[0, 0].tolist() == [9, 9, 9]
+    
+    reader.close()
+    writer.close()
+
+
+def test_reused_slot_no_longer_holds_the_old_frame(ring_name):
+    writer = FrameRing(ring_name, SHAPE, slots=4, create=True)
+    reader = FrameRing(ring_name, SHAPE, slots=4)
+    
+    assert not reader.holds(writer.slot(0), 0)
+    
+    writer.publish(writer.slot(1), 1)
+    assert reader.holds(1, 1)
+    
+    # Frame 5 lands in frame 1's slot; a stale job for frame 1 must fail
+    writer.publish(writer.slot(5), 5)
+    assert writer.slot(5) == 1
+    assert not reader.holds(1, 1)
+    assert reader.holds(1, 5)
+    
+    reader.close()
+    writer.close()
+
+
+def test_only_the_owner_removes_the_block(ring_name):
+    writer = FrameRing(ring_name, SHAPE, slots=2, create=True)
+    reader = FrameRing(ring_name, SHAPE, slots=2)
+    
+    reader.close()
+    FrameRing(ring_name, SHAPE, slots=2).close()
+    
+    writer.close()
+    with pytest.raises(FileNotFoundError):
+        FrameRing(ring_name, SHAPE, slots=2)
+
+
+def test_unlink_removes_a_block_left_behind(ring_name):
+    writer = FrameRing(ring_name, SHAPE, slots=2, create=True)
+    
+    # The writer "crashed": its block is still there
+    writer.owner = False
+    writer.close()
+    
+    assert unlink(ring_name)
+    assert not unlink(ring_name)
+    with pytest.raises(FileNotFoundError):
+        FrameRing(ring_name, SHAPE, slots=2)
@@ -0,0 +1,72 @@
+"""Tests for the batched constant-velocity Kalman filter."""
+
+import numpy as np
+import pytest
+
+from src.kalman import ConstantVelocityKalman
+
+
+def test_predict_update_and_gate_shapes():
+    kf = ConstantVelocityKalman(capacity=8)
+    slots = np.array([kf.create((10.0 * i, 5.0), 0.0) for i in range(3)])
+    
+    predicted = kf.predict(slots, 0.1)
+    kf.update(slots, predicted + 1.0)
+    
+    assert predicted.shape == (3, 2)
+    assert kf.positions(slots).shape == (3, 2)
+    assert kf.velocities(slots).shape == (3, 2)
+    assert kf.gate_radius(slots, 3.0).shape == (3,)
+    assert kf.x.shape == (8, 4)
+    assert kf.P.shape == (8, 4, 4)
+    # Covariances stay symmetric
+    assert np.allclose(kf.P[slots], kf.P[slots].transpose(0, 2, 1))
+
+
+def test_velocity_converges_for_constant_motion():
+    kf = ConstantVelocityKalman(capacity=2)
+    velocity = np.array([120.0, -40.0])
+    start = np.array([100.0, 300.0])
+    slot = np.array([kf.create(tuple(start), 0.0)])
+    
+    for frame in range(1, 60):
+        t = frame / 30
+        kf.predict(slot, t)
+        kf.update(slot, (start + velocity * t)[None])
+    
+    assert kf.velocities(slot)[0] == pytest.approx(velocity, rel=1e-3)
+    assert kf.predict(slot, 2.0)[0] == pytest.approx(start + velocity * 2.0, rel=1e-3)
+
+
+def test_gate_shrinks_as_track_settles():
+    kf = ConstantVelocityKalman(capacity=2)
+    slot = np.array([kf.create((0.0, 0.0), 0.0)])
+    
+    kf.predict(slot, 1 / 30)
+    first = kf.gate_radius(slot, 3.0)[0]
+    for frame in range(2, 30):
+        kf.update(slot, np.array([[0.0, 0.0]]))
+        kf.predict(slot, frame / 30)
+    
+    assert kf.gate_radius(slot, 3.0)[0] < first
+
+
+def test_predict_leaves_newer_filters_alone():
+    kf = ConstantVelocityKalman(capacity=2)
+    slot = np.array([kf.create((0.0, 0.0), 1.0)])
+    kf.x[slot, 2:] = 50.0
+    
+    assert kf.predict(slot, 0.5).tolist() == [[0.0, 0.0]]
+    assert kf.t[slot].tolist() == [1.0]
+
+
+def test_grows_past_capacity_and_reuses_slots():
+    kf = ConstantVelocityKalman(capacity=2)
+    slots = [kf.create((float(i), 0.0), 0.0) for i in range(5)]
+    
+    assert len(set(slots)) == 5
+    assert len(kf.x) >= 5
+    assert kf.positions(np.array(slots))[:, 0].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    
+    kf.release(slots[1])
+    assert kf.create((9.0, 9.0), 0.0) == slots[1]
@@ -0,0 +1,85 @@
+"""Tests for the model artifact cache."""
+
+import pytest
+
+from src.model_cache import ModelArtifactCache
+
+
+@pytest.fixture
+def model(tmp_path):
+    path = tmp_path / "yolov8n.pt"
+    path.write_bytes(b"weights v1")
+    return path
+
+
+def counting_build(calls, content=b"artifact"):
+    """Build callable that writes content and records the path it got."""
+    def build(out):
+        calls.append(out)
+        assert not out.exists()
+        out.write_bytes(content)
+    return build
+
+
+def test_cache_key_covers_hash_backend_and_input_size(tmp_path, model):
+    cache = ModelArtifactCache(str(tmp_path / "cache"))
+    
+    path = cache.path(str(model), "onnx", 640, ".onnx")
+    
+    assert path.parent == tmp_path / "cache"
+    assert path.name == f"yolov8n-{cache.file_hash(str(model))}-onnx-640.onnx"
+    assert cache.path(str(model), "torchscript", 640, ".onnx") != path
+    assert cache.path(str(model), "onnx", 480, ".onnx") != path
+    
+    # New weights (same name) get a new key
+    model.write_bytes(b"weights v2, retrained")
+    assert cache.path(str(model), "onnx", 640, ".onnx") != path
+
+
+def test_build_writes_a_temporary_file_then_renames_it(tmp_path, model):
+    cache = ModelArtifactCache(str(tmp_path / "cache"))
+    calls = []
+    
+    target = cache.get_or_build(str(model), "onnx", 640, ".onnx", counting_build(calls))
+    
+    assert len(calls) == 1
+    assert calls[0] != target and calls[0].parent == target.parent
+    assert calls[0].suffix == ".onnx"
+    assert target.read_bytes() == b"artifact"
+    assert sorted(p.name for p in (tmp_path / "cache").iterdir()) == [target.name]
+
+
+def test_failed_build_leaves_nothing_behind(tmp_path, model):
+    cache = ModelArtifactCache(str(tmp_path / "cache"))
+    
+    def broken(out):
+        out.write_bytes(b"half an arti")
+        raise RuntimeError("export failed")
+    
+    with pytest.raises(RuntimeError):
+        cache.get_or_build(str(model), "onnx", 640, ".onnx", broken)
+    
+    assert list((tmp_path / "cache").iterdir()) == []
+    
+    calls = []
+    target = cache.get_or_build(str(model), "onnx", 640, ".onnx", counting_build(calls))
+    assert len(calls) == 1 and target.exists()
+
+
+def test_cached_artifact_is_reused_across_restarts(tmp_path, model):
+    calls = []
+    first = ModelArtifactCache(str(tmp_path / "cache")).get_or_build(
+        str(model), "onnx", 640, ".onnx", counting_build(calls)
+    )
+    
+    # A fresh cache object, as after a restart
+    second = ModelArtifactCache(str(tmp_path / "cache")).get_or_build(
+        str(model), "onnx", 640, ".onnx", counting_build(calls)
+    )
+    other_size = ModelArtifactCache(str(tmp_path / "cache")).get_or_build(
+        str(model), "onnx", 480, ".onnx", counting_build(calls)
+    )
+    
+    assert second == first
+    assert other_size != first
+    assert len(calls) == 2
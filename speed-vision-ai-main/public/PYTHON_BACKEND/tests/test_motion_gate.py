@@ -0,0 +1,49 @@
+"""Tests for the motion gate."""
+
+import numpy as np
+import pytest
+
+from src.detector import DetectionZone
+from src.motion_gate import MotionGate
+
+
+def scene(x=None, y=300):
+    """Flat grey road, optionally with one bright vehicle centred at (x, y)."""
+    frame = np.full((720, 1280, 3), 60, dtype=np.uint8)
+    if x is not None:
+        frame[y - 20:y + 20, x - 40:x + 40] = 220
+    return frame
+
+
+@pytest.mark.parametrize("method", ["diff", "mog2"])
+def test_gate_skips_static_frames_and_opens_on_motion(method):
+    gate = MotionGate(method=method)
+    
+    decisions = [gate.should_detect(scene(), has_tracks=False) for _ in range(20)]
+    
+    # Only the first frame (no background yet) goes to the detector
+    assert decisions == [True] + [False] * 19
+    assert gate.should_detect(scene(400), has_tracks=False)
+    assert gate.get_stats()["skips"] == 19
+
+
+def test_gate_never_skips_while_tracks_are_alive():
+    gate = MotionGate()
+    gate.should_detect(scene(), has_tracks=False)
+    
+    assert gate.should_detect(scene(), has_tracks=True)
+    assert not gate.should_detect(scene(), has_tracks=False)
+    assert gate.get_stats() == {"frames": 3, "hits": 1, "skips": 1, "skip_rate": 0.333}
+
+
+def test_gate_only_counts_motion_inside_the_zone():
+    gate = MotionGate(zone=DetectionZone(start=0.5, end=1.0))
+    gate.should_detect(scene(), has_tracks=False)
+    
+    assert not gate.should_detect(scene(400, y=100), has_tracks=False)
+    assert gate.should_detect(scene(400, y=600), has_tracks=False)
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        MotionGate(method="optical_flow")
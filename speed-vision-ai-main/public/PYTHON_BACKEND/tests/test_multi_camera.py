@@ -0,0 +1,121 @@
+"""Tests for the multi-camera processor and the cameras file."""
+
+import csv
+
+import cv2
+import numpy as np
+import pytest
+
+import src.multi_camera as multi_camera
+from benchmarks.soak_memory import LaneStream
+from src.detections import DetectionBatch
+from src.multi_camera import MultiCameraProcessor, load_camera_sources
+
+
+class MarkedDetector:
+    """Shared stand-in detector; each camera's frames carry its marker."""
+    
+    zone = None
+    
+    def __init__(self, streams):
+        self.streams = streams
+        self.calls = []
+    
+    def detect_batch(self, frames):
+        markers = [int(frame[0, 0, 0]) for frame in frames]
+        self.calls.append(markers)
+        return [
+            self.streams[marker].next() if marker in self.streams else DetectionBatch.empty()
+            for marker in markers
+        ]
+
+
+def camera_frame(marker):
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    frame[0, 0] = marker
+    return frame
+
+
+def log_rows(processor):
+    with open(processor.log_file, newline='') as f:
+        return list(csv.reader(f))[1:]
+
+
+def test_process_round_batches_cameras_but_tracks_them_apart(tmp_path, monkeypatch):
+    detector = MarkedDetector({1: LaneStream(step=40), 2: LaneStream(spawn_every=10, step=40)})
+    monkeypatch.setattr(multi_camera, "VehicleDetector", lambda **kwargs: detector)
+    
+    sources = {}
+    for name, marker in [("north", 1), ("south", 2), ("idle", 3)]:
+        cv2.imwrite(str(tmp_path / f"{name}_0.png"), camera_frame(marker))
+        sources[name] = str(tmp_path / f"{name}_%d.png")
+    
+    processor = MultiCameraProcessor(
+        sources,
+        speed_limit=100,
+        show_preview=False,
+        adaptive_stride=False,
+        motion_gate=False,
+        threaded_capture=False,
+        checkpoint_dir=None,
+        log_dir=str(tmp_path / "logs")
+    )
+    cameras = processor.cameras
+    assert all(camera.detector is detector for camera in cameras.values())
+    
+    rounds = 60
+    for index in range(rounds):
+        timestamp = (index + 1) / cameras["north"].fps
+        results = processor.process_round([
+            (name, camera_frame(marker), timestamp)
+            for name, marker in [("north", 1), ("south", 2), ("idle", 3)]
+        ])
+        assert [camera_id for camera_id, _, _ in results] == ["north", "south", "idle"]
+    
+    # One forward pass per round, holding every camera's frame
+    assert detector.calls == [[1, 2, 3]] * rounds
+    assert processor.get_stats()["avg_batch_size"] == 3
+    
+    north, south, idle = cameras["north"], cameras["south"], cameras["idle"]
+    assert north.tracker is not south.tracker
+    assert north.total_vehicles > south.total_vehicles > 0
+    assert idle.total_vehicles == 0 and not idle.tracker.tracks
+    assert all(camera.detector_runs == rounds for camera in cameras.values())
+    
+    logs = {camera.log_file for camera in cameras.values()}
+    assert len(logs) == 3
+    assert len(log_rows(north)) == north.overspeed_count > len(log_rows(south)) > 0
+    assert log_rows(idle) == []
+    assert processor.get_stats()["total_vehicles"] == north.total_vehicles + south.total_vehicles
+    processor.stop()
+
+
+def test_cameras_file_names_and_numbers_sources(tmp_path):
+    path = tmp_path / "cameras.txt"
+    path.write_text(
+        "# parking lot\n"
+        "\n"
+        "gate = rtsp://10.0.0.5/stream\n"
+        "rtsp://10.0.0.6/stream\n"
+        "videos/road.mp4\n"
+    )
+    
+    assert load_camera_sources(str(path)) == {
+        "gate": "rtsp://10.0.0.5/stream",
+        "cam1": "rtsp://10.0.0.6/stream",
+        "cam2": "videos/road.mp4",
+    }
+
+
+@pytest.mark.parametrize("content, message", [
+    ("gate=a.mp4\ngate=b.mp4\n", "used twice"),
+    ("cam1=a.mp4\nb.mp4\n", "used twice"),
+    ("gate=\n", "expected"),
+    ("=rtsp://10.0.0.5/stream\n", "expected"),
+])
+def test_cameras_file_rejects_duplicate_and_malformed_lines(tmp_path, content, message):
+    path = tmp_path / "cameras.txt"
+    path.write_text(content)
+    
+    with pytest.raises(ValueError, match=message):
+        load_camera_sources(str(path))
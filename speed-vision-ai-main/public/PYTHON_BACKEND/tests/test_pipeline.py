@@ -0,0 +1,159 @@
+"""Tests for the stage pipeline and pipelined VideoProcessor mode."""
+
+import itertools
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+import src.video_processor as video_processor
+from src.detections import DetectionBatch
+from src.pipeline import Pipeline, Stage
+
+
+def counting_source(limit=None):
+    """Source of 0, 1, 2, ... (up to limit); pulled[0] counts calls."""
+    counter = itertools.count()
+    pulled = [0]
+    
+    def source():
+        pulled[0] += 1
+        item = next(counter)
+        return None if limit is not None and item >= limit else item
+    return source, pulled
+
+
+def jittered(item):
+    """Finish items out of order: later items are often faster."""
+    time.sleep((item * 7 % 5) / 1000)
+    return item
+
+
+def test_results_keep_input_order_across_concurrent_stages():
+    source, _ = counting_source(60)
+    seen = []
+    
+    def record(item):
+        seen.append(item)
+        return item * 2
+    
+    pipeline = Pipeline(source, [
+        Stage("jitter", jittered, workers=4),
+        Stage("ordered", record, ordered=True),
+        Stage("jitter_again", jittered, workers=3),
+    ], queue_size=3).start()
+    try:
+        results = list(pipeline.results())
+    finally:
+        pipeline.stop()
+    
+    assert seen == list(range(60))
+    assert results == [item * 2 for item in range(60)]
+    assert pipeline.get_stats()["jitter"]["items"] == 60
+
+
+def test_bounded_queues_apply_backpressure():
+    source, pulled = counting_source(50)
+    release = threading.Event()
+    
+    def blocked(item):
+        release.wait()
+        return item
+    
+    pipeline = Pipeline(source, [
+        Stage("jitter", jittered, workers=2),
+        Stage("blocked", blocked),
+    ], queue_size=2).start()
+    try:
+        time.sleep(0.3)
+        # Three queues of two, one item per worker and one in the feeder
+        assert 5 <= pulled[0] <= 3 * 2 + 3 + 1
+        
+        release.set()
+        assert list(pipeline.results()) == list(range(50))
+    finally:
+        release.set()
+        pipeline.stop()
+
+
+def test_stop_shuts_down_an_endless_pipeline():
+    source, _ = counting_source()
+    pipeline = Pipeline(source, [Stage("jitter", jittered, workers=3)], queue_size=2).start()
+    threads = list(pipeline._threads)
+    
+    results = pipeline.results()
+    assert [next(results) for _ in range(5)] == [0, 1, 2, 3, 4]
+    
+    start = time.perf_counter()
+    pipeline.stop()
+    
+    assert time.perf_counter() - start < 1.0
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def test_stage_error_ends_the_stream():
+    source, _ = counting_source(20)
+    
+    def fail_at_five(item):
+        if item == 5:
+            raise RuntimeError("bad frame")
+        return item
+    
+    pipeline = Pipeline(source, [Stage("fail", fail_at_five, ordered=True)]).start()
+    received = []
+    try:
+        with pytest.raises(RuntimeError, match="bad frame"):
+            for item in pipeline.results():
+                received.append(item)
+    finally:
+        pipeline.stop()
+    
+    assert received == [0, 1, 2, 3, 4]
+
+
+def test_ordered_stage_needs_one_worker():
+    with pytest.raises(ValueError):
+        Stage("track", print, workers=2, ordered=True)
+
+
+class JitteredDetector:
+    """Thread-safe stand-in detector with a per-frame delay."""
+    
+    zone = None
+    backend = type("Backend", (), {"thread_safe": True})()
+    
+    def detect(self, frame):
+        jittered(int(frame[120, 160, 0]))
+        return DetectionBatch.empty()
+
+
+def test_pipelined_run_yields_frames_in_capture_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_processor, "PIPELINE_DETECT_WORKERS", 4)
+    monkeypatch.setattr(video_processor, "PIPELINE_RENDER_WORKERS", 3)
+    
+    frames = 24
+    for index in range(frames):
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        frame[100:140, 140:180] = index
+        cv2.imwrite(str(tmp_path / f"frame_{index}.png"), frame)
+    
+    processor = video_processor.VideoProcessor(
+        source=str(tmp_path / "frame_%d.png"),
+        show_preview=False,
+        threaded_capture=False,
+        pipelined=True,
+        detector=JitteredDetector(),
+        checkpoint_dir=None,
+        log_dir=str(tmp_path / "logs")
+    )
+    assert processor._detect_workers() == 4
+    
+    run = processor.run()
+    order = [int(annotated[120, 160, 0]) for annotated, _ in itertools.islice(run, frames)]
+    run.close()
+    
+    assert order == list(range(frames))
+    assert processor.frame_count >= frames
+    assert processor.pipeline._threads == []
@@ -0,0 +1,13 @@
+"""Short memory soak (see benchmarks/soak_memory.py for the long run)."""
+
+from benchmarks.soak_memory import TOLERANCE_KB, memory_growth, soak
+
+
+def test_memory_stays_flat_over_many_vehicles():
+    results = soak(vehicles=300, samples=5)
+    
+    assert memory_growth(results) < TOLERANCE_KB
+    
+    # Logged ids are pruned with their tracks
+    _, _, live_tracks, logged = results[-1]
+    assert logged <= live_tracks
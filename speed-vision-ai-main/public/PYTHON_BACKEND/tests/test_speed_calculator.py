@@ -0,0 +1,94 @@
+"""Tests for SpeedCalculator and the running path lengths it reads."""
+
+import numpy as np
+import pytest
+
+from benchmarks.scene import SceneConfig, SyntheticScene
+from src.speed_calculator import SpeedCalculator
+from src.track_store import Track, TrackStore
+from src.tracker import CentroidTracker
+
+
+def random_walk(store: TrackStore, tracks: int, frames: int, seed: int = 0):
+    """Append a noisy drive per track, one sample per frame."""
+    rng = np.random.default_rng(seed)
+    slots = np.array([store.allocate(track_id) for track_id in range(tracks)])
+    positions = rng.uniform(0, 1000, size=(tracks, 2))
+    for frame in range(frames):
+        positions += rng.normal(3.0, 4.0, size=positions.shape)
+        store.append(slots, np.rint(positions).astype(np.int32), frame / 30)
+    return slots
+
+
+def test_track_speed_matches_calculate_speed_across_ring_wraps():
+    store = TrackStore(capacity=4, history=16, path_window=10)
+    calculator = SpeedCalculator(pixels_per_meter=8.8, fps=30, window=10)
+    rng = np.random.default_rng(1)
+    slots = np.array([store.allocate(track_id) for track_id in range(3)])
+    positions = rng.uniform(0, 1000, size=(3, 2))
+    
+    for frame in range(20 * store.history):
+        positions += rng.normal(2.0, 3.0, size=positions.shape)
+        store.append(slots, np.rint(positions).astype(np.int32), frame / 30)
+        
+        for track_id, slot in enumerate(slots):
+            track = Track(track_id, int(slot), store)
+            assert calculator.track_speed(track) == calculator.calculate_speed(
+                track.positions, track.timestamps
+            )
+
+
+def test_calculate_speeds_matches_per_track_loop():
+    store = TrackStore(capacity=8, history=16, path_window=10)
+    slots = random_walk(store, tracks=8, frames=50)
+    
+    for window in (10, 7):
+        calculator = SpeedCalculator(pixels_per_meter=8.8, fps=30, window=window)
+        batch = calculator.calculate_speeds(store, slots)
+        
+        for row, slot in enumerate(slots):
+            result = calculator.calculate_speed(*store.window(slot))
+            assert batch.valid[row] == (result is not None)
+            if result is not None:
+                assert batch.distance_pixels[row] == result.distance_pixels
+                assert batch.speed_kmh[row] == result.speed_kmh
+                assert batch.is_overspeed[row] == result.is_overspeed
+
+
+def test_loaded_rows_keep_their_path_length():
+    store = TrackStore(capacity=4, history=16, path_window=10)
+    slots = random_walk(store, tracks=3, frames=40)
+    
+    copy = TrackStore(capacity=4, history=16, path_window=10)
+    loaded = copy.load(store.export(slots))
+    
+    assert np.array_equal(copy.path_length[loaded], store.path_length[slots])
+
+
+@pytest.mark.parametrize("kalman", [False, True])
+def test_calculate_speeds_matches_per_track_loop_on_tracker(kalman):
+    scene = SyntheticScene(SceneConfig(vehicles=40, noise=2.0, occlusion_rate=0.05, seed=2))
+    tracker = CentroidTracker(kalman=kalman)
+    calculator = SpeedCalculator()
+    
+    for _ in range(90):
+        frame = scene.next()
+        tracker.update(frame.detections, timestamp=frame.timestamp)
+        
+        batch = calculator.calculate_speeds(tracker.store, from_velocity=kalman)
+        tracks = list(tracker.tracks.values())
+        assert batch.slots.tolist() == [track.slot for track in tracks]
+        
+        for row, track in enumerate(tracks):
+            if kalman:
+                result = calculator.speed_from_velocity(track.velocity)
+            else:
+                result = calculator.track_speed(track)
+            
+            assert batch.valid[row] == (result is not None)
+            if result is not None:
+                assert batch.speed_kmh[row] == result.speed_kmh
+                assert batch.speed_mph[row] == result.speed_mph
+                assert batch.is_overspeed[row] == result.is_overspeed
+                assert batch.distance_pixels[row] == result.distance_pixels
+                assert batch.time_seconds[row] == result.time_seconds
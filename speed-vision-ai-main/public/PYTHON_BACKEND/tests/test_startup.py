@@ -0,0 +1,41 @@
+"""Tests for the startup profiler."""
+
+import sys
+
+import pytest
+
+from src.startup import StartupProfile
+
+
+@pytest.fixture
+def slow_module(tmp_path, monkeypatch):
+    """A module on sys.path that takes 50 ms to import."""
+    (tmp_path / "speedwatch_slow_module.py").write_text("import time\ntime.sleep(0.05)\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "speedwatch_slow_module"
+    sys.modules.pop("speedwatch_slow_module", None)
+
+
+def test_timed_import_records_each_module_once(slow_module):
+    profile = StartupProfile(budget=1.0)
+    
+    module = profile.timed_import(slow_module)
+    first = profile.imports[slow_module]
+    
+    assert module.VALUE == 42
+    assert 0.05 <= first < 1.0
+    
+    # Loaded modules are returned as is and not charged again
+    assert profile.timed_import(slow_module) is module
+    assert profile.timed_import("json") is sys.modules["json"]
+    assert profile.imports == {slow_module: first}
+    assert profile.to_dict()["imports_ms"] == {slow_module: round(first * 1000, 1)}
+
+
+def test_phases_are_checked_against_the_budget():
+    profile = StartupProfile(budget=1.0)
+    profile.phases = {"server_ready": 0.2, "model_ready": 1.5}
+    
+    assert profile.within_budget("server_ready")
+    assert not profile.within_budget("model_ready")
+    assert any("OVER BUDGET" in line and "model_ready" in line for line in profile.report())
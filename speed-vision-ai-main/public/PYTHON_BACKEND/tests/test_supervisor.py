@@ -0,0 +1,107 @@
+"""Tests for the supervisor's restart handling."""
+
+import types
+
+import pytest
+
+import src.supervisor as supervisor
+from src.frame_ring import FrameRing
+from src.supervisor import Supervisor
+
+
+class FakeProcess:
+    """Stands in for a worker process; tests decide when it dies."""
+    
+    def __init__(self, target=None, args=(), name=None, daemon=None):
+        self.name = name
+        self.pid = None
+        self.exitcode = None
+        self.started = False
+    
+    def start(self):
+        self.started = True
+    
+    def is_alive(self):
+        return self.started and self.exitcode is None
+    
+    def crash(self, code=1):
+        self.exitcode = code
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(supervisor, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def started_supervisor():
+    sup = Supervisor({"north": "north.mp4"}, detector_processes=1)
+    sup.ctx = types.SimpleNamespace(Process=FakeProcess)
+    return sup.start()
+
+
+def test_dead_worker_restarts_with_doubling_capped_backoff(clock):
+    sup = started_supervisor()
+    detector, camera = sup.workers
+    
+    delays = []
+    for _ in range(8):
+        process = detector.process
+        process.crash()
+        sup._check_health()
+        delays.append(detector.restart_at - clock.now)
+        
+        # Not restarted before the backoff is up
+        clock.now += delays[-1] - 0.5
+        sup._check_health()
+        assert detector.process is process
+        
+        clock.now += 0.5
+        sup._check_health()
+        assert detector.process is not process and detector.process.is_alive()
+    
+    assert delays == [1, 2, 4, 8, 16, 32, 60, 60]
+    assert detector.restarts == 8 and detector.generation == 9
+    assert camera.restarts == 0 and camera.generation == 1
+    
+    # A worker that stays up for a minute starts over at the base backoff
+    clock.now += 61
+    sup._check_health()
+    assert detector.backoff == supervisor.RESTART_BACKOFF
+    
+    sup.stop_event.set()
+
+
+def test_dead_camera_ring_is_unlinked_and_replaced(clock):
+    sup = started_supervisor()
+    camera = sup.workers[1]
+    old_name = camera.ring_name
+    
+    # What the camera worker would have created before dying
+    ring = FrameRing(old_name, (48, 64, 3), slots=2, create=True)
+    ring.owner = False
+    ring.close()
+    
+    camera.process.crash(-9)
+    sup._check_health()
+    
+    with pytest.raises(FileNotFoundError):
+        FrameRing(old_name, (48, 64, 3), slots=2)
+    
+    clock.now = camera.restart_at
+    sup._check_health()
+    
+    assert camera.restarts == 1
+    assert camera.ring_name != old_name
+    assert camera.ring_name.endswith("_north_1")
+    
+    sup.stop_event.set()
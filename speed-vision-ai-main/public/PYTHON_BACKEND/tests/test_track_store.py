@@ -0,0 +1,82 @@
+"""Tests for the columnar track store."""
+
+import numpy as np
+import pytest
+
+from src.track_store import TrackStore
+
+
+def test_path_window_must_fit_in_history():
+    with pytest.raises(ValueError):
+        TrackStore(capacity=4, history=8, path_window=8)
+    with pytest.raises(ValueError):
+        TrackStore(capacity=4, history=8, path_window=1)
+
+
+def test_released_slot_is_reused_and_reset():
+    store = TrackStore(capacity=4, history=8, path_window=4)
+    slot = store.allocate(0)
+    store.append(np.array([slot]), np.array([[10, 20]]), 0.0)
+    store.append(np.array([slot]), np.array([[13, 24]]), 0.1)
+    store.hits[slot] = 5
+    store.valid[slot] = True
+    store.has_bbox[slot] = True
+    
+    store.release(slot)
+    assert slot not in store.active_slots()
+    
+    reused = store.allocate(1)
+    assert reused == slot
+    assert store.track_id[reused] == 1
+    assert store.length[reused] == 0
+    assert store.hits[reused] == 0
+    assert not store.valid[reused]
+    assert not store.has_bbox[reused]
+    assert store.path_length[reused] == 0.0
+    assert len(store.window(reused)[0]) == 0
+
+
+def test_growth_keeps_existing_tracks():
+    store = TrackStore(capacity=2, history=8, path_window=4)
+    slots = np.array([store.allocate(track_id) for track_id in range(2)])
+    store.append(slots, np.array([[1, 2], [3, 4]]), 0.0)
+    
+    extra = store.allocate(2)
+    
+    assert store.capacity == 4
+    assert extra not in slots
+    assert store.active_slots().tolist() == [*slots.tolist(), extra]
+    assert store.last_positions(slots).tolist() == [[1, 2], [3, 4]]
+
+
+def test_window_returns_last_history_samples_after_wrap():
+    history = 8
+    store = TrackStore(capacity=1, history=history, path_window=4)
+    slot = store.allocate(0)
+    
+    for step in range(3 * history + 3):
+        store.append(np.array([slot]), np.array([[step, 2 * step]]), step * 0.1)
+    
+    positions, timestamps = store.window(slot)
+    expected = np.arange(2 * history + 3, 3 * history + 3)
+    
+    assert positions[:, 0].tolist() == expected.tolist()
+    assert positions[:, 1].tolist() == (2 * expected).tolist()
+    assert timestamps.tolist() == pytest.approx((expected * 0.1).tolist())
+    assert store.last_positions(np.array([slot])).tolist() == [[expected[-1], 2 * expected[-1]]]
+
+
+def test_windows_are_right_aligned_and_padded():
+    store = TrackStore(capacity=2, history=8, path_window=4)
+    short, long = store.allocate(0), store.allocate(1)
+    
+    for step in range(10):
+        moving = [long] if step > 1 else [short, long]
+        store.append(np.array(moving), np.full((len(moving), 2), step), float(step))
+    
+    positions, timestamps, mask = store.windows(np.array([short, long]), 4)
+    
+    assert mask.tolist() == [[False, False, True, True], [True, True, True, True]]
+    assert positions[0, :, 0].tolist() == [0, 0, 0, 1]
+    assert positions[1, :, 0].tolist() == [6, 7, 8, 9]
+    assert timestamps[1].tolist() == [6.0, 7.0, 8.0, 9.0]
@@ -0,0 +1,188 @@
+"""Tests for the centroid tracker."""
+
+import numpy as np
+import pytest
+
+import src.tracker as tracker_module
+from benchmarks.scene import SceneConfig, SyntheticScene
+from src.detections import DetectionBatch
+from src.spatial_index import pairs_within
+from src.track_store import TrackState
+from src.tracker import (
+    CentroidTracker, TRACK_CONFIRMED, TRACK_CREATED, TRACK_DELETED, TRACK_EVENTS,
+    TRACK_LOST, TRACK_UPDATED
+)
+
+
+def run_scene(tracker, frames=60, **config):
+    """Track a synthetic scene; returns each frame's (id, centroid) pairs."""
+    scene = SyntheticScene(SceneConfig(**config))
+    history = []
+    for _ in range(frames):
+        frame = scene.next()
+        tracks = tracker.update(frame.detections, timestamp=frame.timestamp)
+        history.append(sorted((track_id, track.centroid) for track_id, track in tracks.items()))
+    return history
+
+
+@pytest.mark.parametrize("kalman", [False, True])
+@pytest.mark.parametrize("cost", ["centroid", "iou"])
+def test_grid_gating_matches_dense_association(monkeypatch, kalman, cost):
+    config = dict(vehicles=150, noise=2.0, occlusion_rate=0.05, false_positives=3.0, seed=3)
+    
+    monkeypatch.setattr(tracker_module, "GRID_GATING_MIN_TRACKS", 10 ** 9)
+    dense = run_scene(CentroidTracker(kalman=kalman, cost=cost), **config)
+    
+    calls = []
+    def counted_pairs_within(*args):
+        calls.append(len(args[0]))
+        return pairs_within(*args)
+    
+    monkeypatch.setattr(tracker_module, "pairs_within", counted_pairs_within)
+    monkeypatch.setattr(tracker_module, "GRID_GATING_MIN_TRACKS", 1)
+    grid = run_scene(CentroidTracker(kalman=kalman, cost=cost), **config)
+    
+    assert calls and max(calls) > 0
+    assert grid == dense
+
+
+def detection_batch(centers, confidences):
+    centers = np.array(centers)
+    boxes = np.hstack([centers - 20, centers + 20])
+    return DetectionBatch.from_raw(boxes, confidences, np.full(len(centers), 2))
+
+
+def test_low_tier_only_extends_existing_tracks():
+    tracker = CentroidTracker(max_distance=50, min_hits=1)
+    tracker.update(detection_batch([[100, 100]], [0.9]).split_tiers(0.5), timestamp=0.0)
+    
+    # A weak detection near the track extends it; one far from every
+    # track is dropped instead of starting a new track
+    frame = detection_batch([[110, 100], [400, 400]], [0.2, 0.2]).split_tiers(0.5)
+    tracks = tracker.update(frame, timestamp=0.1)
+    
+    assert list(tracks) == [0]
+    assert tracks[0].centroid == (110, 100)
+    assert tracks[0].disappeared == 0
+
+
+def test_low_tier_yields_to_regular_detections():
+    tracker = CentroidTracker(max_distance=50, min_hits=1)
+    tracker.update(detection_batch([[100, 100], [300, 100]], [0.9, 0.9]).split_tiers(0.5), timestamp=0.0)
+    
+    # Track 0 takes the strong detection even though the weak one is
+    # closer; track 1 has only the weak one
+    frame = detection_batch([[130, 100], [102, 100], [305, 100]], [0.9, 0.2, 0.2]).split_tiers(0.5)
+    tracks = tracker.update(frame, timestamp=0.1)
+    
+    assert list(tracks) == [0, 1]
+    assert tracks[0].centroid == (130, 100)
+    assert tracks[1].centroid == (305, 100)
+
+
+def test_lifecycle_events_arrive_in_order():
+    tracker = CentroidTracker(max_disappeared=1, max_distance=50, min_hits=2)
+    events = []
+    for event in TRACK_EVENTS:
+        tracker.subscribe(event, lambda track, event=event: events.append((event, track.id)))
+    
+    frames = [
+        [[100, 100], [300, 100]],
+        [[110, 100], [310, 100], [500, 300]],
+        [[120, 100]],
+        [[130, 100]],
+    ]
+    for index, centroids in enumerate(frames):
+        events.append(("frame", index))
+        tracker.update(np.array(centroids), timestamp=index / 10)
+    
+    assert events == [
+        ("frame", 0), (TRACK_CREATED, 0), (TRACK_CREATED, 1),
+        ("frame", 1), (TRACK_CONFIRMED, 0), (TRACK_CONFIRMED, 1),
+        (TRACK_UPDATED, 0), (TRACK_UPDATED, 1), (TRACK_CREATED, 2),
+        ("frame", 2), (TRACK_UPDATED, 0), (TRACK_LOST, 1), (TRACK_LOST, 2),
+        ("frame", 3), (TRACK_UPDATED, 0), (TRACK_DELETED, 1), (TRACK_DELETED, 2),
+    ]
+
+
+def test_deleted_event_carries_final_state():
+    tracker = CentroidTracker(max_disappeared=0, max_distance=50, min_hits=1)
+    deleted = []
+    tracker.subscribe(TRACK_DELETED, deleted.append)
+    
+    tracker.update(np.array([[100, 100]]), timestamp=0.0)
+    tracker.update(np.array([[110, 100]]), timestamp=0.1)
+    tracker.update(np.empty((0, 2)), timestamp=0.2)
+    
+    assert len(deleted) == 1
+    assert isinstance(deleted[0], TrackState)
+    assert deleted[0].centroid == (110, 100)
+    assert deleted[0].positions.tolist() == [[100, 100], [110, 100]]
+    assert tracker.tracks == {}
+
+
+def test_subscribe_rejects_unknown_events():
+    with pytest.raises(ValueError):
+        CentroidTracker().subscribe("moved", print)
+
+
+def box_batch(boxes):
+    boxes = np.array(boxes)
+    return DetectionBatch.from_raw(boxes, np.full(len(boxes), 0.9), np.full(len(boxes), 2))
+
+
+@pytest.mark.parametrize("cost", ["iou", "giou", "normalized"])
+def test_box_costs_follow_moving_boxes(cost):
+    tracker = CentroidTracker(min_hits=1, cost=cost)
+    tracker.update(box_batch([[100, 100, 130, 120], [400, 300, 600, 400]]), timestamp=0.0)
+    
+    tracks = tracker.update(box_batch([[106, 100, 136, 120], [440, 300, 640, 400]]), timestamp=0.1)
+    
+    assert list(tracks) == [0, 1]
+    assert tracks[0].centroid == (121, 110)
+    assert tracks[1].centroid == (540, 350)
+
+
+@pytest.mark.parametrize("cost", ["iou", "giou", "normalized"])
+def test_small_box_does_not_fall_back_to_max_distance(cost):
+    tracker = CentroidTracker(max_distance=100, min_hits=1, cost=cost)
+    tracker.update(box_batch([[100, 100, 130, 120]]), timestamp=0.0)
+    
+    # 90 px is within max_distance but several diagonals of a 30x20 box
+    tracks = tracker.update(box_batch([[190, 100, 220, 120]]), timestamp=0.1)
+    
+    assert list(tracks) == [0, 1]
+    assert tracks[0].disappeared == 1
+    assert tracks[1].centroid == (205, 110)
+
+
+def test_large_box_falls_back_to_centroid_distance():
+    tracker = CentroidTracker(max_distance=100, min_hits=1, cost="iou")
+    tracker.update(box_batch([[100, 100, 180, 160]]), timestamp=0.0)
+    
+    # The boxes no longer overlap, but the jump is within the gate
+    tracks = tracker.update(box_batch([[190, 100, 270, 160]]), timestamp=0.1)
+    
+    assert list(tracks) == [0]
+    assert tracks[0].centroid == (230, 130)
+
+
+def test_custom_cost_function():
+    calls = []
+    def width_cost(track_boxes, boxes):
+        calls.append((len(track_boxes), len(boxes)))
+        widths = lambda b: (b[:, 2] - b[:, 0]).astype(float)
+        return np.abs(widths(track_boxes)[:, None] - widths(boxes)[None, :])
+    
+    with pytest.raises(ValueError):
+        CentroidTracker(cost=width_cost)
+    
+    tracker = CentroidTracker(min_hits=1, cost=width_cost, cost_gate=5)
+    tracker.update(box_batch([[100, 100, 140, 130], [200, 100, 300, 160]]), timestamp=0.0)
+    
+    # Each track takes the detection of its own width, not the nearest
+    tracks = tracker.update(box_batch([[190, 100, 230, 130], [110, 100, 210, 160]]), timestamp=0.1)
+    
+    assert calls == [(2, 2)]
+    assert tracks[0].bbox == (190, 100, 230, 130)
+    assert tracks[1].bbox == (110, 100, 210, 160)
@@ -0,0 +1,307 @@
+"""Tests for VideoProcessor: batching, frame skipping and checkpoints."""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+import src.video_processor as video_processor
+from benchmarks.soak_memory import LaneStream
+from src.capture import FrameReader
+from src.detections import DetectionBatch
+from src.tracker import CentroidTracker
+from src.video_processor import AdaptiveStride
+
+
+def make_processor(source_dir, checkpoint_dir, camera_id=None):
+    """A processor on a one-image source with no detector attached."""
+    source_dir.mkdir(exist_ok=True)
+    cv2.imwrite(str(source_dir / "frame_0.png"), np.zeros((720, 1280, 3), dtype=np.uint8))
+    
+    return video_processor.VideoProcessor(
+        source=str(source_dir / "frame_%d.png"),
+        speed_limit=100,
+        show_preview=False,
+        threaded_capture=False,
+        detector=type("NoDetector", (), {"zone": None})(),
+        camera_id=camera_id,
+        checkpoint_dir=str(checkpoint_dir),
+        log_dir=str(checkpoint_dir.parent / "logs")
+    )
+
+
+def run_frames(processor, stream, frames):
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    for _ in range(frames):
+        processor._complete_frame(frame, stream.next(), stream.frame / processor.fps, draw=False)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoints = tmp_path / "checkpoints"
+    stream = LaneStream(step=40)
+    
+    first = make_processor(tmp_path / "video", checkpoints, camera_id="north")
+    run_frames(first, stream, 60)
+    ids = sorted(first.tracker.tracks)
+    positions = {track_id: track.positions.tolist() for track_id, track in first.tracker.tracks.items()}
+    counters = (first.total_vehicles, first.overspeed_count, dict(first.speeds), set(first._logged_tracks))
+    next_id = first.tracker.next_id
+    first.stop()
+    
+    assert (checkpoints / "tracker_north.npz").exists()
+    assert first.total_vehicles > 0 and first.overspeed_count > 0
+    
+    second = make_processor(tmp_path / "video", checkpoints, camera_id="north")
+    
+    assert sorted(second.tracker.tracks) == ids
+    assert second.tracker.next_id == next_id
+    assert (second.total_vehicles, second.overspeed_count, second.speeds, second._logged_tracks) == counters
+    assert {
+        track_id: track.positions.tolist() for track_id, track in second.tracker.tracks.items()
+    } == positions
+    
+    # Vehicles still in view keep their ids; only a new arrival gets a new one
+    detections = stream.next()
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    second._complete_frame(frame, detections, 1 / second.fps, draw=False)
+    tracks = second.tracker.tracks
+    created = set(tracks) - set(ids)
+    matched = [track_id for track_id in ids if track_id in tracks and tracks[track_id].disappeared == 0]
+    
+    assert matched
+    assert created <= {next_id}
+    assert len(matched) + len(created) == len(detections)
+    second.stop()
+
+
+def test_checkpoint_of_another_source_is_ignored(tmp_path):
+    checkpoints = tmp_path / "checkpoints"
+    
+    first = make_processor(tmp_path / "video", checkpoints)
+    run_frames(first, LaneStream(), 30)
+    first.stop()
+    assert (checkpoints / "tracker.npz").exists()
+    
+    other = make_processor(tmp_path / "other", checkpoints)
+    
+    assert other.tracker.tracks == {}
+    assert other.tracker.next_id == 0
+    assert other.total_vehicles == 0
+    other.stop()
+
+
+def test_checkpoint_with_another_history_length_is_ignored(tmp_path):
+    checkpoints = tmp_path / "checkpoints"
+    stream = LaneStream(step=40)
+    
+    first = make_processor(tmp_path / "video", checkpoints)
+    run_frames(first, stream, 60)
+    first.stop()
+    assert first.total_vehicles > 0
+    
+    # Rewrite the checkpoint as if saved with a longer history
+    with np.load(checkpoints / "tracker.npz") as data:
+        state = {name: data[name] for name in data.files}
+    state["positions"] = np.concatenate([state["positions"], state["positions"][:, :1]], axis=1)
+    with open(checkpoints / "tracker.npz", "wb") as f:
+        np.savez(f, **state)
+    
+    second = make_processor(tmp_path / "video", checkpoints)
+    
+    assert second.tracker.tracks == {}
+    assert second.tracker.next_id == 0
+    assert (second.total_vehicles, second.overspeed_count) == (0, 0)
+    assert second._logged_tracks == set() and second.speeds == {}
+    
+    # New tracks start at id 0 again and are counted
+    run_frames(second, LaneStream(step=40), 60)
+    assert second.total_vehicles > 0
+    second.stop()
+
+
+def lane_tracks(step, count=3, frames=4, fps=25):
+    """Confirmed tracks of vehicles moving step pixels per frame."""
+    tracker = CentroidTracker(min_hits=1)
+    for n in range(frames):
+        tracker.update(np.array([[100 + step * n, 100 + 50 * i] for i in range(count)]), timestamp=n / fps)
+    return tracker.tracks
+
+
+def test_stride_grows_on_static_scenes_and_shrinks_with_speed():
+    stride = AdaptiveStride(max_stride=5, max_shift=50, tracks_per_step=10)
+    
+    assert stride.next_stride({}, 25) == 5
+    assert stride.next_stride(lane_tracks(0), 25) == 5
+    assert stride.next_stride(lane_tracks(20), 25) == 2
+    assert stride.next_stride(lane_tracks(60), 25) == 1
+    
+    # Busy scenes and unconfirmed tracks lower it too
+    assert stride.next_stride(lane_tracks(0, count=25), 25) == 3
+    new = CentroidTracker(min_hits=3)
+    new.update(np.array([[100, 100]]), timestamp=0.0)
+    assert stride.next_stride(new.tracks, 25) == 2
+
+
+def test_slow_detector_raises_the_stride():
+    stride = AdaptiveStride(max_stride=5, max_shift=50, tracks_per_step=10)
+    stride.record_latency(0.12)
+    
+    assert stride.next_stride(lane_tracks(60), 25) == 3
+
+
+class ScriptedDetector:
+    """Three vehicles in lanes, moving step pixels per frame."""
+    
+    zone = None
+    
+    def __init__(self, step=0, vehicles=3):
+        self.step = step
+        self.vehicles = vehicles
+        self.processor = None
+        self.calls = []
+    
+    def detect(self, frame):
+        n = self.processor.frame_count
+        self.calls.append(n)
+        x = np.full(self.vehicles, 100 + self.step * n)
+        y = 100 + 200 * np.arange(self.vehicles)
+        boxes = np.stack([x - 30, y - 20, x + 30, y + 20], axis=1)
+        return DetectionBatch.from_raw(boxes, np.full(self.vehicles, 0.9), np.full(self.vehicles, 2))
+
+
+def skipping_processor(tmp_path, detector, **kwargs):
+    """A processor whose detector is scripted, with no checkpoints."""
+    cv2.imwrite(str(tmp_path / "frame_0.png"), np.zeros((720, 1280, 3), dtype=np.uint8))
+    processor = video_processor.VideoProcessor(
+        source=str(tmp_path / "frame_%d.png"),
+        show_preview=False,
+        threaded_capture=False,
+        detector=detector,
+        checkpoint_dir=None,
+        log_dir=str(tmp_path / "logs"),
+        **kwargs
+    )
+    detector.processor = processor
+    return processor
+
+
+@pytest.mark.parametrize("step, keyframes", [
+    (0, [0, 2, 4, 9, 14, 19]),                       # static: up to the max stride
+    (20, [0, 2, 4, 6, 8, 10, 12, 14, 16, 18]),       # 20 px/frame: stride 2
+    (30, [0, 2] + list(range(3, 20))),               # 30 px/frame: every frame
+])
+def test_adaptive_stride_picks_keyframes(tmp_path, step, keyframes):
+    detector = ScriptedDetector(step)
+    processor = skipping_processor(tmp_path, detector, adaptive_stride=True)
+    assert processor.fps == 25
+    
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    for _ in range(20):
+        processor.process_frame(frame)
+    
+    assert detector.calls == keyframes
+    assert processor.detector_runs == len(keyframes)
+    # Vehicles keep their tracks across the frames in between
+    assert sorted(processor.tracker.tracks) == [0, 1, 2]
+    processor.stop()
+
+
+def test_motion_gate_skips_detection_on_an_empty_static_scene(tmp_path):
+    detector = ScriptedDetector(vehicles=0)
+    processor = skipping_processor(tmp_path, detector, motion_gate=True)
+    road = np.full((720, 1280, 3), 60, dtype=np.uint8)
+    car = road.copy()
+    car[380:420, 600:680] = 220
+    
+    # No background yet: the first frame goes to the detector
+    assert processor._gate_detection(road) == (True, None)
+    for _ in range(5):
+        run_detector, detections = processor._gate_detection(road)
+        assert not run_detector
+        assert len(detections) == 0
+    
+    # A vehicle entering brings the detector back
+    for frame in [road, road, car]:
+        processor.process_frame(frame)
+    
+    assert detector.calls == [2]
+    assert processor.motion_gate.get_stats()["skips"] == 7
+    processor.stop()
+
+
+class MarkedBatchDetector:
+    """Batch detector: a frame marked n holds one car at x = 100 + 40n."""
+    
+    zone = None
+    
+    def __init__(self):
+        self.calls = []
+    
+    def detect_batch(self, frames):
+        markers = [int(frame[0, 0, 0]) for frame in frames]
+        self.calls.append(markers)
+        return [
+            DetectionBatch.from_raw(
+                np.array([[70 + 40 * marker, 280, 130 + 40 * marker, 320]]), np.array([0.9]), np.array([2])
+            )
+            for marker in markers
+        ]
+
+
+def test_process_batch_tracks_frames_in_order(tmp_path):
+    detector = MarkedBatchDetector()
+    processor = skipping_processor(tmp_path, detector, batch_size=6)
+    frames = [np.full((720, 1280, 3), marker, dtype=np.uint8) for marker in range(6)]
+    
+    results = processor.process_batch(frames)
+    
+    assert detector.calls == [list(range(6))]
+    assert len(results) == 6 and processor.detector_runs == 6
+    assert [track.positions[:, 0].tolist() for track in processor.tracker.tracks.values()] == [
+        [100 + 40 * marker for marker in range(6)]
+    ]
+    processor.stop()
+
+
+class StallingCapture:
+    """Live source: `ready` frames at once, the rest after release()."""
+    
+    def __init__(self, ready, frames):
+        self.ready = ready
+        self.frames = frames
+        self.index = 0
+        self.released = threading.Event()
+    
+    def read(self):
+        if self.index >= self.frames:
+            return False, None
+        if self.index >= self.ready:
+            self.released.wait(5.0)
+        self.index += 1
+        return True, np.zeros((720, 1280, 3), dtype=np.uint8)
+    
+    def set(self, prop, value):
+        return False
+
+
+def test_read_batch_returns_a_partial_batch_after_max_wait(tmp_path):
+    processor = skipping_processor(tmp_path, ScriptedDetector(), batch_size=8, batch_max_wait=0.1)
+    capture = StallingCapture(ready=3, frames=5)
+    processor.reader = FrameReader(capture, loop=False).start()
+    
+    start = time.perf_counter()
+    frames, timestamps = processor._read_batch()
+    elapsed = time.perf_counter() - start
+    
+    # The stalled source ends the batch at the deadline, not at batch_size
+    assert len(frames) == 3
+    assert timestamps == [1 / 25, 2 / 25, 3 / 25]
+    assert elapsed < 1.0
+    
+    # End of stream also ends a batch early
+    capture.released.set()
+    frames, timestamps = processor._read_batch()
+    assert timestamps == [4 / 25, 5 / 25]
+    processor.stop()